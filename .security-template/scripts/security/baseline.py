@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+セキュリティ検出結果のベースライン
+既知の問題を (ルール, ファイルパス, コード片のハッシュ) から作るフィンガープリントで記録し、
+新しく混入した問題だけを判定できるようにする
+
+行番号を含めないため、前後の行の追加・削除で検出位置がずれても同じ問題として扱う
+"""
+
+import hashlib
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Set
+
+DEFAULT_BASELINE = Path('.security-baseline')
+
+# Banditの code は "行番号 コード" 形式で前後の行も含む
+_BANDIT_LINE_RE = re.compile(r'^(\d+)\s?(.*)$')
+
+
+def normalize_snippet(finding: Dict[str, Any]) -> str:
+    """検出箇所のコード片を空白の差異を除いて取り出す"""
+    code = finding.get('code') or ''
+    if finding.get('tool') == 'bandit':
+        # 検出行だけを使い、前後の文脈行の変更に影響されないようにする
+        for line in code.splitlines():
+            match = _BANDIT_LINE_RE.match(line)
+            if match and match.group(1) == str(finding.get('line')):
+                code = match.group(2)
+                break
+    return ' '.join(code.split())
+
+
+def normalize_path(file_name: str) -> str:
+    """ツールごとの表記の差（Bandit の ./src/app.py と Semgrep の src/app.py など）をなくしたパス"""
+    return os.path.normpath(file_name)
+
+
+def fingerprint_base(finding: Dict[str, Any]) -> str:
+    """ルール・パス・コード片から作るフィンガープリント（出現順は含まない）"""
+    snippet = normalize_snippet(finding) or finding.get('message', '')
+    snippet_hash = hashlib.sha256(snippet.encode('utf-8')).hexdigest()
+    material = '\0'.join([finding['rule'], normalize_path(finding['file']), snippet_hash])
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+def with_fingerprints(findings: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    検出結果にフィンガープリントを付与する
+
+    同じファイルに同じコードが複数ある場合は出現順で区別し、
+    既知の1件がベースラインにあっても新しく増えた分は検出できるようにする
+    """
+    occurrences: Counter = Counter()
+    for finding in findings:
+        base = fingerprint_base(finding)
+        occurrences[base] += 1
+        material = f"{base}:{occurrences[base]}"
+        finding['fingerprint'] = hashlib.sha256(material.encode('utf-8')).hexdigest()[:32]
+        yield finding
+
+
+def load_baseline(path: Path) -> Set[str]:
+    """ベースラインファイルを読み込んでフィンガープリントの集合を返す"""
+    if not path.exists():
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip() and not line.startswith('#')}
+
+
+def write_baseline(path: Path, fingerprints: Iterable[str]) -> int:
+    """フィンガープリントをソートしてベースラインファイルに書き込み、件数を返す"""
+    unique = sorted(set(fingerprints))
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('# Security baseline: known findings (generated by --update-baseline)\n')
+        for value in unique:
+            f.write(value)
+            f.write('\n')
+    os.replace(tmp_path, path)
+    return len(unique)
+
+
+def mark_baselined(findings: Iterable[Dict[str, Any]], baseline: Set[str]) -> Iterator[Dict[str, Any]]:
+    """ベースライン登録済みかどうか（baselined）を付与する"""
+    for finding in with_fingerprints(findings):
+        finding['baselined'] = finding['fingerprint'] in baseline
+        yield finding
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+変更ファイル抽出スクリプト
+gitのベースref以降に変更されたファイルを watch_patterns に従って抽出する
+（watch_patterns は scan-config.json から scan_config.py 経由で読み込む）
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# scan-config.json に watch_patterns がない場合の既定値
+DEFAULT_WATCH_PATTERNS = ['**.py', '**.ts', '**.tsx', '**.js', '**.jsx']
+
+LANGUAGE_EXTENSIONS: Dict[str, tuple] = {
+    'python': ('.py',),
+    'typescript': ('.ts', '.tsx', '.js', '.jsx'),
+}
+
+
+def _git_lines(args: List[str]) -> List[str]:
+    """gitコマンドを実行してNUL区切りの出力をリストで返す"""
+    proc = subprocess.run(['git'] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    return [item for item in proc.stdout.decode('utf-8').split('\0') if item]
+
+
+def changed_files(since: str, patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    ベースrefとのマージベース以降に変更されたファイルを返す
+
+    コミット済み・未コミット・未追跡の変更を含み、削除されたファイルは除外する
+    パスはカレントディレクトリからの相対パス（サブディレクトリで実行した場合はその配下のみ）
+    """
+    if patterns is None:
+        patterns = list(DEFAULT_WATCH_PATTERNS)
+
+    proc = subprocess.run(['git', 'merge-base', since, 'HEAD'],
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    base = proc.stdout.decode('utf-8').strip()
+
+    files = set(_git_lines(['diff', '--name-only', '--relative', '-z', '--diff-filter=d', base, '--'] + patterns))
+    files.update(_git_lines(['ls-files', '-z', '--others', '--exclude-standard', '--'] + patterns))
+    return sorted(path for path in files if Path(path).is_file())
+
+
+def filter_language(files: List[str], language: str) -> List[str]:
+    """言語に対応する拡張子のファイルだけを返す"""
+    extensions = LANGUAGE_EXTENSIONS[language]
+    return [path for path in files if path.endswith(extensions)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='List files changed since a git ref')
+    parser.add_argument('--since', required=True, help='Base git ref (e.g. origin/main)')
+    parser.add_argument('--language', choices=sorted(LANGUAGE_EXTENSIONS), help='Only list files of this language')
+    args = parser.parse_args()
+
+    # scan_config は changed_files を読み込むため、ここで遅延インポートする
+    from scan_config import watch_patterns
+
+    try:
+        files = changed_files(args.since, watch_patterns())
+    except subprocess.CalledProcessError as e:
+        print(f"❌ git の実行に失敗しました: {e.stderr.decode('utf-8', errors='replace').strip()}", file=sys.stderr)
+        return 2
+
+    if args.language:
+        files = filter_language(files, args.language)
+
+    for path in files:
+        print(path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
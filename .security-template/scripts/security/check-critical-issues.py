@@ -2,74 +2,87 @@
 """
 重大な問題のチェックスクリプト
 セキュリティチェック結果から重大度の高い問題をカウント
+
+結果は findings.py が正規化した findings.jsonl から読み込む
+--baseline を指定した場合、ベースライン登録済みの既知の問題は除外する
+--metrics-file を指定した場合、件数とスキャン時間を Prometheus textfile 形式で書き出す
+
+スキャンが時間制限で途中停止していた場合（scan-summary.json の timed_out）は、
+重大な問題がなくても合格とせず終了コード 3 を返す（--allow-partial で従来どおり合格扱い）
 """
 
 import argparse
-import json
+import sys
+import time
 from pathlib import Path
-from typing import Dict, Any
-
-
-def load_json_results(file_path: Path) -> Dict[str, Any]:
-    """JSON結果ファイルを読み込む"""
-    if not file_path.exists():
-        return {}
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {}
+from typing import Any, Dict, Iterable
 
+from baseline import DEFAULT_BASELINE, load_baseline, mark_baselined, with_fingerprints, write_baseline
+from findings import incomplete_scans, load_findings
+from metrics import FindingStats, MetricFamilies, add_run_metrics, add_scan_metrics
 
-def count_critical_bandit(results: Dict[str, Any]) -> int:
-    """Banditの重大な問題をカウント"""
-    count = 0
-    for result in results.get('results', []):
-        severity = result.get('issue_severity', '').upper()
-        if severity in ['HIGH', 'CRITICAL']:
-            count += 1
-    return count
+# 結果が不完全（時間制限で途中停止）な場合の終了コード（run-security-check.py と同じ）
+PARTIAL_EXIT_CODE = 3
 
 
-def count_critical_semgrep(results: Dict[str, Any]) -> int:
-    """Semgrepの重大な問題をカウント"""
-    count = 0
-    for result in results.get('results', []):
-        severity = result.get('extra', {}).get('severity', '').upper()
-        if severity in ['ERROR', 'HIGH', 'CRITICAL']:
-            count += 1
-    return count
+def count_critical(findings: Iterable[Dict[str, Any]]) -> int:
+    """重大な問題（Bandit: HIGH/CRITICAL, Semgrep: ERROR/HIGH/CRITICAL）をカウント"""
+    return sum(1 for finding in findings if finding['critical'] and not finding.get('baselined'))
 
 
 def main():
+    started = time.perf_counter()
     parser = argparse.ArgumentParser(description='Count critical security issues')
     parser.add_argument('--results-dir', type=Path, required=True, help='Results directory')
+    parser.add_argument('--baseline', type=Path, help='Ignore findings recorded in this baseline file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help=f'Record all current findings in the baseline (default: {DEFAULT_BASELINE})')
+    parser.add_argument('--allow-partial', action='store_true',
+                        help='Pass even if a scan was stopped by its time budget')
+    parser.add_argument('--metrics-file', type=Path,
+                        help='Write finding counts and scan durations in Prometheus textfile format')
     args = parser.parse_args()
 
-    # 結果ファイルを読み込む
-    bandit_results = load_json_results(
-        args.results_dir / 'python-security-results' / 'bandit-results.json'
-    )
-    semgrep_python_results = load_json_results(
-        args.results_dir / 'python-security-results' / 'semgrep-python-results.json'
-    )
-    semgrep_typescript_results = load_json_results(
-        args.results_dir / 'typescript-security-results' / 'semgrep-typescript-results.json'
-    )
+    if args.update_baseline:
+        baseline_path = args.baseline or DEFAULT_BASELINE
+        count = write_baseline(
+            baseline_path,
+            (finding['fingerprint'] for finding in with_fingerprints(load_findings(args.results_dir))),
+        )
+        print(f"✅ ベースラインを更新しました: {baseline_path} ({count}件)", file=sys.stderr)
+        return 0
+
+    findings = load_findings(args.results_dir)
+    if args.baseline:
+        findings = mark_baselined(findings, load_baseline(args.baseline))
+
+    stats = FindingStats()
+    if args.metrics_file:
+        findings = stats.observe(findings)
 
     # 重大な問題をカウント
-    critical_count = 0
-    critical_count += count_critical_bandit(bandit_results)
-    critical_count += count_critical_semgrep(semgrep_python_results)
-    critical_count += count_critical_semgrep(semgrep_typescript_results)
+    critical_count = count_critical(findings)
+
+    if args.metrics_file:
+        metrics = MetricFamilies('check-critical-issues')
+        stats.add_to(metrics)
+        add_scan_metrics(metrics, args.results_dir)
+        add_run_metrics(metrics, started)
+        metrics.write(args.metrics_file)
 
     # 結果を出力
     print(critical_count)
 
+    partial = incomplete_scans(args.results_dir)
+    for scan in partial:
+        print(f"⏱️  {scan.get('label', '?')}: 時間制限で停止したため結果は不完全です"
+              f"（未スキャン {scan.get('unscanned_files', 0)}ファイル）", file=sys.stderr)
+
     # 重大な問題がある場合は終了コード1
     if critical_count > 0:
         return 1
+    if partial and not args.allow_partial:
+        return PARTIAL_EXIT_CODE
     return 0
 
 
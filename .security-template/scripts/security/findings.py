@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+セキュリティチェック結果の共通取り込みモジュール
+Bandit / Semgrep の結果JSONを1回だけパースし、正規化・重複統合した検出結果を
+結果ディレクトリの findings.jsonl に書き出す
+
+check-critical-issues.py / generate-pr-comment.py などはこのファイルを読み込む
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+FINDINGS_FILE = 'findings.jsonl'
+
+# findings.jsonl を作ったときの元の結果ファイルの状態（サイズ・更新時刻）
+SOURCES_MANIFEST_FILE = 'findings.sources.json'
+
+# run-security-check.py が書き出すツールごとの実行情報
+SCAN_SUMMARY_FILE = 'scan-summary.json'
+
+# (セクション名, ツール, 結果ファイルの相対パス)
+RESULT_SOURCES: List[Tuple[str, str, str]] = [
+    ('bandit', 'bandit', 'python-security-results/bandit-results.json'),
+    ('semgrep_python', 'semgrep', 'python-security-results/semgrep-python-results.json'),
+    ('semgrep_typescript', 'semgrep', 'typescript-security-results/semgrep-typescript-results.json'),
+]
+
+# 重大な問題として扱う重大度
+CRITICAL_SEVERITIES = {'CRITICAL', 'HIGH', 'ERROR'}
+
+# 重大度の順位（大きいほど重大）
+SEVERITY_RANK = {
+    'CRITICAL': 4,
+    'HIGH': 3,
+    'ERROR': 3,
+    'MEDIUM': 2,
+    'WARNING': 2,
+    'LOW': 1,
+    'INFO': 1,
+}
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# 同じ弱点を指すCWEの対応（Banditの細分類をIPAルールの分類に揃える）
+CWE_ALIASES = {
+    'CWE-259': 'CWE-798',  # ハードコードされたパスワード → 認証情報のハードコード
+    'CWE-328': 'CWE-327',  # 弱いハッシュ → 弱い暗号アルゴリズム
+}
+
+# issue_cwe を出力しない古いBandit向けのテストID → CWE
+BANDIT_TEST_CWE = {
+    'B105': 'CWE-259',
+    'B106': 'CWE-259',
+    'B107': 'CWE-259',
+    'B303': 'CWE-327',
+    'B324': 'CWE-327',
+    'B602': 'CWE-78',
+    'B604': 'CWE-78',
+    'B605': 'CWE-78',
+    'B608': 'CWE-89',
+}
+
+
+def severity_rank(severity: str) -> int:
+    """重大度の順位を返す"""
+    return SEVERITY_RANK.get(severity.upper(), 0)
+
+
+def is_critical(severity: str) -> bool:
+    """重大な問題かどうか"""
+    return severity.upper() in CRITICAL_SEVERITIES
+
+
+class _JsonStreamReader:
+    """チャンク単位で読み込みながらJSON値を1つずつデコードする"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        """バッファに次のチャンクを追加する"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """空白を読み飛ばして次の文字を返す（終端なら空文字）"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def advance(self):
+        """1文字進める"""
+        self.pos += 1
+
+    def decode(self) -> Any:
+        """次のJSON値をデコードする（バッファ不足なら追加で読み込む）"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数値などがチャンク境界で切れている可能性があれば読み足して再試行
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_results(file_path: Path, key: str = 'results') -> Iterator[Dict[str, Any]]:
+    """結果JSONのトップレベル配列を1要素ずつ読み込む（ファイル全体は読み込まない）"""
+    if not file_path.exists():
+        return
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        reader = _JsonStreamReader(f)
+        try:
+            if reader.peek() != '{':
+                return
+            reader.advance()
+            while True:
+                char = reader.peek()
+                if char in ('}', ''):
+                    return
+                if char == ',':
+                    reader.advance()
+                    continue
+
+                name = reader.decode()
+                if reader.peek() != ':':
+                    return
+                reader.advance()
+
+                if name != key or reader.peek() != '[':
+                    reader.decode()
+                    continue
+
+                reader.advance()
+                while True:
+                    char = reader.peek()
+                    if char == ']':
+                        reader.advance()
+                        break
+                    if char == ',':
+                        reader.advance()
+                        continue
+                    if char == '':
+                        return
+                    yield reader.decode()
+        except json.JSONDecodeError:
+            return
+
+
+def normalize_bandit(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Bandit結果を正規化"""
+    cwe = result.get('issue_cwe') or {}
+    severity = result.get('issue_severity', 'UNKNOWN').upper()
+    return {
+        'tool': 'bandit',
+        'severity': severity,
+        'confidence': result.get('issue_confidence', 'UNKNOWN'),
+        'rule': result.get('test_id', 'Unknown'),
+        'file': result.get('filename', 'Unknown'),
+        'line': result.get('line_number', '?'),
+        'message': result.get('issue_text', 'No description'),
+        'cwe': f"CWE-{cwe['id']}" if cwe.get('id') else BANDIT_TEST_CWE.get(result.get('test_id', ''), ''),
+        'ipa_section': '',
+        'code': result.get('code', ''),
+        'critical': is_critical(severity),
+    }
+
+
+def normalize_semgrep(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Semgrep結果を正規化"""
+    extra = result.get('extra', {})
+    metadata = extra.get('metadata', {})
+    severity = extra.get('severity', 'WARNING').upper()
+    cwe = metadata.get('cwe', '')
+    if isinstance(cwe, list):
+        cwe = cwe[0] if cwe else ''
+    return {
+        'tool': 'semgrep',
+        'severity': severity,
+        'confidence': metadata.get('confidence', ''),
+        'rule': result.get('check_id', 'Unknown').split('.')[-1],
+        'file': result.get('path', 'Unknown'),
+        'line': result.get('start', {}).get('line', '?'),
+        'message': extra.get('message', 'No description'),
+        # "CWE-89: Improper Neutralization..." 形式にも対応
+        'cwe': str(cwe).split(':')[0].strip(),
+        # IPAセクション番号
+        'ipa_section': metadata.get('ipa_section', ''),
+        'code': extra.get('lines', ''),
+        'critical': is_critical(severity),
+    }
+
+
+def dedup_key(finding: Dict[str, Any]) -> Tuple[str, Any, str]:
+    """重複判定キー: (ファイル, 行, 正規化したCWE/IPA分類)"""
+    cwe = finding.get('cwe', '')
+    category = CWE_ALIASES.get(cwe, cwe) or finding.get('ipa_section') or f"rule:{finding['rule']}"
+    return os.path.normpath(finding['file']), finding['line'], category
+
+
+def _merge_into(target: Dict[str, Any], other: Dict[str, Any]):
+    """重複した検出結果を1件にまとめる（重大度は高い方を採用）"""
+    for field in ('tools', 'rules'):
+        for value in other[field]:
+            if value not in target[field]:
+                target[field].append(value)
+    if severity_rank(other['severity']) > severity_rank(target['severity']):
+        target['severity'] = other['severity']
+    target['critical'] = target['critical'] or other['critical']
+    for field in ('cwe', 'ipa_section', 'code'):
+        target[field] = target[field] or other[field]
+
+
+def dedup_findings(findings: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    同じファイル・行・分類の検出結果を統合する
+
+    Bandit と ipa-python.yaml が同じ箇所を指摘した場合などに、
+    報告したツールとルールをすべて保持した1件にまとめる
+    """
+    unique: Dict[Tuple[str, Any, str], Dict[str, Any]] = {}
+    for finding in findings:
+        key = dedup_key(finding)
+        if key in unique:
+            _merge_into(unique[key], finding)
+        else:
+            unique[key] = finding
+    return iter(unique.values())
+
+
+def _iter_normalized(results_dir: Path) -> Iterator[Dict[str, Any]]:
+    """結果JSONを順に読み込み、正規化した検出結果を返す"""
+    for section, tool, rel_path in RESULT_SOURCES:
+        normalize = normalize_bandit if tool == 'bandit' else normalize_semgrep
+        for result in iter_json_results(results_dir / rel_path):
+            record = normalize(result)
+            record['section'] = section
+            record['tools'] = [tool]
+            record['rules'] = [record['rule']]
+            yield record
+
+
+def _source_manifest(results_dir: Path) -> Dict[str, Any]:
+    """元の結果ファイルごとのサイズと更新時刻（ない場合は "absent"）"""
+    manifest: Dict[str, Any] = {}
+    for _, _, rel_path in RESULT_SOURCES:
+        try:
+            stat = (results_dir / rel_path).stat()
+        except FileNotFoundError:
+            manifest[rel_path] = 'absent'
+            continue
+        manifest[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    return manifest
+
+
+def _is_fresh(findings_path: Path, manifest_path: Path, manifest: Dict[str, Any]) -> bool:
+    """
+    findings.jsonl が現在の結果ファイルから作られたものかどうか
+
+    作成時に記録したマニフェストと比較する（結果ファイルの更新・削除・追加で古いとみなす）
+    """
+    if not findings_path.exists():
+        return False
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f) == manifest
+    except (FileNotFoundError, json.JSONDecodeError):
+        return False
+
+
+def build_findings(results_dir: Path, force: bool = False) -> Path:
+    """結果JSONを1回だけパースし、重複を統合して findings.jsonl を書き出す"""
+    findings_path = results_dir / FINDINGS_FILE
+    manifest_path = results_dir / SOURCES_MANIFEST_FILE
+    # パース前に記録する（パース中に結果ファイルが更新されたら次回再生成される）
+    manifest = _source_manifest(results_dir)
+    if not force and _is_fresh(findings_path, manifest_path, manifest):
+        return findings_path
+
+    results_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = findings_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        for record in dedup_findings(_iter_normalized(results_dir)):
+            out.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            out.write('\n')
+    os.replace(tmp_path, findings_path)
+
+    tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as out:
+        json.dump(manifest, out, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return findings_path
+
+
+def load_findings(results_dir: Path) -> Iterator[Dict[str, Any]]:
+    """正規化済みの検出結果を1件ずつ返す（必要なら先に findings.jsonl を作る）"""
+    findings_path = build_findings(results_dir)
+    with open(findings_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_scan_summary(results_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """scan-summary.json を読み込む（ない・壊れている場合は空）"""
+    try:
+        with open(Path(results_dir) / SCAN_SUMMARY_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def incomplete_scans(results_dir: Path) -> List[Dict[str, Any]]:
+    """時間制限で途中停止したスキャン（結果が不完全なもの）"""
+    return [task for task in load_scan_summary(results_dir).values() if task.get('timed_out')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Normalize security results into findings.jsonl')
+    parser.add_argument('--results-dir', type=Path, required=True, help='Results directory')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if findings.jsonl is up to date')
+    args = parser.parse_args()
+
+    findings_path = build_findings(args.results_dir, force=args.force)
+    print(f"✅ Findings written: {findings_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
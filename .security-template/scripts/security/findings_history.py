@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+セキュリティ検出結果の履歴データベース（SQLite）
+実行ごとに findings.jsonl の検出結果をフィンガープリント付きで追記し、
+「この問題はいつから出ているか」「HIGHの件数はどう推移したか」を
+過去の結果JSONを読み直さずに調べられるようにする
+
+フィンガープリントは baseline.py と同じ（行番号を含まない）ため、行がずれても同じ問題として追跡される
+初出・最終検出の実行と実行ごとの件数は取り込み時に集計して保持するので、
+数千回分の履歴でも問い合わせは索引の参照だけで済む
+
+使い方:
+    python3 scripts/security/findings_history.py ingest --results-dir security-results
+    python3 scripts/security/findings_history.py trend --severity HIGH
+    python3 scripts/security/findings_history.py seen --rule B602
+    python3 scripts/security/findings_history.py new
+"""
+
+import argparse
+import json
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from baseline import DEFAULT_BASELINE, load_baseline, mark_baselined, normalize_path, with_fingerprints
+from findings import load_findings
+
+DEFAULT_DB = Path('.security-history.db')
+
+# PRAGMA user_version（1: fingerprints.path を normalize_path() で正規化済み）
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    commit_sha TEXT,
+    ref TEXT,
+    total INTEGER NOT NULL,
+    critical INTEGER NOT NULL
+);
+-- 問題ごとの初出・最終検出（取り込み時に更新）
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    tool TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    path TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    message TEXT NOT NULL,
+    first_run INTEGER NOT NULL REFERENCES runs(id),
+    last_run INTEGER NOT NULL REFERENCES runs(id),
+    runs_seen INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fingerprints_rule ON fingerprints(rule, last_run);
+CREATE INDEX IF NOT EXISTS fingerprints_path ON fingerprints(path, last_run);
+CREATE INDEX IF NOT EXISTS fingerprints_first_run ON fingerprints(first_run);
+CREATE INDEX IF NOT EXISTS fingerprints_last_run ON fingerprints(last_run);
+-- 実行ごとの検出結果
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    fingerprint TEXT NOT NULL,
+    line INTEGER,
+    severity TEXT NOT NULL,
+    baselined INTEGER NOT NULL,
+    PRIMARY KEY (run_id, fingerprint)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS findings_fingerprint ON findings(fingerprint, run_id);
+-- 推移表示用の実行ごとの件数
+CREATE TABLE IF NOT EXISTS run_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    tool TEXT NOT NULL,
+    severity TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, tool, severity)
+) WITHOUT ROWID;
+"""
+
+
+def connect(db_path: Path) -> sqlite3.Connection:
+    """データベースを開く（なければスキーマを作成）"""
+    conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.executescript(SCHEMA)
+    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        _normalize_paths(conn)
+    return conn
+
+
+def _normalize_paths(conn: sqlite3.Connection):
+    """正規化前に取り込んだパス（./src/app.py など）を正規化する"""
+    with conn:
+        paths = [row[0] for row in conn.execute('SELECT DISTINCT path FROM fingerprints')]
+        conn.executemany('UPDATE fingerprints SET path = ? WHERE path = ?',
+                         [(normalize_path(path), path) for path in paths if normalize_path(path) != path])
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+
+def current_revision() -> Tuple[Optional[str], Optional[str]]:
+    """現在のコミットSHAとブランチ名（gitがない・リポジトリ外なら None）"""
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip() or None
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return git('rev-parse', 'HEAD'), git('rev-parse', '--abbrev-ref', 'HEAD')
+
+
+def ingest(conn: sqlite3.Connection, findings, commit_sha: Optional[str] = None,
+           ref: Optional[str] = None, created_at: Optional[float] = None) -> Tuple[int, int]:
+    """
+    1回分の検出結果を取り込む
+
+    findings は load_findings() または mark_baselined() の結果（後者なら baselined も記録する）
+    戻り値は (実行ID, 件数)
+    """
+    rows = []
+    counts: Counter = Counter()
+    critical = 0
+    with conn:
+        cursor = conn.execute(
+            'INSERT INTO runs (created_at, commit_sha, ref, total, critical) VALUES (?, ?, ?, 0, 0)',
+            (created_at or time.time(), commit_sha, ref),
+        )
+        run_id = cursor.lastrowid
+
+        for finding in with_fingerprints(findings):
+            line = finding['line'] if isinstance(finding['line'], int) else None
+            baselined = bool(finding.get('baselined'))
+            tool = '+'.join(finding.get('tools') or [finding['tool']])
+            rows.append((finding['fingerprint'], tool, finding['rule'], normalize_path(finding['file']),
+                         finding['severity'],
+                         finding['message'], run_id, line, int(baselined)))
+            counts[(tool, finding['severity'])] += 1
+            if finding['critical'] and not baselined:
+                critical += 1
+
+        conn.executemany(
+            'INSERT OR IGNORE INTO findings (run_id, fingerprint, line, severity, baselined) VALUES (?, ?, ?, ?, ?)',
+            [(run_id, row[0], row[7], row[4], row[8]) for row in rows],
+        )
+        conn.executemany(
+            """
+            INSERT INTO fingerprints (fingerprint, tool, rule, path, severity, message, first_run, last_run, runs_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+            ON CONFLICT(fingerprint) DO UPDATE SET
+                severity = excluded.severity,
+                message = excluded.message,
+                last_run = excluded.last_run,
+                runs_seen = runs_seen + 1
+            """,
+            [row[:6] + (run_id, run_id) for row in rows],
+        )
+        conn.executemany(
+            'INSERT INTO run_counts (run_id, tool, severity, count) VALUES (?, ?, ?, ?)',
+            [(run_id, tool, severity, count) for (tool, severity), count in counts.items()],
+        )
+        conn.execute('UPDATE runs SET total = ?, critical = ? WHERE id = ?', (len(rows), critical, run_id))
+    return run_id, len(rows)
+
+
+def trend(conn: sqlite3.Connection, severity: Optional[str] = None, tool: Optional[str] = None,
+          limit: int = 20) -> List[Dict[str, Any]]:
+    """直近の実行ごとの件数（重大度・ツールで絞り込み可能）"""
+    conditions = ['c.run_id = r.id']
+    params: List[Any] = []
+    if severity:
+        conditions.append('c.severity = ?')
+        params.append(severity.upper())
+    if tool:
+        conditions.append('c.tool = ?')
+        params.append(tool)
+    rows = conn.execute(
+        f"""
+        SELECT r.id, r.created_at, r.commit_sha, r.ref, r.critical,
+               (SELECT COALESCE(SUM(c.count), 0) FROM run_counts c WHERE {' AND '.join(conditions)})
+        FROM runs r ORDER BY r.id DESC LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+    return [
+        {'run': run_id, 'created_at': created_at, 'commit': commit_sha, 'ref': ref, 'critical': critical,
+         'count': count}
+        for run_id, created_at, commit_sha, ref, critical, count in reversed(rows)
+    ]
+
+
+def seen(conn: sqlite3.Connection, rule: Optional[str] = None, path: Optional[str] = None,
+         fingerprint: Optional[str] = None, active: bool = False, first_run: Optional[int] = None,
+         limit: int = 50) -> List[Dict[str, Any]]:
+    """問題ごとの初出・最終検出（新しく出た順、path は保存時と同じく正規化して比較する）"""
+    conditions: List[str] = []
+    params: List[Any] = []
+    if path is not None:
+        path = normalize_path(path)
+    for column, value in (('f.rule', rule), ('f.path', path), ('f.first_run', first_run)):
+        if value is not None:
+            conditions.append(f'{column} = ?')
+            params.append(value)
+    if fingerprint:
+        # 表示は先頭12文字なので前方一致で検索できるようにする
+        conditions.append('f.fingerprint >= ? AND f.fingerprint < ?')
+        params.extend([fingerprint, fingerprint + '￿'])
+    if active:
+        conditions.append('f.last_run = (SELECT MAX(id) FROM runs)')
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    rows = conn.execute(
+        f"""
+        SELECT f.fingerprint, f.tool, f.rule, f.path, f.severity, f.message, f.runs_seen,
+               f.first_run, first.created_at, first.commit_sha, f.last_run, last.created_at, last.commit_sha
+        FROM fingerprints f
+        JOIN runs first ON first.id = f.first_run
+        JOIN runs last ON last.id = f.last_run
+        {where}
+        ORDER BY f.first_run DESC, f.path
+        LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+    keys = ('fingerprint', 'tool', 'rule', 'path', 'severity', 'message', 'runs_seen',
+            'first_run', 'first_seen', 'first_commit', 'last_run', 'last_seen', 'last_commit')
+    return [dict(zip(keys, row)) for row in rows]
+
+
+def latest_run(conn: sqlite3.Connection) -> Optional[int]:
+    """最新の実行ID"""
+    return conn.execute('SELECT MAX(id) FROM runs').fetchone()[0]
+
+
+def _time(timestamp: float) -> str:
+    return time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))
+
+
+def _print_table(headers: Sequence[str], rows: List[Sequence[Any]]):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print('  '.join(str(value).ljust(width) for value, width in zip(row, widths)).rstrip())
+
+
+def _print_seen(records: List[Dict[str, Any]]):
+    _print_table(
+        ['fingerprint', 'severity', 'rule', 'path', 'first seen', 'last seen', 'runs'],
+        [[record['fingerprint'][:12], record['severity'], record['rule'], record['path'],
+          f"{_time(record['first_seen'])} (#{record['first_run']})",
+          f"{_time(record['last_seen'])} (#{record['last_run']})", record['runs_seen']] for record in records],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Record and query the history of security findings')
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB, help=f'History database (default: {DEFAULT_DB})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    query = argparse.ArgumentParser(add_help=False)
+    query.add_argument('--json', action='store_true', help='Print results as JSON')
+
+    ingest_parser = subparsers.add_parser('ingest', help='Append the findings of a security run')
+    ingest_parser.add_argument('--results-dir', type=Path, required=True, help='Results directory')
+    ingest_parser.add_argument('--commit', help='Commit SHA of the run (default: git rev-parse HEAD)')
+    ingest_parser.add_argument('--ref', help='Branch or ref of the run (default: current branch)')
+    ingest_parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                               help=f'Mark findings recorded in this baseline file (default: {DEFAULT_BASELINE})')
+
+    trend_parser = subparsers.add_parser('trend', parents=[query], help='Finding counts per run')
+    trend_parser.add_argument('--severity', help='Only count this severity (e.g. HIGH)')
+    trend_parser.add_argument('--tool', help='Only count this tool (bandit, semgrep, bandit+semgrep)')
+    trend_parser.add_argument('--last', type=int, default=20, help='Number of runs (default: 20)')
+
+    seen_parser = subparsers.add_parser('seen', parents=[query], help='First-seen and last-seen runs of findings')
+    seen_parser.add_argument('--rule', help='Filter by rule ID')
+    seen_parser.add_argument('--path', help='Filter by file path')
+    seen_parser.add_argument('--fingerprint', help='Filter by fingerprint (prefix)')
+    seen_parser.add_argument('--active', action='store_true', help='Only findings present in the latest run')
+    seen_parser.add_argument('--limit', type=int, default=50, help='Maximum number of findings (default: 50)')
+
+    new_parser = subparsers.add_parser('new', parents=[query], help='Findings first seen in a run')
+    new_parser.add_argument('--run', type=int, help='Run ID (default: latest)')
+    new_parser.add_argument('--limit', type=int, default=50, help='Maximum number of findings (default: 50)')
+
+    args = parser.parse_args()
+    conn = connect(args.db)
+
+    if args.command == 'ingest':
+        commit_sha, ref = current_revision()
+        run_id, count = ingest(
+            conn, mark_baselined(load_findings(args.results_dir), load_baseline(args.baseline)),
+            commit_sha=args.commit or commit_sha, ref=args.ref or ref,
+        )
+        print(f"✅ 履歴に記録しました: 実行 #{run_id} ({count}件) → {args.db}", file=sys.stderr)
+        return 0
+
+    if args.command == 'trend':
+        records = trend(conn, args.severity, args.tool, args.last)
+        if args.json:
+            print(json.dumps(records, ensure_ascii=False, indent=2))
+        else:
+            label = ' '.join(filter(None, [args.tool, args.severity.upper() if args.severity else None])) or 'all'
+            _print_table(['run', 'time', 'commit', f'count ({label})', 'critical'],
+                         [[f"#{r['run']}", _time(r['created_at']), (r['commit'] or '')[:10], r['count'],
+                           r['critical']] for r in records])
+        return 0
+
+    if args.command == 'new':
+        run_id = args.run or latest_run(conn)
+        records = seen(conn, first_run=run_id, limit=args.limit) if run_id else []
+    else:
+        records = seen(conn, args.rule, args.path, args.fingerprint, args.active, limit=args.limit)
+    if args.json:
+        print(json.dumps(records, ensure_ascii=False, indent=2))
+    elif records:
+        _print_seen(records)
+    else:
+        print('該当する検出結果はありません', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,59 +2,47 @@
 """
 PRコメント生成スクリプト
 セキュリティチェック結果を集約してMarkdown形式のコメントを生成
+
+結果は findings.py が正規化した findings.jsonl から読み込み、
+表示行数はGitHubのコメント上限に収まるよう制限する
+--baseline を指定した場合、既知の問題は件数のみ別枠で表示する
+--metrics-file を指定した場合、件数とスキャン時間を Prometheus textfile 形式で書き出す
+--context を指定した場合、表に載せた問題の前後のソースコードを折りたたみで表示する
+スキャンが時間制限で途中停止していた場合は、結果が不完全であることを明示する
 """
 
 import argparse
-import json
+import heapq
+import re
+import time
+from collections import Counter
 from pathlib import Path
-from typing import Dict, List, Any
-from collections import defaultdict
-
-
-def load_json_results(file_path: Path) -> Dict[str, Any]:
-    """JSON結果ファイルを読み込む"""
-    if not file_path.exists():
-        return {}
-
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        return {}
-
-
-def parse_bandit_results(results: Dict[str, Any]) -> List[Dict[str, str]]:
-    """Bandit結果をパース"""
-    issues = []
-    for result in results.get('results', []):
-        issues.append({
-            'severity': result.get('issue_severity', 'UNKNOWN'),
-            'confidence': result.get('issue_confidence', 'UNKNOWN'),
-            'rule': result.get('test_id', 'Unknown'),
-            'file': result.get('filename', 'Unknown'),
-            'line': result.get('line_number', '?'),
-            'message': result.get('issue_text', 'No description'),
-            'code': result.get('code', ''),
-        })
-    return issues
-
-
-def parse_semgrep_results(results: Dict[str, Any]) -> List[Dict[str, str]]:
-    """Semgrep結果をパース"""
-    issues = []
-    for result in results.get('results', []):
-        # IPAセクション番号を抽出
-        ipa_section = result.get('extra', {}).get('metadata', {}).get('ipa_section', '')
-
-        issues.append({
-            'severity': result.get('extra', {}).get('severity', 'WARNING').upper(),
-            'rule': result.get('check_id', 'Unknown').split('.')[-1],
-            'file': result.get('path', 'Unknown'),
-            'line': result.get('start', {}).get('line', '?'),
-            'message': result.get('extra', {}).get('message', 'No description'),
-            'ipa_section': ipa_section,
-        })
-    return issues
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from baseline import load_baseline, mark_baselined
+from findings import incomplete_scans, load_findings, severity_rank
+from metrics import FindingStats, MetricFamilies, add_run_metrics, add_scan_metrics
+from source_context import SourceCache
+
+# GitHubのコメント本文の上限（65536文字）に余裕を持たせた値
+MAX_COMMENT_CHARS = 65000
+# 各セクションで保持する表示候補の最大行数
+MAX_ROWS_PER_SECTION = 300
+# 省略時のサマリー表に載せる最大件数
+SUMMARY_TABLE_LIMIT = 20
+
+# ソースコード表示のコードブロックの言語
+FENCE_LANGUAGES = {
+    '.py': 'python',
+    '.ts': 'typescript',
+    '.tsx': 'tsx',
+    '.js': 'javascript',
+    '.jsx': 'jsx',
+}
+
+SNIPPETS_CLOSE = "\n</details>\n"
+
+_BACKTICKS_RE = re.compile(r'`+')
 
 
 def severity_emoji(severity: str) -> str:
@@ -68,147 +56,384 @@ def severity_emoji(severity: str) -> str:
         return '🟢'
 
 
+def rule_label(issue: Dict[str, Any]) -> str:
+    """ルール表示（重複統合された場合は報告した全ルール）"""
+    return ' + '.join(issue.get('rules') or [issue['rule']])
+
+
+def table_cell(text: Any, limit: Optional[int] = None) -> str:
+    """Markdownテーブルのセル用に整形する（改行・パイプのエスケープ）"""
+    value = ' '.join(str(text).split())
+    if limit is not None and len(value) > limit:
+        value = value[:limit] + '...'
+    return value.replace('|', '\\|')
+
+
+class SectionSummary:
+    """1セクション分の集計と表示候補（重大度上位のみ保持）"""
+
+    def __init__(self, with_ipa: bool, message_limit: int):
+        self.with_ipa = with_ipa
+        self.message_limit = message_limit
+        self.total = 0
+        self.critical = 0
+        self.merged = 0
+        self._rows: List[Tuple[int, int, Dict[str, Any]]] = []
+
+    def add(self, issue: Dict[str, Any]):
+        """問題を1件追加する"""
+        self.total += 1
+        if issue['critical']:
+            self.critical += 1
+        if len(issue.get('rules', ())) > 1:
+            self.merged += 1
+        # 重大度が高く、先に出現したものを優先して保持する
+        entry = (severity_rank(issue['severity']), -self.total, issue)
+        if len(self._rows) < MAX_ROWS_PER_SECTION:
+            heapq.heappush(self._rows, entry)
+        elif entry[:2] > self._rows[0][:2]:
+            heapq.heapreplace(self._rows, entry)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """重大度順に並べた表示候補"""
+        return [issue for _, _, issue in sorted(self._rows, key=lambda e: e[:2], reverse=True)]
+
+    def header(self) -> str:
+        if self.with_ipa:
+            return ("| Severity | IPA | Rule | File | Line | Message |\n"
+                    "|----------|-----|------|------|------|----------|\n")
+        return ("| Severity | Rule | File | Line | Message |\n"
+                "|----------|------|------|------|----------|\n")
+
+    def format_row(self, issue: Dict[str, Any]) -> str:
+        emoji = severity_emoji(issue['severity'])
+        message = table_cell(issue['message'], self.message_limit)
+        if self.with_ipa:
+            ipa = issue.get('ipa_section') or '-'
+            return (f"| {emoji} {issue['severity']} | {ipa} | {table_cell(rule_label(issue))} | "
+                    f"`{table_cell(issue['file'])}` | {issue['line']} | {message} |\n")
+        return (f"| {emoji} {issue['severity']} | {table_cell(rule_label(issue))} | "
+                f"`{table_cell(issue['file'])}` | {issue['line']} | {message} |\n")
+
+
+class MarkdownWriter:
+    """文字数上限つきのリストベースMarkdownライター"""
+
+    def __init__(self, budget: int):
+        self.parts: List[str] = []
+        self.length = 0
+        self.budget = budget
+
+    def write(self, text: str):
+        """上限に関係なく書き込む"""
+        self.parts.append(text)
+        self.length += len(text)
+
+    def try_write(self, text: str) -> bool:
+        """上限内に収まる場合のみ書き込む"""
+        if self.length + len(text) > self.budget:
+            return False
+        self.write(text)
+        return True
+
+    def getvalue(self) -> str:
+        return ''.join(self.parts)
+
+
+class BaselineSummary:
+    """ベースライン登録済み（既知）の問題の件数"""
+
+    def __init__(self):
+        self.total = 0
+        self.critical = 0
+        self.rule_counts: Counter = Counter()
+
+    def add(self, issue: Dict[str, Any]):
+        self.total += 1
+        if issue['critical']:
+            self.critical += 1
+        self.rule_counts[rule_label(issue)] += 1
+
+    def render(self) -> str:
+        """折りたたみ表示のMarkdown"""
+        parts = [f"\n<details>\n<summary>📌 ベースライン登録済みの既知の問題: {self.total} 件"
+                 f"（うち重大 {self.critical} 件）</summary>\n\n",
+                 "| Rule | Issues |\n|------|--------|\n"]
+        for rule, count in self.rule_counts.most_common(SUMMARY_TABLE_LIMIT):
+            parts.append(f"| {table_cell(rule)} | {count} |\n")
+        parts.append("\n</details>\n")
+        return ''.join(parts)
+
+
+def collect_findings(
+    findings: Iterable[Dict[str, Any]],
+    baselined: Optional[BaselineSummary] = None,
+) -> Tuple[Dict[str, SectionSummary], Counter, Counter]:
+    """全件を1回走査してセクションごとの集計とルール/ファイル別件数を作る（既知の問題は別集計）"""
+    sections = {
+        'bandit': SectionSummary(with_ipa=False, message_limit=80),
+        'semgrep_python': SectionSummary(with_ipa=True, message_limit=60),
+        'semgrep_typescript': SectionSummary(with_ipa=True, message_limit=60),
+    }
+    rule_counts: Counter = Counter()
+    file_counts: Counter = Counter()
+
+    for issue in findings:
+        if issue.get('baselined') and baselined is not None:
+            baselined.add(issue)
+            continue
+        sections[issue['section']].add(issue)
+        rule_counts[issue['rule']] += 1
+        file_counts[issue['file']] += 1
+
+    return sections, rule_counts, file_counts
+
+
+def _write_rows(writer: MarkdownWriter, section: SectionSummary, rows: List[Dict[str, Any]]) -> int:
+    """上限内で書ける行だけ書き込み、書けた件数を返す"""
+    if not writer.try_write(section.header()):
+        return 0
+    written = 0
+    for issue in rows:
+        if not writer.try_write(section.format_row(issue)):
+            break
+        written += 1
+    return written
+
+
+def format_snippet(issue: Dict[str, Any], lines: List[Tuple[int, str]]) -> str:
+    """1件分のソースコード表示（検出行に > を付ける）"""
+    width = len(str(lines[-1][0]))
+    body = '\n'.join(f"{'>' if number == issue['line'] else ' '} {number:>{width}} | {text}"
+                     for number, text in lines)
+    # コード中のバッククォートより長いフェンスで囲む
+    fence = '`' * max(3, max((len(run) for run in _BACKTICKS_RE.findall(body)), default=0) + 1)
+    language = FENCE_LANGUAGES.get(Path(issue['file']).suffix.lower(), '')
+    return (f"\n**`{table_cell(issue['file'])}:{issue['line']}`** {table_cell(rule_label(issue))}\n\n"
+            f"{fence}{language}\n{body}\n{fence}\n")
+
+
+def _snippets_opening(count: int) -> str:
+    return f"\n<details>\n<summary>📄 ソースコード ({count} 件)</summary>\n"
+
+
+def _write_snippets(writer: MarkdownWriter, issues: List[Dict[str, Any]], sources: SourceCache, context: int):
+    """表に載せた問題のソースコードを上限内で書ける分だけ折りたたみで書き込む"""
+    # 開始・終了タグの分は最大件数で見積もって確保しておく
+    used = len(_snippets_opening(len(issues))) + len(SNIPPETS_CLOSE)
+    snippets = []
+    for issue in issues:
+        lines = sources.context(issue['file'], issue['line'], context)
+        if not lines:
+            continue
+        snippet = format_snippet(issue, lines)
+        if writer.length + used + len(snippet) > writer.budget:
+            break
+        snippets.append(snippet)
+        used += len(snippet)
+    if snippets:
+        writer.write(_snippets_opening(len(snippets)))
+        writer.write(''.join(snippets))
+        writer.write(SNIPPETS_CLOSE)
+
+
+def _write_section(writer: MarkdownWriter, section: SectionSummary, sources: Optional[SourceCache],
+                   context: int) -> bool:
+    """表（とソースコード）を書き込み、省略した問題があるかを返す"""
+    rows = section.rows()
+    written = _write_rows(writer, section, rows)
+    writer.write(_omitted_note(section, written))
+    if sources is not None and written:
+        _write_snippets(writer, rows[:written], sources, context)
+    return written < section.total
+
+
+def _omitted_note(section: SectionSummary, written: int) -> str:
+    omitted = section.total - written
+    if omitted <= 0:
+        return ''
+    return f"\n> ⚠️ 他 {omitted} 件は省略しました（下部のサマリー表を参照）\n"
+
+
+def _summary_tables(rule_counts: Counter, file_counts: Counter) -> str:
+    """省略時に表示するルール別/ファイル別のサマリー表"""
+    parts = ["\n---\n\n### 📊 Summary (truncated report)\n\n",
+             "| Rule | Issues |\n|------|--------|\n"]
+    for rule, count in rule_counts.most_common(SUMMARY_TABLE_LIMIT):
+        parts.append(f"| {table_cell(rule)} | {count} |\n")
+    parts.append("\n| File | Issues |\n|------|--------|\n")
+    for file_name, count in file_counts.most_common(SUMMARY_TABLE_LIMIT):
+        parts.append(f"| `{table_cell(file_name)}` | {count} |\n")
+    return ''.join(parts)
+
+
+def _partial_note(partial: List[Dict[str, Any]]) -> str:
+    """時間制限で途中停止したスキャンの注記"""
+    parts = ["> ⏱️ **時間制限によりスキャンが途中で停止したため、結果は不完全です**\n>\n"]
+    for scan in partial:
+        parts.append(f"> - {scan.get('label', '?')}: 未スキャン {scan.get('unscanned_files', 0)} ファイル\n")
+    return ''.join(parts) + "\n"
+
+
+def _footer(critical_count: int, total_issues: int, partial: bool = False) -> str:
+    parts = ["""
+---
+
+### 📚 References
+
+- 📖 [セキュリティ規約](./templates/nextjs-fastapi/.cursor/rules/security.mdc)
+- ✅ [セキュリティチェックリスト](./templates/nextjs-fastapi/docs/security-checklist.md)
+- 🔗 [IPA 安全なウェブサイトの作り方](https://www.ipa.go.jp/security/vuln/websecurity/)
+
+### 💡 Next Steps
+
+"""]
+
+    if critical_count > 0:
+        parts.append("""1. 🔴 **重大な問題を優先的に修正してください**
+2. セキュリティ規約を参照して適切な対策を実装
+3. 修正後、再度セキュリティチェックを実行
+""")
+    elif total_issues > 0:
+        parts.append("""1. 警告内容を確認して必要に応じて修正
+2. False positiveの場合は `.bandit` や Semgrep設定で除外を検討
+3. セキュリティ規約に沿った実装になっているか確認
+""")
+    elif partial:
+        parts.append("""1. ⏱️ スキャンが完了していないため、合格とは判定していません
+2. 時間制限（`--time-budget` / `--tool-budget`）を見直して再度セキュリティチェックを実行
+""")
+    else:
+        parts.append("✅ セキュリティチェックに合格しました。そのままマージできます。\n")
+    return ''.join(parts)
+
+
 def generate_markdown_report(
-    bandit_issues: List[Dict],
-    semgrep_python_issues: List[Dict],
-    semgrep_typescript_issues: List[Dict],
+    findings: Iterable[Dict[str, Any]],
+    max_chars: int = MAX_COMMENT_CHARS,
+    sources: Optional[SourceCache] = None,
+    context: int = 0,
+    partial: Optional[List[Dict[str, Any]]] = None,
 ) -> str:
-    """Markdown形式のレポートを生成"""
+    """
+    Markdown形式のレポートを生成（sources を渡すと前後 context 行のソースコードも表示）
 
-    # 問題の総数をカウント
-    total_issues = len(bandit_issues) + len(semgrep_python_issues) + len(semgrep_typescript_issues)
+    partial は時間制限で途中停止したスキャン（scan-summary.json の timed_out のもの）
+    """
+    baselined = BaselineSummary()
+    sections, rule_counts, file_counts = collect_findings(findings, baselined)
+    bandit = sections['bandit']
+    semgrep_python = sections['semgrep_python']
+    semgrep_typescript = sections['semgrep_typescript']
 
-    # 重大度別にカウント
-    critical_count = sum(
-        1 for issue in (bandit_issues + semgrep_python_issues + semgrep_typescript_issues)
-        if issue.get('severity', '').upper() in ['CRITICAL', 'HIGH', 'ERROR']
-    )
+    # 問題の総数と重大な問題の数
+    total_issues = sum(section.total for section in sections.values())
+    critical_count = sum(section.critical for section in sections.values())
 
     # ヘッダー
-    if total_issues == 0:
+    new_label = '新しい' if baselined.total else ''
+    if total_issues == 0 and partial:
+        status_emoji = '⏱️'
+        status_text = 'スキャンが時間内に完了しなかったため、結果は不完全です'
+    elif total_issues == 0:
         status_emoji = '✅'
         status_text = 'すべてのセキュリティチェックに合格しました'
     elif critical_count > 0:
         status_emoji = '🔴'
-        status_text = f'{critical_count}件の重大な問題が検出されました'
+        status_text = f'{critical_count}件の{new_label}重大な問題が検出されました'
     else:
         status_emoji = '🟡'
-        status_text = f'{total_issues}件の警告が検出されました'
+        status_text = f'{total_issues}件の{new_label}警告が検出されました'
 
-    markdown = f"""## 🔒 Security Check Results
+    footer = _footer(critical_count, total_issues, bool(partial))
+    if baselined.total:
+        footer = baselined.render() + footer
+    summary = _summary_tables(rule_counts, file_counts)
+    # フッターと省略時のサマリー表の分を確保した上で本文を書き込む
+    writer = MarkdownWriter(max_chars - len(footer) - len(summary))
+    truncated = False
+
+    writer.write(f"""## 🔒 Security Check Results
 
 {status_emoji} **{status_text}**
 
----
-
-"""
+""")
+    if partial:
+        writer.write(_partial_note(partial))
+    merged_count = sum(section.merged for section in sections.values())
+    if merged_count:
+        writer.write(f"> ℹ️ 複数のツール・ルールが同じ箇所を指摘した {merged_count} 件は1件にまとめています\n\n")
+    writer.write("---\n\n")
 
     # Python (Bandit + Semgrep)
-    python_total = len(bandit_issues) + len(semgrep_python_issues)
+    python_total = bandit.total + semgrep_python.total
 
     if python_total > 0:
-        markdown += f"""### 🐍 Python Security ({python_total} issues)
+        writer.write(f"""### 🐍 Python Security ({python_total} issues)
 
-#### Bandit Results ({len(bandit_issues)} issues)
+#### Bandit Results ({bandit.total} issues)
 
-"""
-        if bandit_issues:
-            markdown += "| Severity | Rule | File | Line | Message |\n"
-            markdown += "|----------|------|------|------|----------|\n"
-            for issue in sorted(bandit_issues, key=lambda x: x['severity'], reverse=True):
-                emoji = severity_emoji(issue['severity'])
-                markdown += f"| {emoji} {issue['severity']} | {issue['rule']} | `{issue['file']}` | {issue['line']} | {issue['message'][:80]}... |\n"
+""")
+        if bandit.total:
+            truncated |= _write_section(writer, bandit, sources, context)
         else:
-            markdown += "✅ No issues found\n"
+            writer.write("✅ No issues found\n")
 
-        markdown += f"\n#### Semgrep (Python) Results ({len(semgrep_python_issues)} issues)\n\n"
+        writer.write(f"\n#### Semgrep (Python) Results ({semgrep_python.total} issues)\n\n")
 
-        if semgrep_python_issues:
-            markdown += "| Severity | IPA | Rule | File | Line | Message |\n"
-            markdown += "|----------|-----|------|------|------|----------|\n"
-            for issue in sorted(semgrep_python_issues, key=lambda x: x['severity'], reverse=True):
-                emoji = severity_emoji(issue['severity'])
-                ipa = issue.get('ipa_section', '-')
-                markdown += f"| {emoji} {issue['severity']} | {ipa} | {issue['rule']} | `{issue['file']}` | {issue['line']} | {issue['message'][:60]}... |\n"
+        if semgrep_python.total:
+            truncated |= _write_section(writer, semgrep_python, sources, context)
         else:
-            markdown += "✅ No issues found\n"
+            writer.write("✅ No issues found\n")
     else:
-        markdown += "### 🐍 Python Security\n\n✅ No issues found\n"
+        writer.write("### 🐍 Python Security\n\n✅ No issues found\n")
 
-    markdown += "\n---\n\n"
+    writer.write("\n---\n\n")
 
     # TypeScript/JavaScript (Semgrep)
-    if semgrep_typescript_issues:
-        markdown += f"""### 📘 TypeScript/JavaScript Security ({len(semgrep_typescript_issues)} issues)
-
-| Severity | IPA | Rule | File | Line | Message |
-|----------|-----|------|------|------|----------|
-"""
-        for issue in sorted(semgrep_typescript_issues, key=lambda x: x['severity'], reverse=True):
-            emoji = severity_emoji(issue['severity'])
-            ipa = issue.get('ipa_section', '-')
-            markdown += f"| {emoji} {issue['severity']} | {ipa} | {issue['rule']} | `{issue['file']}` | {issue['line']} | {issue['message'][:60]}... |\n"
+    if semgrep_typescript.total:
+        writer.write(f"### 📘 TypeScript/JavaScript Security ({semgrep_typescript.total} issues)\n\n")
+        truncated |= _write_section(writer, semgrep_typescript, sources, context)
     else:
-        markdown += "### 📘 TypeScript/JavaScript Security\n\n✅ No issues found\n"
-
-    # フッター
-    markdown += """
----
-
-### 📚 References
-
-- 📖 [セキュリティ規約](./templates/nextjs-fastapi/.cursor/rules/security.mdc)
-- ✅ [セキュリティチェックリスト](./templates/nextjs-fastapi/docs/security-checklist.md)
-- 🔗 [IPA 安全なウェブサイトの作り方](https://www.ipa.go.jp/security/vuln/websecurity/)
-
-### 💡 Next Steps
+        writer.write("### 📘 TypeScript/JavaScript Security\n\n✅ No issues found\n")
 
-"""
+    if truncated:
+        writer.write(summary)
 
-    if critical_count > 0:
-        markdown += """1. 🔴 **重大な問題を優先的に修正してください**
-2. セキュリティ規約を参照して適切な対策を実装
-3. 修正後、再度セキュリティチェックを実行
-"""
-    elif total_issues > 0:
-        markdown += """1. 警告内容を確認して必要に応じて修正
-2. False positiveの場合は `.bandit` や Semgrep設定で除外を検討
-3. セキュリティ規約に沿った実装になっているか確認
-"""
-    else:
-        markdown += "✅ セキュリティチェックに合格しました。そのままマージできます。\n"
+    # フッター
+    writer.write(footer)
 
-    return markdown
+    return writer.getvalue()
 
 
 def main():
+    started = time.perf_counter()
     parser = argparse.ArgumentParser(description='Generate PR comment from security check results')
     parser.add_argument('--results-dir', type=Path, required=True, help='Results directory')
     parser.add_argument('--output', type=Path, required=True, help='Output markdown file')
+    parser.add_argument('--max-chars', type=int, default=MAX_COMMENT_CHARS,
+                        help='Maximum comment length in characters')
+    parser.add_argument('--baseline', type=Path, help='Report findings in this baseline file separately')
+    parser.add_argument('--context', type=int, default=0, metavar='N',
+                        help='Show N lines of source code around each reported finding')
+    parser.add_argument('--source-root', type=Path, default=Path('.'),
+                        help='Directory the finding paths are relative to (default: current directory)')
+    parser.add_argument('--metrics-file', type=Path,
+                        help='Write finding counts and scan durations in Prometheus textfile format')
     args = parser.parse_args()
 
-    # 結果ファイルを読み込む
-    bandit_results = load_json_results(
-        args.results_dir / 'python-security-results' / 'bandit-results.json'
-    )
-    semgrep_python_results = load_json_results(
-        args.results_dir / 'python-security-results' / 'semgrep-python-results.json'
-    )
-    semgrep_typescript_results = load_json_results(
-        args.results_dir / 'typescript-security-results' / 'semgrep-typescript-results.json'
-    )
-
-    # 結果をパース
-    bandit_issues = parse_bandit_results(bandit_results)
-    semgrep_python_issues = parse_semgrep_results(semgrep_python_results)
-    semgrep_typescript_issues = parse_semgrep_results(semgrep_typescript_results)
-
-    # Markdownレポートを生成
-    markdown = generate_markdown_report(
-        bandit_issues,
-        semgrep_python_issues,
-        semgrep_typescript_issues,
-    )
+    findings = load_findings(args.results_dir)
+    if args.baseline:
+        findings = mark_baselined(findings, load_baseline(args.baseline))
+    stats = FindingStats()
+    if args.metrics_file:
+        findings = stats.observe(findings)
+
+    # 正規化済みの検出結果からMarkdownレポートを生成
+    with SourceCache(args.source_root) as sources:
+        markdown = generate_markdown_report(findings, max_chars=args.max_chars,
+                                            sources=sources if args.context > 0 else None, context=args.context,
+                                            partial=incomplete_scans(args.results_dir))
 
     # ファイルに出力
     with open(args.output, 'w', encoding='utf-8') as f:
@@ -216,6 +441,16 @@ def main():
 
     print(f"✅ PR comment generated: {args.output}")
 
+    if args.metrics_file:
+        metrics = MetricFamilies('generate-pr-comment')
+        stats.add_to(metrics)
+        add_scan_metrics(metrics, args.results_dir)
+        metrics.add('report_characters', 'gauge', 'Length of the generated PR comment', len(markdown))
+        if args.context > 0:
+            metrics.add('report_source_files', 'gauge', 'Source files read for code context', sources.misses)
+        add_run_metrics(metrics, started)
+        metrics.write(args.metrics_file)
+
 
 if __name__ == '__main__':
     main()
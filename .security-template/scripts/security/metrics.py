@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Prometheus textfile-collector 形式のメトリクス出力
+check-critical-issues.py / generate-pr-comment.py の --metrics-file で使用する
+
+検出結果の件数（ツール・重大度別）、scan-summary.json に記録された
+ツールごとのスキャン時間（起動ごと・タスク全体）を node_exporter の textfile collector 向けに書き出す
+ファイルは一時ファイル経由で置き換えるため、収集中に書きかけが読まれることはない
+
+すべてのサンプルに出力したスクリプトの script ラベルを付けるため、
+両スクリプトの出力を同じ textfile ディレクトリに置いても系列は重複しない
+counter は前回の出力の値に加算して書き出し、実行をまたいで単調増加させる
+（histogram は同じスキャン結果を集計し直した場合に二重に数えないよう、直近のスキャンの分だけ）
+"""
+
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from findings import load_scan_summary
+
+PREFIX = 'security'
+
+# ツール1回の実行時間（秒）のバケット
+SCAN_DURATION_BUCKETS = (1, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    label_text = ','.join(f'{key}="{_escape(str(label))}"' for key, label in labels)
+    return f"{{{label_text}}}" if label_text else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+def _read_samples(path: Path) -> Dict[str, float]:
+    """既存の出力の サンプル名{ラベル} -> 値（読めなければ空）"""
+    samples: Dict[str, float] = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith('#') or not line.strip():
+                    continue
+                series, _, value = line.rstrip('\n').rpartition(' ')
+                try:
+                    samples[series] = float(value)
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return samples
+
+
+class MetricFamilies:
+    """メトリクスをファミリー単位でまとめ、テキスト形式で出力する"""
+
+    def __init__(self, script: Optional[str] = None):
+        """script を指定するとすべてのサンプルに script ラベルを付ける"""
+        self._families: Dict[str, Tuple[str, str, List[Tuple[str, Labels, float]]]] = {}
+        self._common: Labels = (('script', script),) if script else ()
+
+    def add(self, name: str, metric_type: str, help_text: str, value: float,
+            labels: Optional[Dict[str, str]] = None, suffix: str = ''):
+        """
+        サンプルを追加する（name は接頭辞 security_ を除いた名前）
+
+        suffix はサンプル名の接尾辞（histogram の _bucket / _sum / _count）
+        """
+        family = self._families.setdefault(f"{PREFIX}_{name}", (metric_type, help_text, []))
+        family[2].append((suffix, self._common + tuple((labels or {}).items()), value))
+
+    def histogram(self, name: str, help_text: str, observations: Sequence[float], buckets: Sequence[float],
+                  labels: Optional[Dict[str, str]] = None):
+        """観測値から累積バケットの histogram を追加する"""
+        labels = labels or {}
+        for bound in (*buckets, float('inf')):
+            count = sum(1 for value in observations if value <= bound)
+            self.add(name, 'histogram', help_text, count, {**labels, 'le': _format_value(bound)}, '_bucket')
+        self.add(name, 'histogram', help_text, round(sum(observations), 6), labels, '_sum')
+        self.add(name, 'histogram', help_text, len(observations), labels, '_count')
+
+    def render(self, previous: Optional[Dict[str, float]] = None) -> str:
+        """Prometheus テキスト形式の文字列を返す（counter は previous の値に加算する）"""
+        previous = previous or {}
+        lines = []
+        for name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix, labels, value in samples:
+                series = f"{name}{suffix}{_format_labels(labels)}"
+                if metric_type == 'counter':
+                    value = round(previous.get(series, 0) + value, 6)
+                lines.append(f"{series} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path: Path):
+        """前回の出力の counter を引き継ぎ、一時ファイルに書いてから置き換える"""
+        path = Path(path)
+        tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+        tmp_path.write_text(self.render(_read_samples(path)), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+
+class FindingStats:
+    """検出結果を読み進めながらツール・重大度別に集計する（結果は保持しない）"""
+
+    def __init__(self):
+        self.by_tool_severity: Counter = Counter()
+        self.critical = 0
+        self.baselined = 0
+
+    def observe(self, findings: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """findings をそのまま返しつつ件数を数える"""
+        for finding in findings:
+            if finding.get('baselined'):
+                self.baselined += 1
+            else:
+                # scan-summary.json と同じツール名（bandit / semgrep-python / semgrep-typescript）
+                tool = finding.get('section', finding['tool']).replace('_', '-')
+                self.by_tool_severity[(tool, finding['severity'])] += 1
+                if finding['critical']:
+                    self.critical += 1
+            yield finding
+
+    def add_to(self, metrics: MetricFamilies):
+        for (tool, severity), count in sorted(self.by_tool_severity.items()):
+            metrics.add('findings', 'gauge', 'Findings by tool and severity (excluding baselined)',
+                        count, {'tool': tool, 'severity': severity})
+        metrics.add('findings_critical', 'gauge', 'Critical findings (HIGH/CRITICAL/ERROR, excluding baselined)',
+                    self.critical)
+        metrics.add('findings_baselined', 'gauge', 'Findings suppressed by the baseline', self.baselined)
+
+
+def add_scan_metrics(metrics: MetricFamilies, results_dir: Path):
+    """run-security-check.py が記録したツールごとの実行時間・キャッシュ統計を追加する"""
+    for tool, task in load_scan_summary(results_dir).items():
+        labels = {'tool': tool}
+        # 分割実行（キャッシュ・時間制限）では分割ごとの実行時間、それ以外は1回分
+        invocations = task.get('invocation_seconds')
+        if invocations is None:
+            invocations = [task['duration_seconds']] if task.get('duration_seconds') else []
+        metrics.histogram('scan_duration_seconds', 'Wall time of each tool invocation in the last scan',
+                          invocations, SCAN_DURATION_BUCKETS, labels)
+        # キャッシュだけで済んだ実行（起動 0 回）も「スキャンなし」と区別できるようタスク全体の時間も出す
+        metrics.add('scan_task_duration_seconds', 'gauge',
+                    'Wall time of the last scan task per tool, including cache lookups',
+                    task.get('duration_seconds', 0), labels)
+        if task.get('returncode') is not None:
+            metrics.add('scan_exit_code', 'gauge', 'Exit code of the last scan per tool', task['returncode'], labels)
+        metrics.add('scan_cache_hits', 'gauge', 'Files served from the findings cache', task.get('cache_hits', 0),
+                    labels)
+        metrics.add('scan_cache_misses', 'gauge', 'Files scanned because they were not cached',
+                    task.get('cache_misses', 0), labels)
+        metrics.add('scan_timed_out', 'gauge', '1 if the scan was stopped by its time budget (partial results)',
+                    int(bool(task.get('timed_out'))), labels)
+        metrics.add('scan_unscanned_files', 'gauge', 'Files left unscanned when the time budget ran out',
+                    task.get('unscanned_files', 0), labels)
+
+
+def add_run_metrics(metrics: MetricFamilies, started: float):
+    """スクリプト自体の実行時刻・所要時間・実行回数を追加する（started は time.perf_counter() の値）"""
+    metrics.add('check_last_run_timestamp_seconds', 'gauge', 'UNIX time the script finished',
+                round(time.time(), 3))
+    metrics.add('check_duration_seconds', 'gauge', 'Wall time of the script',
+                round(time.perf_counter() - started, 6))
+    metrics.add('check_runs_total', 'counter', 'Runs of the script that wrote this file', 1)
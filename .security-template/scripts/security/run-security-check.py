@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+ローカルセキュリティチェック実行スクリプト（並列版）
+Bandit / Semgrep (Python) / Semgrep (TypeScript) を並列に1回ずつ実行し、
+人間が読みやすい出力はJSON結果から生成する
+
+終了コード: 問題なし 0 / 問題あり 1 / 時間制限でスキャン未完了 3（run-security-check.sh はこのスクリプトを実行する）
+
+--time-budget（全体）/ --tool-budget（ツールごと）を指定した場合、未キャッシュのファイルを
+分割して実行し、制限に達したツールは停止して完了した分の結果だけを残す（scan-summary.json に timed_out を記録）
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from baseline import DEFAULT_BASELINE, load_baseline, mark_baselined
+from changed_files import LANGUAGE_EXTENSIONS, changed_files, filter_language
+from findings import SCAN_SUMMARY_FILE, load_findings
+from findings_history import connect, current_revision, ingest
+from scan_cache import (ScanCache, is_ignored, list_candidate_files, load_ignore_patterns, merge_entries,
+                        split_by_file, tool_version)
+from scan_config import load_scan_config, scan_targets, semgrep_rules, watch_patterns, within_targets
+
+# カラー出力
+RED = '\033[0;31m'
+GREEN = '\033[0;32m'
+YELLOW = '\033[1;33m'
+BLUE = '\033[0;34m'
+NC = '\033[0m'
+
+EMPTY_RESULTS: Dict[str, Any] = {'errors': [], 'results': []}
+
+# コマンド中でスキャン対象パスに置き換えるプレースホルダ
+TARGETS = '<targets>'
+
+# 時間制限つきの実行で1回のツール起動に渡すファイル数
+BUDGET_BATCH_FILES = 200
+# 停止要求（SIGTERM）から強制終了までの猶予秒数
+STOP_GRACE_SECONDS = 10
+
+# スキャンが時間制限で完了しなかった場合の終了コード
+PARTIAL_EXIT_CODE = 3
+
+# --tool-budget で指定できるツール名（ScanTask.name）
+TASK_NAMES = ('bandit', 'semgrep-python', 'semgrep-typescript')
+
+
+class ScanTask:
+    """1つのセキュリティツール実行"""
+
+    def __init__(self, name: str, label: str, language: str, command: List[str],
+                 output_path: Path, targets: List[str], rules_path: Path):
+        self.name = name
+        self.label = label
+        self.language = language
+        # command 内の TARGETS をスキャン対象のパスに展開して実行する
+        self.command = command
+        self.output_path = output_path
+        self.targets = targets
+        self.rules_path = rules_path
+        self.returncode: Optional[int] = None
+        self.stderr = ''
+        self.duration = 0.0
+        # ツールを起動するごとの実行時間（分割実行では分割ごと）
+        self.invocations: List[float] = []
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.timed_out = False
+        self.unscanned_files = 0
+
+    @property
+    def kind(self) -> str:
+        """出力形式の種類（bandit / semgrep）"""
+        return 'bandit' if self.name == 'bandit' else 'semgrep'
+
+    @property
+    def has_targets(self) -> bool:
+        return bool(self.targets)
+
+    def command_for(self, targets: List[str]) -> List[str]:
+        """スキャン対象を展開したコマンドを返す"""
+        command: List[str] = []
+        for arg in self.command:
+            if arg == TARGETS:
+                command.extend(targets)
+            else:
+                command.append(arg)
+        return command
+
+    def load_results(self) -> Dict[str, Any]:
+        """JSON結果ファイルを読み込む"""
+        if not self.output_path.exists():
+            return {}
+        try:
+            with open(self.output_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+    def write_results(self, results: Dict[str, Any]):
+        """JSON結果ファイルを書き出す"""
+        with open(self.output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    def summary(self) -> Dict[str, Any]:
+        """scan-summary.json 用の実行情報"""
+        return {
+            'label': self.label,
+            'returncode': self.returncode,
+            'duration_seconds': round(self.duration, 3),
+            'invocation_seconds': [round(seconds, 3) for seconds in self.invocations],
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'timed_out': self.timed_out,
+            'unscanned_files': self.unscanned_files,
+        }
+
+
+def color(text: str, code: str, enabled: bool) -> str:
+    """カラーコードを付与する"""
+    return f"{code}{text}{NC}" if enabled else text
+
+
+def build_tasks(results_dir: Path, targets: Dict[str, List[str]]) -> List[ScanTask]:
+    """インストール済みのツールから実行タスクを組み立てる"""
+    python_dir = results_dir / 'python-security-results'
+    typescript_dir = results_dir / 'typescript-security-results'
+
+    tasks = []
+    if shutil.which('bandit'):
+        tasks.append(ScanTask(
+            'bandit', 'Bandit', 'python',
+            ['bandit', '-r', TARGETS, '-c', '.bandit', '-f', 'json',
+             '-o', str(python_dir / 'bandit-results.json')],
+            python_dir / 'bandit-results.json',
+            targets['python'], Path('.bandit'),
+        ))
+    if shutil.which('semgrep'):
+        # プロジェクトで有効なルールだけのパックを使う（無効化された言語はスキャンしない）
+        scan_config = load_scan_config()
+        python_rules = semgrep_rules('python', scan_config)
+        typescript_rules = semgrep_rules('typescript', scan_config)
+        if python_rules is not None:
+            tasks.append(ScanTask(
+                'semgrep-python', 'Semgrep (Python)', 'python',
+                ['semgrep', '--config', str(python_rules),
+                 '--json', '--output', str(python_dir / 'semgrep-python-results.json'), TARGETS],
+                python_dir / 'semgrep-python-results.json',
+                targets['python'], python_rules,
+            ))
+        if typescript_rules is not None:
+            tasks.append(ScanTask(
+                'semgrep-typescript', 'Semgrep (TypeScript)', 'typescript',
+                ['semgrep', '--config', str(typescript_rules),
+                 '--json', '--output', str(typescript_dir / 'semgrep-typescript-results.json'), TARGETS],
+                typescript_dir / 'semgrep-typescript-results.json',
+                targets['typescript'], typescript_rules,
+            ))
+    return tasks
+
+
+def resolve_targets(target: Optional[str], since: Optional[str]) -> Dict[str, List[str]]:
+    """
+    言語ごとのスキャン対象を決定する
+
+    --target 未指定時は .security-config.yaml で宣言されたルートのみを対象とし、
+    --since 指定時はその配下の変更ファイルのみを対象とする
+    """
+    scan_config = load_scan_config()
+    roots = {
+        language: [target] if target else scan_targets(language, scan_config)
+        for language in LANGUAGE_EXTENSIONS
+    }
+    if not since:
+        return roots
+
+    files = changed_files(since, watch_patterns(scan_config))
+    return {
+        language: within_targets(filter_language(files, language), roots[language])
+        for language in LANGUAGE_EXTENSIONS
+    }
+
+
+def execute(task: ScanTask, targets: List[str], deadline: Optional[float] = None) -> bool:
+    """
+    ツールを1回だけ実行する
+
+    deadline（time.monotonic() の値）を過ぎた場合は停止を要求し、
+    猶予内に終了しなければ強制終了して False を返す
+    """
+    started = time.monotonic()
+    if deadline is not None and started >= deadline:
+        task.timed_out = True
+        return False
+
+    proc = subprocess.Popen(
+        task.command_for(targets),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        _, stderr = proc.communicate(timeout=None if deadline is None else deadline - started)
+    except subprocess.TimeoutExpired:
+        task.timed_out = True
+        proc.terminate()
+        try:
+            _, stderr = proc.communicate(timeout=STOP_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            _, stderr = proc.communicate()
+    elapsed = time.monotonic() - started
+    task.duration += elapsed
+    task.invocations.append(elapsed)
+    task.returncode = proc.returncode
+    task.stderr = stderr
+    return not task.timed_out
+
+
+def run_task(task: ScanTask, cache_dir: Optional[Path] = None, deadline: Optional[float] = None,
+             budget: Optional[float] = None) -> ScanTask:
+    """
+    タスクを実行する（キャッシュ有効時は未キャッシュのファイルのみ解析）
+
+    deadline は全体の期限（time.monotonic() の値）、budget はこのツールの制限秒数
+    """
+    if budget is not None:
+        tool_deadline = time.monotonic() + budget
+        deadline = tool_deadline if deadline is None else min(deadline, tool_deadline)
+    task.output_path.parent.mkdir(parents=True, exist_ok=True)
+    # 前回の結果が残っていると誤ってカウントされるため削除
+    if task.output_path.exists():
+        task.output_path.unlink()
+
+    # 対象ファイルがなければツールを起動せず、同じ構成の空の結果を書き出す
+    if not task.has_targets:
+        task.write_results(EMPTY_RESULTS)
+        task.returncode = 0
+        return task
+
+    if cache_dir is None and deadline is None:
+        execute(task, task.targets)
+        return task
+
+    started = time.monotonic()
+    extensions = LANGUAGE_EXTENSIONS[task.language]
+    files: List[str] = []
+    for target in task.targets:
+        if Path(target).is_dir():
+            files.extend(list_candidate_files(target, extensions))
+        else:
+            files.append(target)
+    if task.kind == 'semgrep':
+        # 全体スキャンと同じく .semgrepignore の対象は解析しない（キャッシュからも返さない）
+        ignore_patterns = load_ignore_patterns()
+        files = [path for path in files if not is_ignored(path, ignore_patterns)]
+
+    cache = None
+    cached: Dict[str, Dict[str, Any]] = {}
+    missing: Dict[str, Optional[str]] = dict.fromkeys(files)
+    if cache_dir is not None:
+        cache = ScanCache(cache_dir, task.name, tool_version(task.command[0]), task.rules_path)
+        cached, missing = cache.partition(files)
+        task.cache_hits, task.cache_misses = cache.hits, cache.misses
+    task.duration += time.monotonic() - started
+
+    entries = {os.path.normpath(path): entry for path, entry in cached.items()}
+    base: Dict[str, Any] = dict(EMPTY_RESULTS)
+    if missing:
+        # (ツールに渡す対象, 解析されるファイル) の組
+        paths = list(missing)
+        if deadline is None:
+            # すべて未キャッシュなら通常どおり元の対象を渡す
+            batches = [(task.targets if len(missing) == len(files) else paths, paths)]
+        else:
+            # 制限に達しても完了した分の結果は残せるよう分割して実行する
+            batches = [(paths[i:i + BUDGET_BATCH_FILES],) * 2 for i in range(0, len(paths), BUDGET_BATCH_FILES)]
+
+        for index, (run_targets, batch) in enumerate(batches):
+            # 停止した場合に前の分割の出力を読まないよう削除しておく
+            if task.output_path.exists():
+                task.output_path.unlink()
+            if not execute(task, run_targets, deadline):
+                task.unscanned_files = sum(len(rest) for _, rest in batches[index:])
+                # 停止までにツールが書き出した結果があれば残す（不完全なのでキャッシュはしない）
+                emitted = task.load_results()
+                if emitted.get('results'):
+                    base = emitted
+                    entries.update((path, entry) for path, entry in split_by_file(task.kind, emitted, []).items()
+                                   if path not in entries)
+                break
+            if task.returncode not in (0, 1) or not task.output_path.exists():
+                return task
+
+            base = task.load_results()
+            fresh = split_by_file(task.kind, base, batch)
+            if cache is not None:
+                for path in batch:
+                    cache.put(missing[path], fresh[os.path.normpath(path)])
+            entries.update(fresh)
+
+    merged = merge_entries(task.kind, entries, base)
+    task.write_results(merged)
+    if task.kind == 'bandit':
+        task.returncode = 1 if merged['results'] else 0
+    else:
+        task.returncode = 0
+    return task
+
+
+def render_bandit_screen(results: Dict[str, Any]) -> str:
+    """Bandit JSON結果を `-f screen` 相当のテキストに変換"""
+    lines = ['Test results:']
+    for result in results.get('results', []):
+        lines.append(
+            f">> Issue: [{result.get('test_id', '?')}:{result.get('test_name', '?')}] "
+            f"{result.get('issue_text', '')}"
+        )
+        lines.append(
+            f"   Severity: {result.get('issue_severity', 'UNKNOWN').title()}   "
+            f"Confidence: {result.get('issue_confidence', 'UNKNOWN').title()}"
+        )
+        cwe = result.get('issue_cwe') or {}
+        if cwe.get('id'):
+            lines.append(f"   CWE: CWE-{cwe['id']} ({cwe.get('link', '')})")
+        lines.append(
+            f"   Location: {result.get('filename', '?')}:{result.get('line_number', '?')}:"
+            f"{result.get('col_offset', 0)}"
+        )
+        if result.get('more_info'):
+            lines.append(f"   More Info: {result['more_info']}")
+        code = result.get('code', '').rstrip('\n')
+        if code:
+            lines.append(code)
+        lines.append('-' * 50)
+    return '\n'.join(lines)
+
+
+def render_semgrep_text(results: Dict[str, Any]) -> str:
+    """Semgrep JSON結果を通常のテキスト出力相当に変換"""
+    lines = []
+    current_path = None
+    for result in results.get('results', []):
+        path = result.get('path', '?')
+        if path != current_path:
+            lines.append('')
+            lines.append(f"  {path}")
+            current_path = path
+        extra = result.get('extra', {})
+        lines.append(f"     {result.get('check_id', 'Unknown')}")
+        for message_line in extra.get('message', '').strip().splitlines():
+            lines.append(f"        {message_line}")
+        line_no = result.get('start', {}).get('line', '?')
+        for offset, code_line in enumerate(extra.get('lines', '').rstrip('\n').splitlines()):
+            number = line_no + offset if isinstance(line_no, int) else line_no
+            lines.append(f"        {number:>5}┆ {code_line}")
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def report_task(task: ScanTask, use_color: bool) -> int:
+    """タスクの結果を表示し、エラー数を返す（Banditは検出があれば1件、Semgrepは検出件数）"""
+    print(color(f"▶ {task.label} ({task.duration:.1f}s)", YELLOW, use_color))
+    if task.cache_hits or task.cache_misses:
+        print(f"   キャッシュ: ヒット {task.cache_hits}件 / ミス {task.cache_misses}件")
+    if task.timed_out:
+        print(color(f"⏱️  {task.label}: 時間制限で停止しました（未スキャン {task.unscanned_files}ファイル、"
+                    f"結果は不完全です）", YELLOW, use_color))
+    if not task.has_targets:
+        print(color(f"✅ {task.label}: 対象ファイルなし（スキップ）", GREEN, use_color))
+        return 0
+    results = task.load_results()
+
+    if task.name == 'bandit':
+        # Banditは終了コード1のときのみ脆弱性ありとして1件扱い
+        if task.returncode == 0:
+            if not task.timed_out:
+                print(color('✅ Bandit: 問題なし', GREEN, use_color))
+            return 0
+        if task.returncode == 1:
+            print(color('❌ Bandit: 脆弱性を検出', RED, use_color))
+            print(render_bandit_screen(results))
+            return 1
+        print(color(f"⚠️  Bandit: 実行に失敗しました (exit {task.returncode})", YELLOW, use_color))
+        if task.stderr:
+            print(task.stderr.rstrip()[-2000:])
+        return 0
+
+    if task.returncode not in (0, 1) or not task.output_path.exists():
+        print(color(f"⚠️  {task.label}: 実行に失敗しました (exit {task.returncode})", YELLOW, use_color))
+        if task.stderr:
+            print(task.stderr.rstrip()[-2000:])
+        return 0
+
+    count = len(results.get('results', []))
+    if count == 0:
+        if not task.timed_out:
+            print(color(f"✅ {task.label}: 問題なし", GREEN, use_color))
+        return 0
+    print(color(f"❌ {task.label}: {count}件の問題を検出", RED, use_color))
+    print(render_semgrep_text(results))
+    return count
+
+
+def run_eslint_security(use_color: bool):
+    """ESLint Security Pluginがあれば実行（結果は終了コードに影響しない）"""
+    package_json = Path('package.json')
+    if not package_json.exists():
+        return
+    if 'eslint-plugin-security' not in package_json.read_text(encoding='utf-8', errors='ignore'):
+        return
+
+    print(color('▶ ESLint Security Plugin 実行中...', YELLOW, use_color))
+    subprocess.run(['npm', 'run', 'lint:security'])
+    print(color('✅ ESLint Security: チェック完了', GREEN, use_color))
+    print('')
+
+
+def positive_seconds(value: str) -> float:
+    """秒数の引数（正の数）"""
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"invalid time budget: '{value}'")
+    return seconds
+
+
+def parse_tool_budgets(values: List[str]) -> Dict[str, Optional[float]]:
+    """--tool-budget（SECONDS または NAME=SECONDS）をツール名ごとの秒数にする（ツール名の指定が優先）"""
+    budgets: Dict[Optional[str], float] = {}
+    for value in values:
+        name, _, seconds = value.rpartition('=')
+        if name and name not in TASK_NAMES:
+            raise argparse.ArgumentTypeError(f"unknown tool '{name}' (choose from {', '.join(TASK_NAMES)})")
+        budgets[name or None] = positive_seconds(seconds)
+    return {name: budgets.get(name, budgets.get(None)) for name in TASK_NAMES}
+
+
+def record_history(db_path: Path, results_dir: Path, use_color: bool):
+    """検出結果を履歴データベースに追記する"""
+    try:
+        conn = connect(db_path)
+        commit_sha, ref = current_revision()
+        run_id, count = ingest(
+            conn, mark_baselined(load_findings(results_dir), load_baseline(DEFAULT_BASELINE)),
+            commit_sha=commit_sha, ref=ref,
+        )
+        conn.close()
+    except sqlite3.Error as e:
+        print(color(f"⚠️  履歴の記録に失敗しました: {e}", YELLOW, use_color))
+        return
+    print(f"🗂  履歴に記録しました: 実行 #{run_id} ({count}件) → {db_path}")
+    print('')
+
+
+def main():
+    started = time.monotonic()
+    parser = argparse.ArgumentParser(description='Run security checks concurrently')
+    parser.add_argument('--results-dir', type=Path, default=Path('security-results'), help='Results directory')
+    parser.add_argument('--target', help='Scan target directory (default: roots declared in .security-config.yaml)')
+    parser.add_argument('--since', help='Only scan files changed since this git ref (e.g. origin/main)')
+    parser.add_argument('--cache-dir', type=Path, default=Path('.security-cache'),
+                        help='Per-file findings cache directory')
+    parser.add_argument('--no-cache', action='store_true', help='Disable the per-file findings cache')
+    parser.add_argument('--time-budget', type=positive_seconds, metavar='SECONDS',
+                        help='Stop all scans after this many seconds and keep the findings so far')
+    parser.add_argument('--tool-budget', action='append', default=[], metavar='[NAME=]SECONDS',
+                        help=f"Time budget per tool, for all tools or one of {', '.join(TASK_NAMES)} (repeatable)")
+    parser.add_argument('--history', type=Path, metavar='DB',
+                        help='Append the findings of this run to a history database (see findings_history.py)')
+    parser.add_argument('--no-color', action='store_true', help='Disable colored output')
+    args = parser.parse_args()
+    try:
+        tool_budgets = parse_tool_budgets(args.tool_budget)
+    except argparse.ArgumentTypeError as e:
+        parser.error(f"argument --tool-budget: {e}")
+    deadline = started + args.time_budget if args.time_budget else None
+
+    use_color = not args.no_color and sys.stdout.isatty()
+
+    print(color('========================================', BLUE, use_color))
+    print(color('🔒 セキュリティチェック実行', BLUE, use_color))
+    print(color('========================================', BLUE, use_color))
+    print('')
+
+    args.results_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        targets = resolve_targets(args.target, args.since)
+    except subprocess.CalledProcessError as e:
+        print(color(f"❌ 変更ファイルの取得に失敗しました: {e.stderr.decode('utf-8', errors='replace').strip()}",
+                    RED, use_color))
+        return 2
+
+    if args.since:
+        print(f"🔍 {args.since} 以降の変更ファイルのみをスキャン "
+              f"(Python: {len(targets['python'])}件, TypeScript/JavaScript: {len(targets['typescript'])}件)")
+        print('')
+
+    tasks = build_tasks(args.results_dir, targets)
+
+    if not shutil.which('bandit'):
+        print(color('⚠️  Bandit がインストールされていません', YELLOW, use_color))
+        print('   インストール: pip install bandit')
+        print('')
+    if not shutil.which('semgrep'):
+        print(color('⚠️  Semgrep がインストールされていません', YELLOW, use_color))
+        print('   インストール: pip install semgrep または brew install semgrep')
+        print('')
+
+    # 各ツールを1回ずつ並列実行
+    if tasks:
+        print(color(f"📊 {len(tasks)}件のチェックを並列実行中...", BLUE, use_color))
+        print('')
+        cache_dir = None if args.no_cache else args.cache_dir
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            tasks = list(executor.map(
+                lambda task: run_task(task, cache_dir, deadline, tool_budgets[task.name]), tasks))
+
+    # ツールごとの実行時間・キャッシュ統計・時間制限での停止を保存
+    with open(args.results_dir / SCAN_SUMMARY_FILE, 'w', encoding='utf-8') as f:
+        json.dump({task.name: task.summary() for task in tasks}, f, ensure_ascii=False, indent=2)
+
+    total_errors = 0
+    for task in tasks:
+        total_errors += report_task(task, use_color)
+        print('')
+
+    run_eslint_security(use_color)
+
+    if args.history:
+        record_history(args.history, args.results_dir, use_color)
+
+    # サマリー表示
+    print('')
+    print(color('========================================', BLUE, use_color))
+    print(color('📋 セキュリティチェック完了', BLUE, use_color))
+    print(color('========================================', BLUE, use_color))
+    print('')
+
+    partial = [task.label for task in tasks if task.timed_out]
+    if partial:
+        print(color(f"⏱️  時間制限によりスキャンが完了していません: {', '.join(partial)}（結果は不完全です）",
+                    YELLOW, use_color))
+        print('')
+
+    if total_errors == 0 and partial:
+        print(f"途中までの結果: {args.results_dir}/")
+        print('時間制限（--time-budget / --tool-budget）を見直すか、--since で対象を絞って再実行してください')
+        return PARTIAL_EXIT_CODE
+
+    if total_errors == 0:
+        print(color('✅ すべてのチェックに合格しました', GREEN, use_color))
+        print('')
+        print(f"結果ファイル: {args.results_dir}/")
+        return 0
+
+    print(color(f"❌ {total_errors}件の問題が検出されました", RED, use_color))
+    print('')
+    print(f"詳細な結果: {args.results_dir}/")
+    print('')
+    print(color('次のステップ:', YELLOW, use_color))
+    print('1. 検出された問題を確認')
+    print('2. templates/nextjs-fastapi/.cursor/rules/security.mdc を参照')
+    print('3. 修正後、再度このスクリプトを実行')
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
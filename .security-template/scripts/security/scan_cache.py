@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+セキュリティチェック結果のファイル単位キャッシュ
+(ファイル内容ハッシュ, ルール・除外設定のハッシュ, ツールバージョン) をキーに
+ファイルごとの検出結果を保存し、変更のないファイルの再解析を省略する
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# ツールの既定の除外と揃えたディレクトリ（Git管理外のときのみ使用）
+DEFAULT_EXCLUDE_DIRS = {
+    '.git', 'node_modules', '.venv', 'venv', '__pycache__',
+    'security-results', '.security-cache',
+}
+
+SEMGREPIGNORE_FILE = Path('.semgrepignore')
+
+# スキャン結果に影響する除外設定（変更されたらキャッシュを使わない）
+TOOL_CONFIG_FILES = (SEMGREPIGNORE_FILE, Path('.bandit'))
+
+
+def sha256_file(path: Path) -> str:
+    """ファイル内容のSHA-256を返す"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def tool_version(executable: str) -> str:
+    """ツールのバージョン文字列を返す"""
+    proc = subprocess.run([executable, '--version'], stdout=subprocess.PIPE,
+                          stderr=subprocess.STDOUT, text=True)
+    return proc.stdout.strip().splitlines()[0] if proc.stdout.strip() else 'unknown'
+
+
+def list_candidate_files(target: str, extensions: Tuple[str, ...]) -> List[str]:
+    """
+    ディレクトリ配下のスキャン対象候補ファイルを列挙する
+
+    Git管理下では .gitignore を尊重する `git ls-files` を使い、
+    それ以外では既定の除外ディレクトリを除いて走査する
+    """
+    proc = subprocess.run(
+        ['git', 'ls-files', '-z', '--cached', '--others', '--exclude-standard', '--', target],
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    if proc.returncode == 0:
+        files = [item for item in proc.stdout.decode('utf-8').split('\0') if item]
+        # ツールに '.' を渡したときと同じ表記（./path）に揃える
+        return sorted(
+            os.path.join('.', item) if target == '.' else item
+            for item in files
+            if item.endswith(extensions) and os.path.isfile(item)
+        )
+
+    found = []
+    for root, dirs, names in os.walk(target):
+        dirs[:] = sorted(d for d in dirs if d not in DEFAULT_EXCLUDE_DIRS)
+        found.extend(os.path.join(root, name) for name in names if name.endswith(extensions))
+    return sorted(found)
+
+
+def load_ignore_patterns(path: Path = SEMGREPIGNORE_FILE) -> List[Tuple[bool, str]]:
+    """.semgrepignore の (否定かどうか, パターン) を返す（なければ空）"""
+    if not path.exists():
+        return []
+    patterns = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # コメント・空行・:include 指示は対象外
+            if not line or line.startswith('#') or line.startswith(':'):
+                continue
+            negate = line.startswith('!')
+            patterns.append((negate, line[1:] if negate else line))
+    return patterns
+
+
+def _matches(parts: Tuple[str, ...], pattern: str) -> bool:
+    """gitignore形式のパターンがパスに一致するか（ディレクトリ指定は配下のファイルに一致）"""
+    dir_only = pattern.endswith('/')
+    pattern = pattern.rstrip('/')
+    if '/' in pattern:
+        # スラッシュを含むパターンはルートからのパスと比較する
+        pattern = pattern.lstrip('/')
+        return any(
+            fnmatch('/'.join(parts[:end]), pattern) and (end < len(parts) or not dir_only)
+            for end in range(1, len(parts) + 1)
+        )
+    return any(
+        fnmatch(part, pattern) and (index < len(parts) - 1 or not dir_only)
+        for index, part in enumerate(parts)
+    )
+
+
+def is_ignored(path: str, patterns: List[Tuple[bool, str]]) -> bool:
+    """ファイルが除外パターンに該当するか（後のパターンが優先）"""
+    parts = Path(os.path.normpath(path)).parts
+    ignored = False
+    for negate, pattern in patterns:
+        if _matches(parts, pattern):
+            ignored = not negate
+    return ignored
+
+
+class ScanCache:
+    """1つのツール・ルールセットに対するファイル単位の結果キャッシュ"""
+
+    def __init__(self, cache_dir: Path, tool: str, version: str, rules_path: Path):
+        self.root = cache_dir / tool
+        self.tool = tool
+        self.version = version
+        # ルールに加え、除外設定が変わった場合も別のキーにする
+        material = [sha256_file(path) if path.exists() else 'none' for path in (rules_path,) + TOOL_CONFIG_FILES]
+        self.rules_hash = hashlib.sha256('\0'.join(material).encode('utf-8')).hexdigest()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path: str) -> str:
+        """ファイルのキャッシュキーを計算する"""
+        material = '\0'.join([
+            self.tool, self.version, self.rules_hash,
+            os.path.normpath(path), sha256_file(Path(path)),
+        ])
+        return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みの結果を返す（なければNone）"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """結果を書き込む（一時ファイル経由で原子的に置き換える）"""
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, entry_path)
+
+    def partition(self, files: Iterable[str]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """ファイルをキャッシュヒット（結果）とミス（キー）に分ける"""
+        cached: Dict[str, Dict[str, Any]] = {}
+        missing: Dict[str, str] = {}
+        for path in files:
+            key = self.key(path)
+            entry = self.get(key)
+            if entry is None:
+                missing[path] = key
+            else:
+                cached[path] = entry
+        return cached, missing
+
+
+def result_path(tool: str, result: Dict[str, Any]) -> str:
+    """検出結果の対象ファイルパスを正規化して返す"""
+    path = result.get('filename') if tool == 'bandit' else result.get('path')
+    return os.path.normpath(path or '')
+
+
+def result_sort_key(tool: str, result: Dict[str, Any]) -> Tuple:
+    """結果の並び順（ファイル・行・列・ルール）"""
+    if tool == 'bandit':
+        return (result_path(tool, result), result.get('line_number', 0),
+                result.get('col_offset', 0), result.get('test_id', ''))
+    start = result.get('start', {})
+    return (result_path(tool, result), start.get('line', 0), start.get('col', 0),
+            result.get('check_id', ''))
+
+
+def split_by_file(tool: str, results: Dict[str, Any], files: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """ツールの出力をファイル単位のキャッシュエントリに分割する"""
+    entries = {os.path.normpath(path): {'results': [], 'errors': [], 'metrics': {}} for path in files}
+    for result in results.get('results', []):
+        entries.setdefault(result_path(tool, result), {'results': [], 'errors': [], 'metrics': {}})
+        entries[result_path(tool, result)]['results'].append(result)
+    for error in results.get('errors', []):
+        path = os.path.normpath(error.get('filename') or error.get('path') or '')
+        if path in entries:
+            entries[path]['errors'].append(error)
+    for path, metrics in results.get('metrics', {}).items():
+        if os.path.normpath(path) in entries:
+            entries[os.path.normpath(path)]['metrics'] = {path: metrics}
+    # Semgrepが実際に解析したファイルかどうか（.semgrepignore 等で除外されたものはFalse）
+    scanned = {os.path.normpath(path) for path in results.get('paths', {}).get('scanned', [])}
+    for path, entry in entries.items():
+        entry['scanned'] = path in scanned
+    return entries
+
+
+def merge_entries(tool: str, entries: Dict[str, Dict[str, Any]], base: Dict[str, Any]) -> Dict[str, Any]:
+    """ファイル単位の結果を1つのツール出力に統合する"""
+    merged = dict(base)
+    merged['results'] = []
+    merged['errors'] = list(base.get('errors', []))
+    metrics: Dict[str, Any] = {}
+
+    for entry in entries.values():
+        merged['results'].extend(entry.get('results', []))
+        for error in entry.get('errors', []):
+            if error not in merged['errors']:
+                merged['errors'].append(error)
+        metrics.update(entry.get('metrics', {}))
+
+    merged['results'].sort(key=lambda result: result_sort_key(tool, result))
+
+    if tool == 'bandit':
+        totals: Dict[str, Any] = {}
+        for values in metrics.values():
+            for name, value in values.items():
+                if isinstance(value, (int, float)):
+                    totals[name] = totals.get(name, 0) + value
+        metrics['_totals'] = totals
+        merged['metrics'] = metrics
+    else:
+        merged['paths'] = dict(base.get('paths', {}))
+        merged['paths']['scanned'] = sorted(
+            os.path.normpath(path) for path, entry in entries.items() if entry.get('scanned')
+        )
+    return merged
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+プロジェクト別スキャン設定の読み込み
+SecurityIntegrator が .security-config.yaml から生成した scan-config.json を読み、
+各言語で使うSemgrepルールパック・スキャン対象ルート・--since の監視パターンを返す
+（設定がなければ ipa-*.yaml 全体とプロジェクト全体を使う）
+
+シェルスクリプト・GitHub Actions からは CLI として利用する:
+    python3 scripts/security/scan_config.py rules python
+    python3 scripts/security/scan_config.py targets python [--since origin/main]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from changed_files import DEFAULT_WATCH_PATTERNS, changed_files, filter_language
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCAN_CONFIG_FILE = SCRIPT_DIR / 'scan-config.json'
+
+# scan-config.json がない場合のルール（スクリプトディレクトリからの相対パス）
+DEFAULT_RULES = {
+    'python': 'semgrep-rules/ipa-python.yaml',
+    'typescript': 'semgrep-rules/ipa-typescript.yaml',
+}
+
+
+def load_scan_config(path: Path = SCAN_CONFIG_FILE) -> Dict[str, Any]:
+    """scan-config.json を読み込む（なければ空の設定）"""
+    if not path.exists():
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def semgrep_rules(language: str, config: Optional[Dict[str, Any]] = None) -> Optional[Path]:
+    """言語のSemgrepルールファイルを返す（無効化されている場合はNone）"""
+    if config is None:
+        config = load_scan_config()
+    language_config = config.get('semgrep', {}).get(language, {})
+    if not language_config.get('enabled', True):
+        return None
+    return SCRIPT_DIR / language_config.get('rules', DEFAULT_RULES[language])
+
+
+def scan_targets(language: str, config: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    言語のスキャン対象ルートを返す
+
+    .security-config.yaml の target_paths が宣言されていれば存在するルートのみ、
+    宣言がなければプロジェクト全体（.）を返す
+    """
+    if config is None:
+        config = load_scan_config()
+    roots = config.get('targets', {}).get(language)
+    if not roots:
+        return ['.']
+    return [root for root in roots if Path(root).exists()]
+
+
+def watch_patterns(config: Optional[Dict[str, Any]] = None) -> List[str]:
+    """--since で変更ファイルを抽出するパターン（github_actions.watch_patterns、なければ既定値）"""
+    if config is None:
+        config = load_scan_config()
+    return list(config.get('watch_patterns') or DEFAULT_WATCH_PATTERNS)
+
+
+def within_targets(files: List[str], roots: List[str]) -> List[str]:
+    """スキャン対象ルート配下のファイルだけを返す"""
+    prefixes = [os.path.normpath(root) for root in roots]
+    if '.' in prefixes:
+        return list(files)
+    return [
+        path for path in files
+        if any(os.path.normpath(path) == prefix or os.path.normpath(path).startswith(prefix + os.sep)
+               for prefix in prefixes)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print project scan settings')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    rules_parser = subparsers.add_parser('rules', help='Semgrep rules file (empty if disabled)')
+    rules_parser.add_argument('language', choices=sorted(DEFAULT_RULES))
+    targets_parser = subparsers.add_parser('targets', help='Scan roots (changed files with --since)')
+    targets_parser.add_argument('language', choices=sorted(DEFAULT_RULES))
+    targets_parser.add_argument('--since', help='Only list files changed since this git ref')
+    args = parser.parse_args()
+
+    if args.command == 'rules':
+        rules = semgrep_rules(args.language)
+        if rules is not None:
+            print(rules)
+        return 0
+
+    config = load_scan_config()
+    targets = scan_targets(args.language, config)
+    if args.since:
+        try:
+            files = changed_files(args.since, watch_patterns(config))
+        except subprocess.CalledProcessError as e:
+            print(f"❌ git の実行に失敗しました: {e.stderr.decode('utf-8', errors='replace').strip()}", file=sys.stderr)
+            return 2
+        targets = within_targets(filter_language(files, args.language), targets)
+
+    for target in targets:
+        print(target)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
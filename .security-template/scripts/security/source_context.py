@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+検出箇所の前後のソースコードの読み込み
+generate-pr-comment.py の --context で使用する
+
+ファイルは mmap で開き、行の開始位置の索引を必要な行まで作りながら LRU で保持する
+同じファイルの複数の検出結果は索引を共有するため、読み込みの量は検出件数ではなくファイル数に比例する
+"""
+
+import mmap
+import os
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# 同時に開いておくファイル数の上限
+DEFAULT_MAX_FILES = 128
+
+
+class SourceFile:
+    """mmap したファイルと行の開始位置の索引"""
+
+    def __init__(self, path: Path):
+        with open(path, 'rb') as f:
+            self.size = os.fstat(f.fileno()).st_size
+            # 空ファイルは mmap できない
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        self._offsets = array('q', [0])
+        self._complete = self.size == 0
+
+    def _index_to(self, line: int):
+        """line 行目の次の行の開始位置まで索引を伸ばす"""
+        offsets = self._offsets
+        while len(offsets) <= line and not self._complete:
+            newline = self._map.find(b'\n', offsets[-1])
+            if newline == -1 or newline + 1 >= self.size:
+                self._complete = True
+            else:
+                offsets.append(newline + 1)
+
+    def lines(self, start: int, end: int) -> List[Tuple[int, str]]:
+        """start 行目から end 行目まで（1始まり、両端を含む）の (行番号, 内容)"""
+        if self.size == 0:
+            return []
+        start = max(start, 1)
+        self._index_to(end)
+        offsets = self._offsets
+        result = []
+        for number in range(start, min(end, len(offsets)) + 1):
+            begin = offsets[number - 1]
+            stop = offsets[number] if number < len(offsets) else self.size
+            text = self._map[begin:stop].decode('utf-8', errors='replace')
+            result.append((number, text.rstrip('\r\n')))
+        return result
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+
+class SourceCache:
+    """検出箇所の前後の行を返す（開いたファイルを LRU で保持）"""
+
+    def __init__(self, root: Path = Path('.'), max_files: int = DEFAULT_MAX_FILES):
+        self.root = Path(root)
+        self.max_files = max_files
+        self._files: 'OrderedDict[str, Optional[SourceFile]]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _open(self, file_name: str) -> Optional[SourceFile]:
+        """開いたファイル（読めないファイルは None として覚えておく）"""
+        if file_name in self._files:
+            self.hits += 1
+            self._files.move_to_end(file_name)
+            return self._files[file_name]
+
+        self.misses += 1
+        path = self.root / file_name
+        try:
+            source = SourceFile(path) if path.is_file() else None
+        except (OSError, ValueError):
+            source = None
+        self._files[file_name] = source
+        if len(self._files) > self.max_files:
+            _, evicted = self._files.popitem(last=False)
+            if evicted is not None:
+                evicted.close()
+        return source
+
+    def context(self, file_name: str, line: object, radius: int) -> List[Tuple[int, str]]:
+        """
+        file_name の line 行目と前後 radius 行の (行番号, 内容)
+
+        ファイルが読めない・行番号が不明な場合は空のリスト
+        """
+        if not isinstance(line, int) or line < 1:
+            return []
+        source = self._open(file_name)
+        if source is None:
+            return []
+        return source.lines(line - radius, line + radius)
+
+    def close(self):
+        """開いているファイルをすべて閉じる"""
+        for source in self._files.values():
+            if source is not None:
+                source.close()
+        self._files.clear()
+
+    def __enter__(self) -> 'SourceCache':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,55 @@
+"""scripts/security のモジュールを、スクリプトと同じくモジュール名で読み込めるようにする"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+
+import pytest
+
+TESTS_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = TESTS_DIR.parent / 'scripts' / 'security'
+FIXTURES_DIR = TESTS_DIR / 'fixtures'
+
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture
+def results_dir(tmp_path):
+    """スタブの Bandit / Semgrep 結果JSONを配置した結果ディレクトリ"""
+    python_dir = tmp_path / 'python-security-results'
+    python_dir.mkdir()
+    for name in ('bandit-results.json', 'semgrep-python-results.json'):
+        (python_dir / name).write_bytes((FIXTURES_DIR / name).read_bytes())
+    return tmp_path
+
+
+@pytest.fixture
+def project_dir(tmp_path):
+    """スタブの結果JSONが指すファイルを持つプロジェクト"""
+    project = tmp_path / 'project'
+    for rel_path, content in (
+        ('backend/app/db.py', 'query = "SELECT * FROM users WHERE id = %s" % user_id\n'),
+        ('backend/app/auth.py', 'SECRET_PASSWORD = "hunter2"\n'),
+        ('frontend/src/app.ts', 'export const x = 1;\n'),
+    ):
+        path = project / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding='utf-8')
+    return project
+
+
+@pytest.fixture
+def fake_tools(tmp_path, monkeypatch):
+    """PATH 上の bandit / semgrep を fixtures/fake_tool.py に置き換え、呼び出しを記録するログのパスを返す"""
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    for tool in ('bandit', 'semgrep'):
+        wrapper = bin_dir / tool
+        wrapper.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{FIXTURES_DIR / "fake_tool.py"}" {tool} "$@"\n')
+        wrapper.chmod(wrapper.stat().st_mode | stat.S_IXUSR)
+    log_path = tmp_path / 'tool-calls.jsonl'
+    log_path.touch()
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('FAKE_TOOL_LOG', str(log_path))
+    return log_path
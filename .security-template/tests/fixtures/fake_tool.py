@@ -0,0 +1,59 @@
+"""
+テスト用の Bandit / Semgrep の代わり
+引数を FAKE_TOOL_LOG に記録し、スタブの結果JSONのうち渡された対象に含まれるファイルの分だけを書き出す
+
+使い方: python fake_tool.py (bandit|semgrep) <ツールの引数>
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).resolve().parent
+
+
+def _within(path: str, targets) -> bool:
+    path = os.path.normpath(path)
+    for target in targets:
+        target = os.path.normpath(target)
+        if target == '.' or path == target or path.startswith(target + os.sep):
+            return True
+    return False
+
+
+def main():
+    tool, args = sys.argv[1], sys.argv[2:]
+    if args == ['--version']:
+        print(f"{tool} 1.0.0")
+        return 0
+
+    with open(os.environ['FAKE_TOOL_LOG'], 'a', encoding='utf-8') as f:
+        f.write(json.dumps([tool] + args) + '\n')
+
+    if tool == 'bandit':
+        output = args[args.index('-o') + 1]
+        targets = args[args.index('-r') + 1:args.index('-c')]
+        stub = FIXTURES_DIR / 'bandit-results.json'
+    else:
+        output = args[args.index('--output') + 1]
+        targets = args[args.index('--output') + 2:]
+        language = 'python' if 'python' in args[args.index('--config') + 1] else 'typescript'
+        stub = FIXTURES_DIR / f"semgrep-{language}-results.json"
+
+    results = json.loads(stub.read_text(encoding='utf-8')) if stub.exists() else {'errors': [], 'results': []}
+    key = 'filename' if tool == 'bandit' else 'path'
+    results['results'] = [result for result in results['results'] if _within(result[key], targets)]
+    if 'metrics' in results:
+        results['metrics'] = {path: value for path, value in results['metrics'].items() if _within(path, targets)}
+    if 'paths' in results:
+        results['paths']['scanned'] = [path for path in results['paths']['scanned'] if _within(path, targets)]
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+    # Bandit は検出があれば終了コード1
+    return 1 if tool == 'bandit' and results['results'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
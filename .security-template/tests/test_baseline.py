@@ -0,0 +1,51 @@
+"""baseline.py: 行番号に依存しないフィンガープリントとベースライン判定"""
+
+from baseline import load_baseline, mark_baselined, with_fingerprints, write_baseline
+
+
+def _bandit(line, code_line, context='import os'):
+    return {
+        'tool': 'bandit', 'rule': 'B105', 'file': './backend/app/auth.py', 'line': line,
+        'message': "Possible hardcoded password: 'hunter2'",
+        'code': f"{line - 1} {context}\n{line} {code_line}\n",
+    }
+
+
+def _fingerprints(findings):
+    return [finding['fingerprint'] for finding in with_fingerprints(findings)]
+
+
+def test_fingerprint_ignores_line_shifts_and_context():
+    before = _fingerprints([_bandit(5, 'PASSWORD = "hunter2"')])
+    after = _fingerprints([_bandit(42, 'PASSWORD  =  "hunter2"', context='import sys')])
+
+    assert before == after
+
+
+def test_fingerprint_ignores_path_notation():
+    semgrep = {'tool': 'semgrep', 'rule': 'ipa-hardcoded-credentials', 'line': 5, 'code': 'PASSWORD = "hunter2"'}
+    assert _fingerprints([dict(semgrep, file='./backend/app/auth.py')]) == _fingerprints(
+        [dict(semgrep, file='backend/app/auth.py')])
+
+
+def test_changed_code_gets_a_new_fingerprint():
+    assert _fingerprints([_bandit(5, 'PASSWORD = "hunter2"')]) != _fingerprints([_bandit(5, 'PASSWORD = "letmein"')])
+
+
+def test_duplicates_are_told_apart_by_occurrence():
+    known = _fingerprints([_bandit(5, 'PASSWORD = "hunter2"')])
+    both = _fingerprints([_bandit(5, 'PASSWORD = "hunter2"'), _bandit(30, 'PASSWORD = "hunter2"')])
+
+    assert both[0] == known[0]
+    assert both[1] != both[0]
+
+
+def test_only_new_findings_are_outside_the_baseline(tmp_path):
+    baseline_path = tmp_path / '.security-baseline'
+    assert load_baseline(baseline_path) == set()
+    assert write_baseline(baseline_path, _fingerprints([_bandit(5, 'PASSWORD = "hunter2"')]) * 2) == 1
+    assert baseline_path.read_text(encoding='utf-8').startswith('#')
+
+    findings = list(mark_baselined(
+        [_bandit(7, 'PASSWORD = "hunter2"'), _bandit(9, 'TOKEN = "abc"')], load_baseline(baseline_path)))
+    assert [finding['baselined'] for finding in findings] == [True, False]
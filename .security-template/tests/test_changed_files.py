@@ -0,0 +1,83 @@
+"""changed_files.py / scan_config.py: --since で変更ファイルを watch_patterns に従って抽出する"""
+
+import shutil
+import subprocess
+
+import pytest
+
+from changed_files import changed_files, filter_language
+from scan_config import watch_patterns
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git not installed')
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch, tmp_path):
+    """固定の作成者で、利用者のgit設定を使わずにコミットする"""
+    monkeypatch.setenv('GIT_CONFIG_GLOBAL', str(tmp_path / 'gitconfig'))
+    monkeypatch.setenv('GIT_CONFIG_NOSYSTEM', '1')
+    for variable in ('AUTHOR', 'COMMITTER'):
+        monkeypatch.setenv(f'GIT_{variable}_NAME', 'Security Test')
+        monkeypatch.setenv(f'GIT_{variable}_EMAIL', 'security@example.com')
+
+
+def _git(repo, *args):
+    subprocess.run(['git', '-C', str(repo), *args], capture_output=True, check=True)
+
+
+def _write(repo, rel_path, content='x = 1\n'):
+    path = repo / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """base タグの後に変更を加えたリポジトリ"""
+    repo = tmp_path / 'repo'
+    repo.mkdir()
+    _git(repo, 'init', '-q')
+    for rel_path in ('backend/app/main.py', 'backend/app/old.py', 'frontend/src/app.ts', 'docs/guide.md'):
+        _write(repo, rel_path)
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'base')
+    _git(repo, 'tag', 'base')
+
+    # コミット済み・未コミット・未追跡の変更と削除
+    _write(repo, 'backend/app/main.py', 'x = 2\n')
+    _git(repo, 'commit', '-q', '-am', 'change main')
+    _write(repo, 'frontend/src/app.ts', 'export const x = 2;\n')
+    _write(repo, 'backend/app/new.py')
+    _write(repo, 'docs/guide.md', 'changed\n')
+    (repo / 'backend/app/old.py').unlink()
+
+    monkeypatch.chdir(repo)
+    return repo
+
+
+def test_committed_uncommitted_and_untracked_changes_are_listed(repo):
+    assert changed_files('base') == ['backend/app/main.py', 'backend/app/new.py', 'frontend/src/app.ts']
+
+
+def test_paths_are_relative_to_a_subdirectory(repo, monkeypatch):
+    monkeypatch.chdir(repo / 'backend')
+
+    assert changed_files('base') == ['app/main.py', 'app/new.py']
+
+
+def test_watch_patterns_limit_the_files(repo):
+    assert changed_files('base', ['backend/**']) == ['backend/app/main.py', 'backend/app/new.py']
+    assert changed_files('base', ['**.md']) == ['docs/guide.md']
+
+
+def test_filter_language():
+    files = ['backend/app/main.py', 'frontend/src/app.ts', 'frontend/src/view.tsx']
+
+    assert filter_language(files, 'python') == ['backend/app/main.py']
+    assert filter_language(files, 'typescript') == ['frontend/src/app.ts', 'frontend/src/view.tsx']
+
+
+def test_watch_patterns_come_from_scan_config():
+    assert watch_patterns({'watch_patterns': ['backend/**']}) == ['backend/**']
+    # 宣言がなければ既定値
+    assert '**.py' in watch_patterns({})
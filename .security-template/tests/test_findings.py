@@ -0,0 +1,71 @@
+"""findings.py: 結果JSONの正規化・重複統合と findings.jsonl"""
+
+import json
+import os
+
+from findings import FINDINGS_FILE, build_findings, dedup_key, iter_json_results, load_findings
+
+
+def _by_location(findings):
+    return {(os.path.normpath(f['file']), f['line']): f for f in findings}
+
+
+def test_bandit_and_semgrep_findings_are_merged(results_dir):
+    findings = _by_location(load_findings(results_dir))
+
+    assert set(findings) == {('backend/app/db.py', 12), ('backend/app/auth.py', 5), ('backend/app/auth.py', 9)}
+
+    sql = findings[('backend/app/db.py', 12)]
+    assert sql['tools'] == ['bandit', 'semgrep']
+    assert sql['rules'] == ['B608', 'ipa-sql-injection-string-format']
+    assert sql['cwe'] == 'CWE-89'
+    # 重大度は高い方（Semgrep の ERROR）を採用
+    assert sql['severity'] == 'ERROR'
+    assert sql['critical']
+    assert sql['ipa_section'] == '1-(i)'
+
+    # CWE-259（Bandit）と CWE-798（Semgrep）は同じ分類として統合
+    credentials = findings[('backend/app/auth.py', 5)]
+    assert credentials['tools'] == ['bandit', 'semgrep']
+
+    assert findings[('backend/app/auth.py', 9)]['tools'] == ['bandit']
+
+
+def test_dedup_key_normalizes_path_and_cwe():
+    bandit = {'file': './backend/app/auth.py', 'line': 5, 'cwe': 'CWE-259', 'rule': 'B105'}
+    semgrep = {'file': 'backend/app/auth.py', 'line': 5, 'cwe': 'CWE-798', 'rule': 'ipa-hardcoded-credentials'}
+    assert dedup_key(bandit) == dedup_key(semgrep)
+
+    # CWEがなければIPA分類、それもなければルールで区別する
+    assert dedup_key({'file': 'a.py', 'line': 1, 'cwe': '', 'ipa_section': '1-(i)', 'rule': 'x'})[2] == '1-(i)'
+    assert dedup_key({'file': 'a.py', 'line': 1, 'cwe': '', 'ipa_section': '', 'rule': 'x'})[2] == 'rule:x'
+
+
+def test_truncated_results_file_yields_complete_entries(tmp_path):
+    results = tmp_path / 'results.json'
+    text = json.dumps({'results': [{'id': 1}, {'id': 2}, {'id': 3}]})
+    # 3件目の途中で途切れたファイル
+    results.write_text(text[:text.index('{"id": 3}') + 4], encoding='utf-8')
+
+    assert [r['id'] for r in iter_json_results(results)] == [1, 2]
+    assert list(iter_json_results(tmp_path / 'missing.json')) == []
+
+
+def test_findings_are_rebuilt_only_when_sources_change(results_dir):
+    findings_path = build_findings(results_dir)
+    os.utime(findings_path, ns=(0, 0))
+
+    # 結果ファイルが変わらなければ作り直さない
+    assert build_findings(results_dir).stat().st_mtime_ns == 0
+
+    bandit = results_dir / 'python-security-results' / 'bandit-results.json'
+    data = json.loads(bandit.read_text(encoding='utf-8'))
+    data['results'] = data['results'][:1]
+    bandit.write_text(json.dumps(data), encoding='utf-8')
+    assert build_findings(results_dir).stat().st_mtime_ns != 0
+    assert len(list(load_findings(results_dir))) == 2
+
+    # 結果ファイルの削除も検出する
+    bandit.unlink()
+    assert [f['tools'] for f in load_findings(results_dir)] == [['semgrep'], ['semgrep']]
+    assert (results_dir / FINDINGS_FILE).exists()
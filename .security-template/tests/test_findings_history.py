@@ -0,0 +1,61 @@
+"""findings_history.py: 実行ごとの取り込み、件数の推移、初出・最終検出"""
+
+import json
+
+from findings import load_findings
+from findings_history import connect, ingest, latest_run, seen, trend
+
+
+def _drop_bandit_result(results_dir, test_id):
+    bandit = results_dir / 'python-security-results' / 'bandit-results.json'
+    data = json.loads(bandit.read_text(encoding='utf-8'))
+    data['results'] = [result for result in data['results'] if result['test_id'] != test_id]
+    bandit.write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_trend_counts_each_run(results_dir, tmp_path):
+    conn = connect(tmp_path / 'history.db')
+    assert ingest(conn, load_findings(results_dir), commit_sha='aaa', created_at=1.0) == (1, 3)
+    _drop_bandit_result(results_dir, 'B602')
+    assert ingest(conn, load_findings(results_dir), commit_sha='bbb', created_at=2.0) == (2, 2)
+
+    assert [(row['run'], row['commit'], row['count']) for row in trend(conn)] == [(1, 'aaa', 3), (2, 'bbb', 2)]
+    assert [row['count'] for row in trend(conn, severity='high')] == [1, 0]
+    assert [row['count'] for row in trend(conn, tool='bandit+semgrep')] == [2, 2]
+    # SQLインジェクション（ERROR）と B602（HIGH）が重大
+    assert [row['critical'] for row in trend(conn)] == [2, 1]
+
+
+def test_seen_tracks_first_and_last_run(results_dir, tmp_path):
+    conn = connect(tmp_path / 'history.db')
+    ingest(conn, load_findings(results_dir))
+    _drop_bandit_result(results_dir, 'B602')
+    ingest(conn, load_findings(results_dir))
+    assert latest_run(conn) == 2
+
+    fixed = seen(conn, rule='B602')
+    assert [(row['first_run'], row['last_run'], row['runs_seen']) for row in fixed] == [(1, 1, 1)]
+    # パスは表記を揃えて保存・検索する
+    assert fixed[0]['path'] == 'backend/app/auth.py'
+    assert len(seen(conn, path='./backend/app/auth.py')) == 2
+
+    active = seen(conn, active=True)
+    assert {row['rule'] for row in active} == {'B608', 'B105'}
+    assert all(row['runs_seen'] == 2 for row in active)
+    assert seen(conn, fingerprint=active[0]['fingerprint'][:12])[0]['fingerprint'] == active[0]['fingerprint']
+
+
+def test_paths_from_older_databases_are_normalized(results_dir, tmp_path):
+    db_path = tmp_path / 'history.db'
+    conn = connect(db_path)
+    ingest(conn, load_findings(results_dir))
+    # パスを正規化せずに保存していた版のデータベース
+    with conn:
+        conn.execute("UPDATE fingerprints SET path = './' || path")
+        conn.execute('PRAGMA user_version = 0')
+    conn.close()
+
+    conn = connect(db_path)
+    assert {row[0] for row in conn.execute('SELECT path FROM fingerprints')} == {
+        'backend/app/db.py', 'backend/app/auth.py'}
+    assert len(seen(conn, path='./backend/app/db.py')) == 1
@@ -0,0 +1,54 @@
+"""run-security-check.py: 各ツールを1回ずつ並列実行し、結果ディレクトリの構成を保つ"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'security' / 'run-security-check.py'
+
+
+def run_check(project_dir, *args):
+    return subprocess.run([sys.executable, str(SCRIPT), '--no-color', *args], cwd=project_dir,
+                          capture_output=True, text=True)
+
+
+def tool_calls(log_path):
+    return [json.loads(line) for line in log_path.read_text(encoding='utf-8').splitlines()]
+
+
+def test_each_tool_runs_once(project_dir, fake_tools):
+    result = run_check(project_dir, '--no-cache')
+
+    # 問題ありは終了コード1
+    assert result.returncode == 1, result.stdout + result.stderr
+    calls = tool_calls(fake_tools)
+    assert [call[0] for call in calls].count('bandit') == 1
+    semgrep_configs = sorted(Path(call[call.index('--config') + 1]).name for call in calls if call[0] == 'semgrep')
+    assert semgrep_configs == ['ipa-python.yaml', 'ipa-typescript.yaml']
+
+
+def test_results_keep_the_ci_layout(project_dir, fake_tools):
+    run_check(project_dir, '--no-cache')
+    results_dir = project_dir / 'security-results'
+
+    bandit = json.loads((results_dir / 'python-security-results' / 'bandit-results.json').read_text())
+    semgrep_python = json.loads(
+        (results_dir / 'python-security-results' / 'semgrep-python-results.json').read_text())
+    semgrep_typescript = json.loads(
+        (results_dir / 'typescript-security-results' / 'semgrep-typescript-results.json').read_text())
+    assert [r['test_id'] for r in bandit['results']] == ['B608', 'B105', 'B602']
+    assert len(semgrep_python['results']) == 2
+    assert semgrep_typescript['results'] == []
+
+    summary = json.loads((results_dir / 'scan-summary.json').read_text())
+    assert set(summary) == {'bandit', 'semgrep-python', 'semgrep-typescript'}
+    assert summary['bandit']['returncode'] == 1
+    assert all(len(task['invocation_seconds']) == 1 for task in summary.values())
+
+
+def test_clean_scan_exits_zero(project_dir, fake_tools):
+    # 検出対象のファイルを含まない対象だけをスキャン
+    result = run_check(project_dir, '--no-cache', '--target', 'frontend')
+
+    assert result.returncode == 0, result.stdout + result.stderr
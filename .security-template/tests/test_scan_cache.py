@@ -0,0 +1,107 @@
+"""scan_cache.py: ファイル単位の分割・統合、除外パターン、キャッシュキー"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import FIXTURES_DIR
+from scan_cache import ScanCache, is_ignored, load_ignore_patterns, merge_entries, split_by_file
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'security' / 'run-security-check.py'
+
+PYTHON_FILES = ['./backend/app/db.py', './backend/app/auth.py', './backend/app/empty.py']
+
+
+def _stub(name):
+    return json.loads((FIXTURES_DIR / name).read_text(encoding='utf-8'))
+
+
+def test_bandit_results_round_trip_through_file_entries():
+    results = _stub('bandit-results.json')
+    entries = split_by_file('bandit', results, PYTHON_FILES)
+
+    # 検出のないファイルも空のエントリとしてキャッシュする
+    assert entries['backend/app/empty.py']['results'] == []
+    assert [r['test_id'] for r in entries['backend/app/auth.py']['results']] == ['B105', 'B602']
+
+    merged = merge_entries('bandit', entries, {'errors': []})
+    assert [(r['filename'], r['line_number']) for r in merged['results']] == [
+        ('./backend/app/auth.py', 5), ('./backend/app/auth.py', 9), ('./backend/app/db.py', 12)]
+    assert merged['metrics']['_totals'] == {'loc': 32, 'nosec': 0, 'SEVERITY.HIGH': 1, 'SEVERITY.MEDIUM': 1,
+                                            'SEVERITY.LOW': 1}
+
+
+def test_semgrep_scanned_paths_are_kept():
+    results = _stub('semgrep-python-results.json')
+    entries = split_by_file('semgrep-python', results, PYTHON_FILES)
+
+    assert not entries['backend/app/empty.py']['scanned']
+    merged = merge_entries('semgrep-python', entries, {'errors': [], 'version': '1.0.0'})
+    assert merged['version'] == '1.0.0'
+    assert merged['paths']['scanned'] == ['backend/app/auth.py', 'backend/app/db.py']
+    assert len(merged['results']) == 2
+
+
+def test_ignore_patterns(tmp_path):
+    ignore_file = tmp_path / '.semgrepignore'
+    ignore_file.write_text('# comment\n:include .gitignore\ntests/\n*_pb2.py\n/build\n!tests/keep.py\n',
+                           encoding='utf-8')
+    patterns = load_ignore_patterns(ignore_file)
+
+    assert patterns == [(False, 'tests/'), (False, '*_pb2.py'), (False, '/build'), (True, 'tests/keep.py')]
+    assert is_ignored('./backend/tests/test_db.py', patterns)
+    assert is_ignored('backend/app/user_pb2.py', patterns)
+    assert is_ignored('build/out.py', patterns)
+    # ルート指定のパターンは途中のディレクトリに一致しない
+    assert not is_ignored('backend/build/out.py', patterns)
+    # 後の否定パターンが優先
+    assert not is_ignored('tests/keep.py', patterns)
+    # ディレクトリ指定は同名のファイルに一致しない
+    assert not is_ignored('backend/app/tests', patterns)
+    assert not is_ignored('backend/app/db.py', patterns)
+    assert load_ignore_patterns(tmp_path / 'missing') == []
+
+
+def test_exclusion_settings_change_the_cache_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    rules = tmp_path / 'rules.yaml'
+    rules.write_text('rules: []\n', encoding='utf-8')
+    before = ScanCache(tmp_path / 'cache', 'semgrep-python', '1.0.0', rules).rules_hash
+
+    Path('.semgrepignore').write_text('tests/\n', encoding='utf-8')
+    assert ScanCache(tmp_path / 'cache', 'semgrep-python', '1.0.0', rules).rules_hash != before
+    Path('.semgrepignore').unlink()
+    assert ScanCache(tmp_path / 'cache', 'semgrep-python', '1.0.0', rules).rules_hash == before
+
+    rules.write_text('rules: [{id: x}]\n', encoding='utf-8')
+    assert ScanCache(tmp_path / 'cache', 'semgrep-python', '1.0.0', rules).rules_hash != before
+
+
+def _run(project_dir, *args):
+    return subprocess.run([sys.executable, str(SCRIPT), '--no-color', *args], cwd=project_dir,
+                          capture_output=True, text=True)
+
+
+def _results(project_dir):
+    results_dir = project_dir / 'security-results' / 'python-security-results'
+    return {
+        name: sorted(json.dumps(r, sort_keys=True) for r in json.loads((results_dir / name).read_text())['results'])
+        for name in ('bandit-results.json', 'semgrep-python-results.json')
+    }
+
+
+def test_unchanged_files_are_not_scanned_again(project_dir, fake_tools):
+    _run(project_dir, '--no-cache')
+    uncached = _results(project_dir)
+
+    _run(project_dir)
+    fake_tools.write_text('', encoding='utf-8')
+    _run(project_dir)
+
+    # 2回目は全ファイルがキャッシュヒットし、ツールを起動しない
+    assert fake_tools.read_text(encoding='utf-8') == ''
+    assert _results(project_dir) == uncached
+    summary = json.loads((project_dir / 'security-results' / 'scan-summary.json').read_text())
+    assert summary['bandit']['cache_misses'] == 0
+    assert summary['bandit']['cache_hits'] == 2
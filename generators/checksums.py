@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Checksum Manifest
+
+Writes a SHA256SUMS manifest of a generated project from the digests
+OutputWriter computes while writing, and verifies a project against it
+by re-hashing the files in parallel. The format is that of ``sha256sum``,
+so ``sha256sum -c SHA256SUMS`` works as well.
+
+Usage:
+    python checksums.py verify ../my-new-project
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from journal import sha256_file
+from output_writer import BOOKKEEPING_FILES, iter_output_files
+
+MANIFEST_FILE = "SHA256SUMS"
+
+
+class VerifyReport(NamedTuple):
+    """Differences between a project and its manifest."""
+
+    checked: int
+    modified: List[str]
+    missing: List[str]
+    added: List[str]
+
+    @property
+    def ok(self) -> bool:
+        return not (self.modified or self.missing or self.added)
+
+
+def write_manifest(output_dir: Path, digests: Dict[str, str]) -> Path:
+    """
+    Write SHA256SUMS to the output directory.
+
+    Args:
+        output_dir: Output directory
+        digests: Relative path -> SHA-256 hex digest
+
+    Returns:
+        Path of the manifest
+    """
+    manifest_path = Path(output_dir) / MANIFEST_FILE
+    tmp_path = manifest_path.with_name(f".{MANIFEST_FILE}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        for rel_path in sorted(digests):
+            if rel_path != MANIFEST_FILE:
+                f.write(f"{digests[rel_path]}  {rel_path}\n")
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+
+def read_manifest(manifest_path: Path) -> Dict[str, str]:
+    """
+    Read a sha256sum-format manifest.
+
+    Args:
+        manifest_path: Manifest file
+
+    Returns:
+        Relative path -> SHA-256 hex digest
+    """
+    digests = {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            digest, rel_path = line.split(' ', 1)
+            # "<digest>  <path>" (text mode) or "<digest> *<path>" (binary mode)
+            digests[rel_path[1:]] = digest.lower()
+    return digests
+
+
+def verify(output_dir: Path, manifest_path: Optional[Path] = None, workers: Optional[int] = None) -> VerifyReport:
+    """
+    Re-hash a project and compare it with its manifest.
+
+    Args:
+        output_dir: Generated project directory
+        manifest_path: Manifest (default: <output_dir>/SHA256SUMS)
+        workers: Hashing threads (hashlib releases the GIL on large buffers)
+
+    Returns:
+        VerifyReport with modified, missing and added (unlisted) files
+    """
+    output_dir = Path(output_dir)
+    manifest_path = Path(manifest_path) if manifest_path else output_dir / MANIFEST_FILE
+    expected = read_manifest(manifest_path)
+
+    def check(rel_path: str) -> Optional[str]:
+        """Return 'missing' or 'modified' for a drifted file, None if intact."""
+        try:
+            return None if sha256_file(output_dir / rel_path) == expected[rel_path] else 'modified'
+        except FileNotFoundError:
+            return 'missing'
+
+    paths = sorted(expected)
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) + 4)) as pool:
+        results = list(pool.map(check, paths))
+
+    ignored = set(BOOKKEEPING_FILES)
+    if manifest_path.parent.resolve() == output_dir.resolve():
+        ignored.add(manifest_path.name)
+    added = sorted(rel_path for rel_path in iter_output_files(output_dir)
+                   if rel_path not in expected and rel_path not in ignored)
+
+    return VerifyReport(
+        checked=len(paths),
+        modified=[path for path, result in zip(paths, results) if result == 'modified'],
+        missing=[path for path, result in zip(paths, results) if result == 'missing'],
+        added=added,
+    )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Verify a generated project against its SHA256SUMS manifest")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    verify_parser = subparsers.add_parser("verify", help="Re-hash files and report drift")
+    verify_parser.add_argument("output", help="Generated project directory")
+    verify_parser.add_argument("--manifest", help=f"Manifest file (default: <output>/{MANIFEST_FILE})")
+    verify_parser.add_argument("--workers", type=int, help="Hashing threads")
+    args = parser.parse_args()
+
+    try:
+        report = verify(Path(args.output), args.manifest and Path(args.manifest), args.workers)
+    except FileNotFoundError as e:
+        print(f"❌ Manifest not found: {e.filename}")
+        return 2
+
+    for label, paths in (("Modified", report.modified), ("Missing", report.missing), ("Not in manifest", report.added)):
+        if paths:
+            print(f"\n⚠️  {label}:")
+            for path in paths:
+                print(f"  {path}")
+
+    if report.ok:
+        print(f"✓ {report.checked} files match {MANIFEST_FILE}")
+        return 0
+    print(f"\n❌ {len(report.modified)} modified, {len(report.missing)} missing, "
+          f"{len(report.added)} not in manifest ({report.checked} checked)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Template Conditions
+
+Declarative rules in a template's ``.template-conditions.yaml`` that leave
+files or whole subtrees out of a generation depending on variable values
+(e.g. ``DATABASE_TYPE``). Rules are evaluated into a set of excluded paths
+before the template is walked, so excluded subtrees are never listed,
+read or stat'ed.
+
+Example::
+
+    conditions:
+      # Generated only for MySQL projects
+      - path: docs/mysql/
+        when:
+          DATABASE_TYPE: MySQL
+      # Generated unless the integration is turned off
+      - path: docs/OPENAI_INTEGRATION.md
+        unless:
+          OPENAI_INTEGRATION: false
+
+``when`` and ``unless`` map variable names to a value or a list of values;
+a rule matches when every listed variable has one of its values (compared
+case-insensitively). A path is excluded if ``when`` does not match or
+``unless`` does.
+"""
+
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
+
+import yaml
+
+from template_cache import TemplateCache
+
+CONDITIONS_FILE = ".template-conditions.yaml"
+
+
+def _normalize(value: Any) -> str:
+    """Comparable form of a variable or condition value (YAML true -> 'true')."""
+    if isinstance(value, bool):
+        value = "true" if value else "false"
+    return str(value).casefold()
+
+
+class Condition(NamedTuple):
+    """Inclusion rule for a template file or directory."""
+
+    path: str  # Relative to the template directory, POSIX separators, no trailing slash
+    when: Dict[str, FrozenSet[str]]  # Normalized accepted values per variable
+    unless: Dict[str, FrozenSet[str]]
+
+    def includes(self, variables: Dict[str, Any]) -> bool:
+        """Whether the path is generated for these variables."""
+        if self.when and not self._matches(self.when, variables):
+            return False
+        return not (self.unless and self._matches(self.unless, variables))
+
+    @staticmethod
+    def _matches(expected: Dict[str, FrozenSet[str]], variables: Dict[str, Any]) -> bool:
+        return all(_normalize(variables.get(name, "")) in values for name, values in expected.items())
+
+
+def parse_conditions(data: Any, source: str = CONDITIONS_FILE) -> List[Condition]:
+    """
+    Validate and parse the content of a conditions file.
+
+    Args:
+        data: Parsed YAML
+        source: File name for error messages
+
+    Returns:
+        List of conditions
+
+    Raises:
+        ValueError: If the file is malformed
+    """
+    if data is None:
+        return []
+    entries = data.get("conditions", []) if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"{source}: 'conditions' must be a list")
+
+    conditions = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("path"), str):
+            raise ValueError(f"{source}: condition #{index + 1} needs a 'path'")
+        path = PurePosixPath(entry["path"].strip("/"))
+        if path.is_absolute() or ".." in path.parts or not path.parts:
+            raise ValueError(f"{source}: invalid path '{entry['path']}'")
+
+        rules = {}
+        for key in ("when", "unless"):
+            rule = entry.get(key) or {}
+            if not isinstance(rule, dict):
+                raise ValueError(f"{source}: '{key}' of '{path}' must map variable names to values")
+            rules[key] = {
+                name: frozenset(_normalize(value) for value in (values if isinstance(values, list) else [values]))
+                for name, values in rule.items()
+            }
+        if not (rules["when"] or rules["unless"]):
+            raise ValueError(f"{source}: condition for '{path}' needs 'when' or 'unless'")
+
+        conditions.append(Condition(path.as_posix(), rules["when"], rules["unless"]))
+    return conditions
+
+
+def load_conditions(template_dir: Path, cache: Optional[TemplateCache] = None) -> List[Condition]:
+    """
+    Load a template's conditions.
+
+    Args:
+        template_dir: Template directory
+        cache: Reuses the parsed file while it is unchanged (optional)
+
+    Returns:
+        List of conditions (empty if the template has no conditions file)
+
+    Raises:
+        ValueError: If the file is malformed
+    """
+    path = Path(template_dir) / CONDITIONS_FILE
+    if not path.exists():
+        return []
+    try:
+        if cache is not None:
+            data = cache.load_yaml(path)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f)
+    except yaml.YAMLError as e:
+        raise ValueError(f"{path}: {e}")
+    return parse_conditions(data, str(path))
+
+
+def excluded_paths(conditions: List[Condition], variables: Dict[str, Any]) -> FrozenSet[str]:
+    """
+    Evaluate conditions for a generation.
+
+    Args:
+        conditions: Conditions from load_conditions()
+        variables: Template variables
+
+    Returns:
+        Template-relative paths of files and directories to leave out
+    """
+    return frozenset(condition.path for condition in conditions if not condition.includes(variables))
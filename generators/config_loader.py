@@ -22,6 +22,21 @@ class ConfigLoader:
         self.config_path = Path(config_path)
         self.config: Dict[str, Any] = {}
 
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "ConfigLoader":
+        """
+        Create a ConfigLoader from an already-parsed configuration.
+
+        Args:
+            config: Configuration with the template-config.yaml structure
+
+        Returns:
+            ConfigLoader whose get_variables() works without reading a file
+        """
+        loader = cls("<dict>")
+        loader.config = config
+        return loader
+
     def load(self) -> Dict[str, Any]:
         """
         Load configuration from YAML file.
@@ -98,6 +113,11 @@ class ConfigLoader:
         # License (optional)
         variables['LICENSE'] = self.config.get('license', 'MIT')
 
+        # Optional integrations (used by .template-conditions.yaml)
+        integrations = self.config.get('integrations') or {}
+        openai = str(integrations.get('openai', True)).lower()
+        variables['OPENAI_INTEGRATION'] = 'false' if openai in ('false', 'no', 'off', '0') else 'true'
+
         return variables
 
     def get_database_config(self) -> Dict[str, str]:
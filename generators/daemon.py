@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Generation Daemon
+
+Serves project generation requests over localhost HTTP or a Unix socket.
+Compiled templates and parsed security configs stay in memory between
+requests and are invalidated by file mtime, so repeated generations skip
+interpreter start-up, imports and template parsing.
+
+Usage:
+    python daemon.py --port 8765
+    python daemon.py --socket /tmp/template-generator.sock
+
+Requests:
+    curl -s localhost:8765/generate -d '{"variables": {...}, "output": "../my-app"}'
+    curl -s --unix-socket /tmp/template-generator.sock http://localhost/generate -d @request.json
+
+Requests for different output directories run concurrently; requests for
+the same directory wait for each other.
+
+Trust boundary: the daemon has no authentication. Any local process that
+can connect to the port or socket can generate (and, with ``force``,
+overwrite) files anywhere the daemon's user can write. Use --output-root
+to confine outputs to one directory, and prefer a Unix socket in a
+directory only you can access.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config_loader import ConfigLoader
+from events import CollectingListener, EventEmitter
+from setup import ProjectGenerator
+from template_cache import TemplateCache
+
+DEFAULT_PORT = 8765
+
+
+class GenerationService:
+    """Runs generation requests against a shared TemplateCache."""
+
+    def __init__(self, output_root: Optional[Path] = None):
+        """
+        Initialize GenerationService.
+
+        Args:
+            output_root: Only accept outputs below this directory; relative
+                outputs are resolved against it (default: any path, relative
+                to the daemon's working directory)
+        """
+        self.cache = TemplateCache()
+        self.output_root = Path(output_root).resolve() if output_root is not None else None
+        # One lock per resolved output directory; the cache itself is safe to share
+        self._output_locks: Dict[Path, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _resolve_output(self, output: str) -> Optional[Path]:
+        """Resolve a requested output directory (None if it is outside output_root)."""
+        if self.output_root is None:
+            return Path(output).resolve()
+        resolved = (self.output_root / output).resolve()
+        if self.output_root not in resolved.parents:
+            return None
+        return resolved
+
+    def _output_lock(self, output_path: Path) -> threading.Lock:
+        """Lock serializing generations into the same output directory."""
+        with self._locks_lock:
+            return self._output_locks.setdefault(output_path, threading.Lock())
+
+    def generate(self, request: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Handle a generation request.
+
+        Args:
+            request: JSON body with ``output`` and one of ``variables``
+                (variables dict), ``config`` (template-config.yaml structure)
+                or ``config_path``; optional ``template``, ``validate``, ``force``,
+                ``check_structure``, ``sync``, ``resume``, ``checksums``, ``git`` (commit into a
+                repository at ``output``), ``checkout`` and ``events`` (include all generation events in the response)
+
+        Returns:
+            Tuple of (HTTP status, response body)
+        """
+        output = request.get('output')
+        if not output:
+            return 400, {'success': False, 'error': "'output' is required"}
+        output_path = self._resolve_output(output)
+        if output_path is None:
+            return 403, {'success': False, 'error': f"'output' must be inside {self.output_root}"}
+
+        variables = request.get('variables')
+        config_path = request.get('config_path')
+        if variables is None and request.get('config') is not None:
+            variables = ConfigLoader.from_dict(request['config']).get_variables()
+        if variables is None and config_path is None:
+            return 400, {'success': False, 'error': "'variables', 'config' or 'config_path' is required"}
+
+        collector = CollectingListener()
+        events = EventEmitter([collector])
+        generator = ProjectGenerator(
+            config_path,
+            request.get('template', 'nextjs-fastapi'),
+            variables=variables,
+            cache=self.cache,
+            events=events,
+        )
+
+        started = time.perf_counter()
+        with self._output_lock(output_path):
+            try:
+                success = generator.generate(
+                    str(output_path),
+                    validate=request.get('validate', True),
+                    force=request.get('force', False),
+                    check_structure=request.get('check_structure', True),
+                    sync=request.get('sync', False),
+                    resume=request.get('resume', False),
+                    checksums=request.get('checksums', False),
+                    git=request.get('git', False),
+                    checkout=request.get('checkout', False),
+                )
+            except Exception as e:
+                events.message(f"❌ Error: {e}", level="error")
+                success = False
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        body = {
+            'success': success,
+            'output': output,
+            'duration_ms': round(duration_ms, 2),
+            'log': "\n".join(collector.messages()) + "\n",
+            'errors': collector.messages(min_level="error"),
+        }
+        if request.get('events'):
+            body['events'] = collector.events
+        return (200 if success else 422), body
+
+
+class GenerationRequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler for /generate and /health."""
+
+    service: GenerationService
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', **self.service.cache.stats()})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {'success': False, 'error': f'invalid JSON: {e}'})
+            return
+
+        status, body = self.service.generate(request)
+        self._send_json(status, body)
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket clients have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else 'unix'
+
+    def log_message(self, format: str, *args):
+        sys.stderr.write(f"[daemon] {self.address_string()} {format % args}\n")
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded HTTP server listening on a Unix domain socket."""
+
+    daemon_threads = True
+
+
+def _raise_interrupt(signum, frame):
+    """Treat SIGTERM like Ctrl+C so the socket file is cleaned up."""
+    raise KeyboardInterrupt
+
+
+def serve(port: int = DEFAULT_PORT, socket_path: str = None, output_root: Optional[str] = None):
+    """
+    Run the daemon until interrupted.
+
+    Args:
+        port: Localhost TCP port (used when socket_path is not given)
+        socket_path: Unix socket path
+        output_root: Reject outputs outside this directory (optional)
+    """
+    service = GenerationService(Path(output_root) if output_root else None)
+    handler = type('Handler', (GenerationRequestHandler,), {'service': service})
+
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixHTTPServer(socket_path, handler)
+        print(f"🚀 Generation daemon listening on unix:{socket_path}")
+    else:
+        server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        print(f"🚀 Generation daemon listening on http://127.0.0.1:{port}")
+
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Shutting down")
+    finally:
+        server.server_close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Serve project generation requests")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT,
+                        help=f"Localhost port (default: {DEFAULT_PORT})")
+    parser.add_argument("--socket", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--output-root", metavar="DIR",
+                        help="Only generate into directories inside DIR (relative outputs are resolved against it)")
+    args = parser.parse_args()
+
+    serve(args.port, args.socket, args.output_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Generation Events
+
+Observer interface for generation progress. ProjectGenerator,
+TemplateProcessor and SecurityIntegrator report progress as events
+(file started/rendered/copied/skipped/failed, phase done, messages)
+instead of printing, so callers choose how progress is shown:
+on the console, as JSON Lines, collected in memory or not at all.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
+
+FILE_STARTED = "file_started"
+FILE_RENDERED = "file_rendered"
+FILE_COPIED = "file_copied"
+FILE_SKIPPED = "file_skipped"
+FILE_FAILED = "file_failed"
+PHASE_STARTED = "phase_started"
+PHASE_DONE = "phase_done"
+MESSAGE = "message"
+
+# Message levels, in increasing severity
+LEVELS = ("info", "warning", "error")
+
+Event = Dict[str, Any]
+
+
+class GenerationListener:
+    """Receives generation events. Subclasses override on_event()."""
+
+    def on_event(self, event: Event):
+        """
+        Handle a single event.
+
+        Args:
+            event: Event dict with at least ``event`` (type) and ``ts`` (UNIX time)
+        """
+
+
+class ConsoleListener(GenerationListener):
+    """Prints human-readable messages, as the generator always has."""
+
+    def __init__(self, stream: Optional[TextIO] = None, min_level: str = "info"):
+        """
+        Initialize ConsoleListener.
+
+        Args:
+            stream: Output stream (default: sys.stdout at print time)
+            min_level: Lowest message level to print (info, warning or error)
+        """
+        self.stream = stream
+        self.min_level = LEVELS.index(min_level)
+
+    def on_event(self, event: Event):
+        if event["event"] != MESSAGE or LEVELS.index(event["level"]) < self.min_level:
+            return
+        print(event["text"], file=self.stream or sys.stdout)
+
+
+class JsonlListener(GenerationListener):
+    """Writes every event as one JSON object per line."""
+
+    def __init__(self, stream: TextIO):
+        """
+        Initialize JsonlListener.
+
+        Args:
+            stream: Output stream (e.g. sys.stdout or an open file)
+        """
+        self.stream = stream
+
+    def on_event(self, event: Event):
+        self.stream.write(json.dumps(event, ensure_ascii=False))
+        self.stream.write("\n")
+        # Flush at phase boundaries so consumers see progress without per-file syscalls
+        if event["event"] == PHASE_DONE:
+            self.stream.flush()
+
+
+class CollectingListener(GenerationListener):
+    """Keeps events in memory (e.g. to return them from the daemon)."""
+
+    def __init__(self):
+        """Initialize CollectingListener."""
+        self.events: List[Event] = []
+
+    def on_event(self, event: Event):
+        self.events.append(event)
+
+    def messages(self, min_level: str = "info") -> List[str]:
+        """Texts of the collected messages at or above min_level."""
+        threshold = LEVELS.index(min_level)
+        return [event["text"] for event in self.events
+                if event["event"] == MESSAGE and LEVELS.index(event["level"]) >= threshold]
+
+
+class CallbackListener(GenerationListener):
+    """Passes events to a plain function."""
+
+    def __init__(self, callback: Callable[[Event], None]):
+        """
+        Initialize CallbackListener.
+
+        Args:
+            callback: Function called with each event dict
+        """
+        self.callback = callback
+
+    def on_event(self, event: Event):
+        self.callback(event)
+
+
+class EventEmitter:
+    """Dispatches events to a list of listeners."""
+
+    def __init__(self, listeners: Optional[List[GenerationListener]] = None):
+        """
+        Initialize EventEmitter.
+
+        Args:
+            listeners: Listeners receiving every event (none: events are dropped)
+        """
+        self.listeners = list(listeners or [])
+
+    @classmethod
+    def console(cls) -> "EventEmitter":
+        """Emitter printing messages to stdout (the default CLI behavior)."""
+        return cls([ConsoleListener()])
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any listener is attached (lets callers skip building event data)."""
+        return bool(self.listeners)
+
+    def emit(self, event: str, **fields: Any):
+        """
+        Send an event to all listeners.
+
+        Args:
+            event: Event type (FILE_RENDERED, PHASE_DONE, ...)
+            **fields: Event data (path, bytes, duration_ms, ...)
+        """
+        if not self.listeners:
+            return
+        record = {"event": event, "ts": round(time.time(), 3), **fields}
+        for listener in self.listeners:
+            listener.on_event(record)
+
+    def message(self, text: str, level: str = "info"):
+        """
+        Send a human-readable progress message.
+
+        Args:
+            text: Message text (may span several lines)
+            level: info, warning or error
+        """
+        self.emit(MESSAGE, level=level, text=text)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, Any]]:
+        """
+        Time a generation phase and emit PHASE_STARTED / PHASE_DONE.
+
+        The yielded dict is added to the PHASE_DONE event, so the phase can
+        report its own counts. The phase is marked failed if it raises.
+
+        Args:
+            name: Phase name (config, validate, render, check_output, security)
+        """
+        self.emit(PHASE_STARTED, phase=name)
+        details: Dict[str, Any] = {}
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield details
+            ok = True
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            ok = details.pop("ok", True) and ok
+            self.emit(PHASE_DONE, phase=name, ok=ok, duration_ms=duration_ms, **details)
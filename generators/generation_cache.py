@@ -0,0 +1,293 @@
+"""
+Generation Cache
+
+Stores complete generated projects on disk, keyed by a hash of the template
+tree, the security template, the generator code, the normalized variables
+and the generation options. A repeated generation restores the output by
+reflinking or hardlinking the cached files instead of running the pipeline.
+
+Entries are evicted least-recently-used when the cache exceeds its size
+limit. A lock file serializes stores and evictions between concurrent
+generators; restores hold a shared lock so entries are not evicted mid-copy.
+
+Without reflink support, restored files are hardlinks to the cache entry:
+editing one in place (rather than replacing it, as OutputWriter and most
+editors do) is detected on the next restore and the entry is discarded.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from template_cache import DEFAULT_EXCLUDE_PATTERNS, file_signature
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, concurrent generators are not serialized
+    fcntl = None
+
+# Bump when the entry layout or key material changes
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Linux ioctl that clones a file's extents (copy-on-write) on btrfs/XFS
+_FICLONE = 0x40049409
+
+MANIFEST_FILE = "manifest.json"
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory ($XDG_CACHE_HOME/template-generator)."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "template-generator"
+
+
+def _iter_tree(root: Path) -> Iterator[Path]:
+    """Files under root in a stable order, skipping dependency and build directories."""
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in DEFAULT_EXCLUDE_PATTERNS)
+        for name in sorted(files):
+            if not name.endswith(('.pyc', '.tmp')):
+                yield Path(current) / name
+
+
+def hash_tree(root: Path) -> str:
+    """SHA-256 over the relative paths and contents of every file under root."""
+    digest = hashlib.sha256()
+    for path in _iter_tree(root):
+        digest.update(path.relative_to(root).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def generation_key(sources: Iterable[Path], variables: Dict[str, Any], options: Dict[str, Any]) -> str:
+    """
+    Hash everything that determines a generation's output.
+
+    Args:
+        sources: Directories whose content determines the output
+            (template, security template, generator code)
+        variables: Template variables
+        options: Other inputs affecting the result (template name, validation flags)
+
+    Returns:
+        Hex digest identifying the generation
+    """
+    material = {
+        "format": CACHE_FORMAT,
+        "sources": [hash_tree(Path(source)) for source in sources],
+        # Values are rendered with str(), so 5432 and "5432" give the same output
+        "variables": {name: str(value) for name, value in variables.items()},
+        "options": options,
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def signature_key(sources: Iterable[Path], variables: Dict[str, Any], options: Dict[str, Any]) -> str:
+    """
+    Cheap counterpart of generation_key built from file mtimes and sizes.
+
+    Only stats the source trees, so it suits identifying a generation within
+    one working copy (the resume journal) but not sharing cache entries.
+
+    Args:
+        sources: Directories whose content determines the output
+        variables: Template variables
+        options: Other inputs affecting the result
+
+    Returns:
+        Hex digest identifying the generation
+    """
+    material = {
+        "format": CACHE_FORMAT,
+        "sources": [
+            [[path.relative_to(source).as_posix(), *file_signature(path)] for path in _iter_tree(Path(source))]
+            for source in sources
+        ],
+        "variables": {name: str(value) for name, value in variables.items()},
+        "options": options,
+    }
+    encoded = json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class GenerationCache:
+    """On-disk cache of generated project trees."""
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize GenerationCache.
+
+        Args:
+            cache_dir: Cache directory (default: default_cache_dir())
+            max_bytes: Total size of cached entries before LRU eviction
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.entries_dir = self.cache_dir / "entries"
+        self.tmp_dir = self.cache_dir / "tmp"
+        self._can_clone = sys.platform.startswith("linux") and fcntl is not None
+        self._can_link = True
+
+    @contextmanager
+    def _locked(self, shared: bool = False):
+        """Hold the cache lock (shared for readers, exclusive for writers)."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_dir / "lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def restore(self, key: str, output_dir: Path) -> Optional[int]:
+        """
+        Materialize a cached generation into output_dir.
+
+        Cached files are verified against the sizes and mtimes recorded when
+        they were stored; an entry modified through a hardlink is discarded.
+
+        Args:
+            key: Cache key from generation_key()
+            output_dir: Output directory
+
+        Returns:
+            Number of restored files, or None on a miss
+        """
+        entry_dir = self.entries_dir / key
+        output_dir = Path(output_dir)
+        with self._locked(shared=True):
+            manifest_path = entry_dir / MANIFEST_FILE
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+
+            files_dir = entry_dir / "files"
+            for rel_path, (size, mtime_ns) in manifest["files"].items():
+                source = files_dir / rel_path
+                try:
+                    stat = source.stat()
+                except FileNotFoundError:
+                    break
+                if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                    break
+                self._materialize(source, output_dir / rel_path)
+            else:
+                # Mark as recently used for LRU eviction
+                os.utime(manifest_path)
+                return len(manifest["files"])
+
+        # Modified or incomplete entry
+        with self._locked():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+    def store(self, key: str, output_dir: Path) -> int:
+        """
+        Add a generated project to the cache and evict old entries.
+
+        Args:
+            key: Cache key from generation_key()
+            output_dir: Freshly generated output directory
+
+        Returns:
+            Size of the stored entry in bytes
+        """
+        output_dir = Path(output_dir)
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        staging_dir = self.tmp_dir / f"{key}.{os.getpid()}"
+        files_dir = staging_dir / "files"
+
+        files: Dict[str, List[int]] = {}
+        total = 0
+        try:
+            for path in _iter_tree(output_dir):
+                rel_path = path.relative_to(output_dir).as_posix()
+                target = files_dir / rel_path
+                # Never hardlink the caller's output into the cache
+                self._materialize(path, target, allow_link=False)
+                stat = target.stat()
+                files[rel_path] = [stat.st_size, stat.st_mtime_ns]
+                total += stat.st_size
+
+            with open(staging_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+                json.dump({"created": time.time(), "bytes": total, "files": files}, f)
+
+            with self._locked():
+                entry_dir = self.entries_dir / key
+                if entry_dir.exists():
+                    # Stored concurrently by another generator
+                    shutil.rmtree(staging_dir)
+                else:
+                    self.entries_dir.mkdir(parents=True, exist_ok=True)
+                    os.rename(staging_dir, entry_dir)
+                self._evict()
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        return total
+
+    def _evict(self):
+        """Delete least-recently-used entries until the cache fits max_bytes (lock held)."""
+        entries = []
+        for entry_dir in self.entries_dir.iterdir():
+            manifest_path = entry_dir / MANIFEST_FILE
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    size = json.load(f)["bytes"]
+                entries.append((manifest_path.stat().st_mtime, size, entry_dir))
+            except (OSError, ValueError, KeyError):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+
+    def _materialize(self, source: Path, target: Path, allow_link: bool = True):
+        """Reflink, hardlink or copy source to target, replacing target if it exists."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.parent / f".{target.name}.{os.getpid()}.tmp"
+        if self._can_clone and self._clone(source, tmp_path):
+            pass
+        elif allow_link and self._can_link and self._link(source, tmp_path):
+            pass
+        else:
+            shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, target)
+
+    def _clone(self, source: Path, target: Path) -> bool:
+        """Copy-on-write clone; disabled after the first unsupported file system."""
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            target.unlink(missing_ok=True)
+            self._can_clone = False
+            return False
+        shutil.copystat(source, target)
+        return True
+
+    def _link(self, source: Path, target: Path) -> bool:
+        """Hardlink; disabled after the first failure (e.g. across devices)."""
+        try:
+            os.link(source, target)
+        except OSError:
+            self._can_link = False
+            return False
+        return True
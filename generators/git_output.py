@@ -0,0 +1,196 @@
+"""
+Git Output
+
+Writes a generated project straight into a git repository through
+``git fast-import``: file contents are streamed as blobs while they are
+rendered and committed at the end, so git does not read back and hash a
+working tree. Checking out the commit is optional.
+
+The stream ends with ``done``; if generation fails midway, fast-import
+exits without updating any branch.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from output_validator import StructureError, check_data, structured_format
+from output_writer import CREATED, OutputWriter
+
+_CHUNK_SIZE = 1024 * 1024
+
+_REGULAR_MODE = "100644"
+_EXECUTABLE_MODE = "100755"
+
+
+def _quote_path(rel_path: str) -> str:
+    """Quote a path for fast-import when it would otherwise be ambiguous."""
+    if not (rel_path.startswith('"') or '\n' in rel_path or '\\' in rel_path):
+        return rel_path
+    escaped = rel_path.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return f'"{escaped}"'
+
+
+def _git(repo_dir: Path, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """Run a git command in repo_dir and capture its output."""
+    return subprocess.run(["git", "-C", str(repo_dir), *args], capture_output=True, text=True, check=check)
+
+
+class GitFastImportWriter(OutputWriter):
+    """OutputWriter that streams files into ``git fast-import`` instead of the file system."""
+
+    def __init__(self, repo_dir: Path, check_structure: bool = False):
+        """
+        Initialize GitFastImportWriter.
+
+        Args:
+            repo_dir: Repository to create (or commit on top of with --force)
+            check_structure: Parse YAML/JSON/TOML content as it is streamed
+                (see structure_errors)
+        """
+        super().__init__(repo_dir)
+        self.check_structure = check_structure
+        self.structured_files = 0
+        self.structure_errors: List[StructureError] = []
+        self._files: Dict[str, Tuple[str, int]] = {}
+        self._process: Optional[subprocess.Popen] = None
+        self._stream = None
+        self._ref = ""
+        self._author = self._committer = ""
+
+    def start(self):
+        """Initialize the repository and start fast-import."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        _git(self.output_dir, "init", "-q")
+        # Branch named by init.defaultBranch (or the existing HEAD)
+        self._ref = _git(self.output_dir, "symbolic-ref", "HEAD").stdout.strip()
+        # Fails without user.name/user.email, before anything is rendered
+        self._author = _git(self.output_dir, "var", "GIT_AUTHOR_IDENT").stdout.strip()
+        self._committer = _git(self.output_dir, "var", "GIT_COMMITTER_IDENT").stdout.strip()
+        self._process = subprocess.Popen(
+            ["git", "-C", str(self.output_dir), "fast-import", "--quiet", "--done"],
+            stdin=subprocess.PIPE,
+        )
+        self._stream = self._process.stdin
+
+    def resumed(self, rel_path: str) -> Optional[int]:
+        """Nothing is resumed; every file is streamed."""
+        return None
+
+    def write(self, rel_path: str, data: bytes, executable: bool = False) -> str:
+        """
+        Stream file content as a blob.
+
+        Args:
+            rel_path: Path relative to the repository root (POSIX separators)
+            data: File content
+            executable: Commit the file as executable (mode 100755)
+
+        Returns:
+            CREATED
+        """
+        return self._write_blob(rel_path, data, _EXECUTABLE_MODE if executable else _REGULAR_MODE)
+
+    def copy(self, rel_path: str, source: Path) -> str:
+        """
+        Stream a file as a blob, keeping its executable bit.
+
+        Args:
+            rel_path: Destination path relative to the repository root
+            source: Source file
+
+        Returns:
+            CREATED
+        """
+        stat = source.stat()
+        mode = _EXECUTABLE_MODE if stat.st_mode & 0o111 else _REGULAR_MODE
+        if self.check_structure and structured_format(Path(rel_path)) is not None:
+            # Small config files; read whole so they can be parsed
+            return self._write_blob(rel_path, source.read_bytes(), mode)
+
+        self._blob_header(rel_path, mode, stat.st_size)
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                self._stream.write(chunk)
+        self._stream.write(b"\n")
+        return CREATED
+
+    def _write_blob(self, rel_path: str, data: bytes, mode: str) -> str:
+        """Stream in-memory content as a blob."""
+        self._blob_header(rel_path, mode, len(data))
+        self._stream.write(data)
+        self._stream.write(b"\n")
+        self._check(rel_path, data)
+        return CREATED
+
+    def _blob_header(self, rel_path: str, mode: str, size: int) -> int:
+        """Start a blob command and remember its mark for the commit."""
+        mark = len(self._files) + 1
+        # A path written twice keeps its latest content
+        if rel_path in self._files:
+            mark = self._files[rel_path][1]
+        self._files[rel_path] = (mode, mark)
+        self.counts[CREATED] += 1
+        self._stream.write(f"blob\nmark :{mark}\ndata {size}\n".encode("utf-8"))
+        return mark
+
+    def _check(self, rel_path: str, data: bytes):
+        """Parse structured content once it is complete."""
+        if not self.check_structure:
+            return
+        file_format = structured_format(Path(rel_path))
+        if file_format is None:
+            return
+        self.structured_files += 1
+        self.structure_errors = [error for error in self.structure_errors if error.path != rel_path]
+        error = check_data(data, rel_path, file_format)
+        if error is not None:
+            self.structure_errors.append(error)
+
+    def commit(self, message: str) -> str:
+        """
+        Commit all streamed files as the complete tree of the current branch.
+
+        If the branch already has commits, the new commit replaces their tree.
+
+        Args:
+            message: Commit message
+
+        Returns:
+            Commit ID
+        """
+        parent = _git(self.output_dir, "rev-parse", "-q", "--verify", self._ref, check=False).stdout.strip()
+
+        encoded = message.encode("utf-8")
+        lines = [
+            f"commit {self._ref}",
+            f"author {self._author}",
+            f"committer {self._committer}",
+            f"data {len(encoded)}",
+        ]
+        header = "\n".join(lines).encode("utf-8") + b"\n" + encoded + b"\n"
+        if parent:
+            header += f"from {parent}\n".encode("utf-8")
+        body = ["deleteall"]
+        body += [f"M {mode} :{mark} {_quote_path(rel_path)}" for rel_path, (mode, mark) in sorted(self._files.items())]
+        body += ["", "done", ""]
+        self._stream.write(header + "\n".join(body).encode("utf-8"))
+        self._stream.close()
+
+        if self._process.wait() != 0:
+            raise RuntimeError(f"git fast-import failed (exit code {self._process.returncode})")
+        return _git(self.output_dir, "rev-parse", self._ref).stdout.strip()
+
+    def abort(self):
+        """Stop fast-import without updating any branch."""
+        if self._process is not None and self._process.poll() is None:
+            # Without "done", fast-import treats the stream as truncated
+            try:
+                self._stream.close()
+            except BrokenPipeError:
+                pass
+            self._process.wait()
+
+    def checkout(self):
+        """Check out the committed tree into the repository's working tree."""
+        _git(self.output_dir, "checkout", "-q", "-f")
@@ -9,11 +9,8 @@ Usage:
 """
 
 import sys
-from pathlib import Path
 from typing import Dict
 
-import yaml
-
 from setup import ProjectGenerator
 
 
@@ -23,7 +20,6 @@ class InteractiveSetup:
     def __init__(self):
         """Initialize InteractiveSetup."""
         self.variables: Dict[str, str] = {}
-        self.config: Dict = {}
 
     def run(self) -> bool:
         """
@@ -180,9 +176,6 @@ class InteractiveSetup:
 
         self.variables['FEATURES_LIST'] = '\n'.join([f"- {f}" for f in features])
 
-        # Store features for YAML config
-        self.config['features'] = features
-
     def _setup_development(self):
         """Setup development settings."""
         print("\n🧪 Development Settings")
@@ -256,98 +249,14 @@ class InteractiveSetup:
         if confirm.lower() != "yes":
             return False
 
-        # Save configuration to temporary file
-        temp_config_path = self._save_temp_config()
-
-        print(f"\n💾 Configuration saved to: {temp_config_path}")
-
-        # Generate project
+        # Generate project directly from the collected variables
         print("\n🔨 Generating project...\n")
 
-        generator = ProjectGenerator(str(temp_config_path), self.template_name)
+        generator = ProjectGenerator(template_name=self.template_name, variables=self.variables)
         success = generator.generate(self.output_dir, validate=True, force=False)
 
         return success
 
-    def _save_temp_config(self) -> Path:
-        """Save configuration to temporary YAML file."""
-        script_dir = Path(__file__).parent
-        temp_config_path = script_dir / "temp-config.yaml"
-
-        # Build full config structure
-        config = {
-            'project': {
-                'name': self.variables['PROJECT_NAME'],
-                'description': self.variables['PROJECT_DESCRIPTION'],
-                'repository_url': self.variables['REPOSITORY_URL']
-            },
-            'tech_stack': {
-                'frontend': {
-                    'framework': 'Next.js',
-                    'version': '15+',
-                    'language': 'TypeScript',
-                    'styling': 'Tailwind CSS',
-                    'state_management': 'React Context / Zustand',
-                    'package_manager': 'npm'
-                },
-                'backend': {
-                    'framework': 'FastAPI',
-                    'version': '0.104+',
-                    'language': 'Python',
-                    'python_version': '3.12+',
-                    'orm': 'SQLAlchemy',
-                    'migration': 'Alembic'
-                },
-                'database': {
-                    'primary': self.variables['DATABASE_TYPE'],
-                    'version': self.variables['DATABASE_VERSION'],
-                    'port': self.variables['DATABASE_PORT'],
-                    'client_tools': self.variables['DATABASE_CLIENT_TOOLS'],
-                    'url_example': self.variables['DATABASE_URL_EXAMPLE']
-                },
-                'infrastructure': {
-                    'platform': self.variables['INFRASTRUCTURE_PLATFORM'],
-                    'containerization': 'Docker'
-                }
-            },
-            'features': self.config.get('features', []),
-            'team': {
-                'organization': self.variables['ORGANIZATION_NAME'],
-                'project_manager': self.variables['PM_NAME'],
-                'tech_lead': self.variables['TECH_LEAD_NAME']
-            },
-            'development': {
-                'branch_strategy': 'git-flow',
-                'main_branch': 'main',
-                'develop_branch': 'develop',
-                'test_coverage_target': int(self.variables['TEST_COVERAGE_TARGET'])
-            },
-            'code_quality': {
-                'frontend': {
-                    'linter': 'ESLint',
-                    'formatter': 'Prettier'
-                },
-                'backend': {
-                    'linter': 'Ruff',
-                    'formatter': 'Ruff',
-                    'type_checker': 'MyPy'
-                }
-            },
-            'ci_cd': {
-                'platform': 'GitHub Actions',
-                'auto_review': True,
-                'auto_deploy': False
-            },
-            'target_user_description': self.variables['TARGET_USER_DESCRIPTION'],
-            'license': self.variables['LICENSE']
-        }
-
-        # Write YAML
-        with open(temp_config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(config, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
-
-        return temp_config_path
-
     def _prompt(self, question: str, default: str = "", choices: list = None, help_text: str = None) -> str:
         """
         Prompt user for input.
@@ -0,0 +1,141 @@
+"""
+Generation Journal
+
+Write-ahead journal of completed output files, kept in the output directory
+while a generation runs. Each line records a file's relative path, size and
+SHA-256 once it has been fully written. After an interruption,
+``setup.py --resume`` verifies the journaled files and continues with the
+rest instead of regenerating everything. The journal is removed when the
+generation completes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, TextIO, Tuple
+
+JOURNAL_FILE = ".generation-journal"
+
+# Files are hashed in chunks so large binary assets are not read into memory
+_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_file(path: Path) -> str:
+    """SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GenerationJournal:
+    """Append-only record of files completed by a generation."""
+
+    def __init__(self, output_dir: Path, key: str):
+        """
+        Initialize GenerationJournal.
+
+        Args:
+            output_dir: Output directory holding the journal
+            key: Identifies the generation inputs; a journal written for
+                different inputs is not resumed
+        """
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / JOURNAL_FILE
+        self.key = key
+        self.entries: Dict[str, Tuple[int, str]] = {}
+        self._file: Optional[TextIO] = None
+
+    def open(self, resume: bool = False) -> int:
+        """
+        Start journaling, loading the previous journal when resuming.
+
+        Args:
+            resume: Keep entries of an interrupted generation with the same key
+
+        Returns:
+            Number of journaled files available for resuming
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if resume and self._load():
+            self._file = open(self.path, "a", encoding="utf-8")
+        else:
+            self.entries = {}
+            self._file = open(self.path, "w", encoding="utf-8")
+            self._append({"key": self.key})
+        return len(self.entries)
+
+    def _load(self) -> bool:
+        """Read an existing journal; False if missing or written for other inputs."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("key") != self.key:
+                    return False
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn final line from the interruption
+                        break
+                    self.entries[entry["path"]] = (entry["size"], entry["sha256"])
+        except (FileNotFoundError, json.JSONDecodeError):
+            return False
+        return True
+
+    def completed(self, rel_path: str) -> bool:
+        """
+        Whether a file was journaled and is still intact on disk.
+
+        Args:
+            rel_path: Path relative to the output directory
+
+        Returns:
+            True if the output matches the journaled size and digest
+        """
+        entry = self.entries.get(rel_path)
+        if entry is None:
+            return False
+        path = self.output_dir / rel_path
+        try:
+            if path.stat().st_size != entry[0]:
+                return False
+            return sha256_file(path) == entry[1]
+        except FileNotFoundError:
+            return False
+
+    def record(self, rel_path: str, digest: str, size: int):
+        """
+        Record a fully written file.
+
+        Args:
+            rel_path: Path relative to the output directory
+            digest: SHA-256 hex digest of the written content
+            size: Size in bytes
+        """
+        self.entries[rel_path] = (size, digest)
+        self._append({"path": rel_path, "size": size, "sha256": digest})
+
+    def _append(self, entry: Dict):
+        self._file.write(json.dumps(entry, ensure_ascii=False))
+        self._file.write("\n")
+        # Reach the OS before the next file starts, so a killed process keeps the record
+        self._file.flush()
+
+    def close(self, completed: bool):
+        """
+        Stop journaling.
+
+        Args:
+            completed: The generation finished, so the journal is deleted
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if completed:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,199 @@
+"""
+Memory Profile
+
+Per-phase memory report for ``setup.py --profile-memory``. MemoryProfiler
+listens for the generator's phase events. For each phase it records the
+tracemalloc peak and the memory still allocated when the phase ends
+(retained), the process RSS sampled in a background thread, and the source
+lines that allocated the retained memory. The report is JSON, so tests and
+CI jobs can enforce memory budgets.
+"""
+
+import json
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, TextIO
+
+from events import PHASE_DONE, PHASE_STARTED, Event, GenerationListener
+
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP_SITES = 5
+# Stack depth kept by tracemalloc; allocation sites are reported by their innermost frame
+TRACE_FRAMES = 1
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size, or None where /proc is not available."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Peak RSS of the process so far (getrusage), or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class MemoryProfiler(GenerationListener):
+    """Measures tracemalloc and RSS usage of each generation phase."""
+
+    def __init__(self, sample_interval: float = DEFAULT_SAMPLE_INTERVAL, top_sites: int = DEFAULT_TOP_SITES):
+        """
+        Initialize MemoryProfiler.
+
+        Args:
+            sample_interval: Seconds between RSS samples
+            top_sites: Allocation sites reported per phase
+        """
+        self.sample_interval = sample_interval
+        self.top_sites = top_sites
+        self.phases: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._start_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._start_traced = 0
+        self._peak = 0
+        self._rss_peak = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracing = False
+
+    def start(self):
+        """Start tracing allocations and sampling RSS."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+        if rss_bytes() is not None:
+            self._stop.clear()
+            self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+            self._sampler.start()
+
+    def stop(self):
+        """Stop sampling and tracing."""
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _sample(self):
+        """Background thread: track the highest RSS seen in the current phase."""
+        while not self._stop.wait(self.sample_interval):
+            rss = rss_bytes()
+            if rss is not None:
+                with self._lock:
+                    self._rss_peak = max(self._rss_peak, rss)
+
+    def on_event(self, event: Event):
+        if not tracemalloc.is_tracing():
+            return
+        if event["event"] == PHASE_STARTED:
+            self._phase_started(event["phase"])
+        elif event["event"] == PHASE_DONE and self._current is not None:
+            self._phase_done(event)
+
+    def _phase_started(self, name: str):
+        self._start_snapshot = self._snapshot()
+        tracemalloc.reset_peak()
+        self._start_traced = tracemalloc.get_traced_memory()[0]
+        rss = rss_bytes()
+        with self._lock:
+            self._rss_peak = rss or 0
+        self._current = {"phase": name, "rss_start_bytes": rss}
+
+    def _phase_done(self, event: Event):
+        traced, peak = tracemalloc.get_traced_memory()
+        end_snapshot = self._snapshot()
+        rss = rss_bytes()
+        with self._lock:
+            rss_peak = max(self._rss_peak, rss or 0)
+        self._peak = max(self._peak, peak)
+
+        phase = self._current
+        phase.update(
+            ok=event["ok"],
+            duration_ms=event["duration_ms"],
+            # Relative to the memory traced when the phase started
+            peak_bytes=peak - self._start_traced,
+            retained_bytes=traced - self._start_traced,
+            rss_peak_bytes=rss_peak if rss is not None else None,
+            rss_end_bytes=rss,
+            top_allocations=self._top_allocations(end_snapshot),
+        )
+        self.phases.append(phase)
+        self._current = None
+        self._start_snapshot = None
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Snapshot without the profiler's and tracemalloc's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def _top_allocations(self, end_snapshot: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        """Source lines with the most memory allocated during the phase and still held."""
+        sites = []
+        for stat in end_snapshot.compare_to(self._start_snapshot, "lineno"):
+            if stat.size_diff <= 0:
+                continue
+            frame = stat.traceback[0]
+            sites.append({
+                "file": frame.filename,
+                "line": frame.lineno,
+                "size_bytes": stat.size_diff,
+                "count": stat.count_diff,
+            })
+            if len(sites) == self.top_sites:
+                break
+        return sites
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Build the machine-readable report.
+
+        Returns:
+            Dictionary with per-phase measurements (``phases``), the highest
+            traced allocation total (``peak_bytes``) and the process RSS peak
+        """
+        return {
+            "peak_bytes": self._peak,
+            "rss_peak_bytes": max_rss_bytes(),
+            "rss_source": "/proc/self/statm" if rss_bytes() is not None else None,
+            "phases": self.phases,
+        }
+
+    def write(self, stream: TextIO):
+        """Write the report as JSON."""
+        json.dump(self.report(), stream, ensure_ascii=False, indent=2)
+        stream.write("\n")
+
+    def summary(self) -> str:
+        """Human-readable table of the per-phase measurements."""
+        lines = [f"{'phase':<16}{'peak':>12}{'retained':>12}{'RSS peak':>12}"]
+        for phase in self.phases:
+            rss_peak = phase["rss_peak_bytes"]
+            lines.append(
+                f"{phase['phase']:<16}{_mib(phase['peak_bytes']):>12}{_mib(phase['retained_bytes']):>12}"
+                f"{_mib(rss_peak) if rss_peak is not None else '-':>12}"
+            )
+        return "\n".join(lines)
+
+
+def _mib(size: int) -> str:
+    return f"{size / (1024 * 1024):.2f} MiB"
@@ -0,0 +1,157 @@
+"""
+Generation Metrics
+
+Prometheus textfile-collector export for ``setup.py --metrics-file``.
+PrometheusListener aggregates generation events (phase durations, files
+and bytes by action, per-file durations as a histogram) and writes them
+in the text exposition format. The file is replaced atomically, so
+node_exporter never reads a partial file.
+"""
+
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from events import FILE_COPIED, FILE_FAILED, FILE_RENDERED, FILE_SKIPPED, PHASE_DONE, Event, GenerationListener
+
+PREFIX = "template_generator"
+
+# Per-file write durations range from microseconds (cached copies) to seconds (large assets)
+FILE_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+_FILE_ACTIONS = {FILE_RENDERED: "rendered", FILE_COPIED: "copied", FILE_SKIPPED: "skipped", FILE_FAILED: "failed"}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricFamilies:
+    """Metric samples grouped by family, rendered in the text exposition format."""
+
+    def __init__(self):
+        """Initialize MetricFamilies."""
+        self._families: Dict[str, Tuple[str, str, List[Tuple[str, Labels, float]]]] = {}
+
+    def add(self, name: str, metric_type: str, help_text: str, value: float,
+            labels: Optional[Dict[str, str]] = None, suffix: str = ""):
+        """
+        Add a sample.
+
+        Args:
+            name: Family name (without the prefix)
+            metric_type: counter, gauge or histogram
+            help_text: HELP line
+            value: Sample value
+            labels: Sample labels
+            suffix: Sample name suffix (_bucket, _sum, _count for histograms)
+        """
+        family = self._families.setdefault(f"{PREFIX}_{name}", (metric_type, help_text, []))
+        family[2].append((suffix, tuple((labels or {}).items()), value))
+
+    def histogram(self, name: str, help_text: str, observations: List[float], buckets: Tuple[float, ...],
+                  labels: Optional[Dict[str, str]] = None):
+        """Add a histogram with cumulative buckets from raw observations."""
+        labels = labels or {}
+        for bound in (*buckets, float("inf")):
+            count = sum(1 for value in observations if value <= bound)
+            self.add(name, "histogram", help_text, count, {**labels, "le": _format_value(bound)}, "_bucket")
+        self.add(name, "histogram", help_text, round(sum(observations), 6), labels, "_sum")
+        self.add(name, "histogram", help_text, len(observations), labels, "_count")
+
+    def render(self) -> str:
+        """Text exposition format."""
+        lines = []
+        for name, (metric_type, help_text, samples) in self._families.items():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for suffix, labels, value in samples:
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path):
+        """Write to path atomically (temporary file + rename in the same directory)."""
+        path = Path(path)
+        tmp_path = path.parent / f".{path.name}.{os.getpid()}.tmp"
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+
+class PrometheusListener(GenerationListener):
+    """Aggregates generation events into Prometheus metrics."""
+
+    def __init__(self, template: str):
+        """
+        Initialize PrometheusListener.
+
+        Args:
+            template: Template name, added as a label to every sample
+        """
+        self.template = template
+        self.phases: Dict[str, Tuple[float, bool]] = {}
+        self.files: Counter = Counter()
+        self.bytes: Counter = Counter()
+        self.file_durations: List[float] = []
+        self._started = time.perf_counter()
+
+    def on_event(self, event: Event):
+        kind = event["event"]
+        if kind == PHASE_DONE:
+            self.phases[event["phase"]] = (event["duration_ms"] / 1000, event["ok"])
+        elif kind in _FILE_ACTIONS:
+            action = _FILE_ACTIONS[kind]
+            self.files[action] += 1
+            self.bytes[action] += event.get("bytes", 0)
+            if "duration_ms" in event:
+                self.file_durations.append(event["duration_ms"] / 1000)
+
+    def metrics(self, success: bool) -> MetricFamilies:
+        """
+        Build the metric families for a finished generation.
+
+        Args:
+            success: Whether the generation succeeded
+
+        Returns:
+            MetricFamilies ready to render or write
+        """
+        labels = {"template": self.template}
+        metrics = MetricFamilies()
+        metrics.add("last_run_timestamp_seconds", "gauge", "UNIX time the generation finished",
+                    round(time.time(), 3), labels)
+        metrics.add("success", "gauge", "1 if the generation succeeded", int(success), labels)
+        metrics.add("duration_seconds", "gauge", "Wall time of the generation",
+                    round(time.perf_counter() - self._started, 6), labels)
+        for phase, (duration, ok) in self.phases.items():
+            metrics.add("phase_duration_seconds", "gauge", "Wall time per generation phase",
+                        round(duration, 6), {**labels, "phase": phase})
+            metrics.add("phase_success", "gauge", "1 if the phase succeeded", int(ok), {**labels, "phase": phase})
+        for action in ("rendered", "copied", "skipped", "failed"):
+            metrics.add("files_total", "counter", "Files handled by action", self.files[action],
+                        {**labels, "action": action})
+        for action in ("rendered", "copied"):
+            metrics.add("bytes_total", "counter", "Bytes written by action", self.bytes[action],
+                        {**labels, "action": action})
+        metrics.histogram("file_duration_seconds", "Time to render or copy one file",
+                          self.file_durations, FILE_DURATION_BUCKETS, labels)
+        return metrics
+
+    def write(self, path: Path, success: bool):
+        """Write the metrics of a finished generation to a textfile."""
+        self.metrics(success).write(path)
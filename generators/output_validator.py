@@ -0,0 +1,201 @@
+"""
+Output Validator
+
+Parses generated YAML, JSON and TOML files to catch variable values that
+break the file structure (quotes, colons or newlines in a value).
+Large outputs are parsed across a process pool; small ones inline, where
+starting workers would cost more than the parsing itself.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from template_cache import DEFAULT_EXCLUDE_PATTERNS
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11: the tomli backport, or TOML files are not checked
+    try:
+        import tomli as tomllib
+    except ModuleNotFoundError:
+        tomllib = None
+
+TOML_SUPPORTED = tomllib is not None
+
+STRUCTURED_FORMATS = {
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.json': 'json',
+    '.toml': 'toml',
+}
+
+# JSON with comments (JSONC); a strict JSON parser would reject valid files
+JSONC_PATTERNS = ['tsconfig*.json', 'jsconfig*.json', '.vscode/*.json', '.devcontainer/*.json']
+
+# Below this many bytes, files are parsed inline instead of in a process pool
+PARALLEL_MIN_BYTES = 1 << 20
+
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_TOML_POSITION_RE = re.compile(r'\(at line (\d+), column (\d+)\)')
+_TOML_ERRORS = (tomllib.TOMLDecodeError,) if tomllib is not None else ()
+
+
+class StructureError(NamedTuple):
+    """A structured output file that failed to parse."""
+
+    path: str  # Relative to the output directory
+    format: str  # yaml, json or toml
+    line: Optional[int]  # 1-based, None if unknown
+    column: Optional[int]  # 1-based, None if unknown
+    message: str
+
+    def __str__(self) -> str:
+        position = f":{self.line}:{self.column}" if self.line is not None else ""
+        return f"{self.path}{position}: {self.message} ({self.format})"
+
+
+def structured_format(path: Path) -> Optional[str]:
+    """Return the parser name for a file, or None if it is not checked."""
+    file_format = STRUCTURED_FORMATS.get(path.suffix)
+    if file_format == 'toml' and not TOML_SUPPORTED:
+        return None
+    if file_format == 'json' and any(path.match(pattern) for pattern in JSONC_PATTERNS):
+        return None
+    return file_format
+
+
+def check_file(path: Path, rel_path: str, file_format: str) -> Optional[StructureError]:
+    """
+    Parse a single file.
+
+    Args:
+        path: File path
+        rel_path: Path reported in errors
+        file_format: yaml, json or toml
+
+    Returns:
+        StructureError if the file does not parse, otherwise None
+    """
+    try:
+        data = path.read_bytes()
+    except OSError as e:
+        return StructureError(rel_path, file_format, None, None, str(e))
+    return check_data(data, rel_path, file_format)
+
+
+def check_data(data: bytes, rel_path: str, file_format: str) -> Optional[StructureError]:
+    """
+    Parse file content that has not been written to disk.
+
+    Args:
+        data: File content
+        rel_path: Path reported in errors
+        file_format: yaml, json or toml
+
+    Returns:
+        StructureError if the content does not parse, otherwise None
+    """
+    line = column = None
+    try:
+        if file_format == 'yaml':
+            # Workflows and rule files may contain several documents
+            for _ in yaml.load_all(data, Loader=_YAML_LOADER):
+                pass
+        elif file_format == 'json':
+            json.loads(data)
+        else:
+            tomllib.loads(data.decode('utf-8'))
+        return None
+    except yaml.MarkedYAMLError as e:
+        mark = e.problem_mark or e.context_mark
+        if mark is not None:
+            line, column = mark.line + 1, mark.column + 1
+        message = ': '.join(part for part in (e.context, e.problem) if part) or str(e)
+    except json.JSONDecodeError as e:
+        line, column, message = e.lineno, e.colno, e.msg
+    except _TOML_ERRORS as e:
+        message = str(e)
+        match = _TOML_POSITION_RE.search(message)
+        if match:
+            line, column = int(match.group(1)), int(match.group(2))
+            message = message[:match.start()].strip()
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        message = str(e)
+    return StructureError(rel_path, file_format, line, column, message)
+
+
+def _check_batch(batch: List[Tuple[str, str, str]]) -> List[StructureError]:
+    """Check (path, rel_path, format) tuples in a worker process."""
+    errors = []
+    for path, rel_path, file_format in batch:
+        error = check_file(Path(path), rel_path, file_format)
+        if error is not None:
+            errors.append(error)
+    return errors
+
+
+def iter_structured_files(output_dir: Path) -> Iterator[Tuple[Path, str, str]]:
+    """
+    Find structured files in the output, skipping dependency and build directories.
+
+    Yields:
+        Tuple of (path, relative path, format)
+    """
+    output_dir = Path(output_dir)
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = sorted(d for d in dirs if d not in DEFAULT_EXCLUDE_PATTERNS)
+        for name in sorted(files):
+            path = Path(root) / name
+            rel_path = path.relative_to(output_dir)
+            file_format = structured_format(rel_path)
+            if file_format is not None:
+                yield path, rel_path.as_posix(), file_format
+
+
+def validate_structure(output_dir: Path, workers: Optional[int] = None) -> Tuple[int, List[StructureError]]:
+    """
+    Parse every YAML/JSON/TOML file in the output directory.
+
+    Args:
+        output_dir: Generated project directory
+        workers: Worker processes for large outputs (default: CPU count)
+
+    Returns:
+        Tuple of (number of files checked, errors sorted by path)
+    """
+    files = list(iter_structured_files(output_dir))
+    total_bytes = sum(path.stat().st_size for path, _, _ in files)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or total_bytes < PARALLEL_MIN_BYTES:
+        errors = _check_batch([(str(path), rel, fmt) for path, rel, fmt in files])
+    else:
+        # Interleave files into one batch per worker to balance sizes
+        batches = [[(str(path), rel, fmt) for path, rel, fmt in files[index::workers]]
+                   for index in range(workers)]
+        errors = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for batch_errors in pool.map(_check_batch, [batch for batch in batches if batch]):
+                errors.extend(batch_errors)
+
+    return len(files), sorted(errors)
+
+
+if __name__ == '__main__':
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python output_validator.py <output-dir>")
+        sys.exit(1)
+
+    checked, structure_errors = validate_structure(Path(sys.argv[1]))
+    print(f"Checked {checked} structured files")
+    for structure_error in structure_errors:
+        print(f"  {structure_error}")
+    sys.exit(1 if structure_errors else 0)
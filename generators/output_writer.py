@@ -0,0 +1,233 @@
+"""
+Output Writer
+
+Single write path for generated files, shared by TemplateProcessor and
+SecurityIntegrator. Files are written atomically (temporary file + rename).
+In sync mode, files whose bytes are already up to date are left untouched
+so their mtimes (and the caches of tools watching them) are preserved.
+"""
+
+import filecmp
+import hashlib
+import os
+import shutil
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from journal import JOURNAL_FILE, GenerationJournal, sha256_file
+from template_cache import DEFAULT_EXCLUDE_PATTERNS
+
+CREATED = "created"
+UPDATED = "updated"
+UNCHANGED = "unchanged"
+RESUMED = "resumed"
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Dot directories the generator writes into; other dot directories are tool caches
+GENERATED_DOT_DIRS = {'.github', '.vscode', '.cursor'}
+
+# Written by the generator about the output, not from the template (journal, checksums.MANIFEST_FILE)
+BOOKKEEPING_FILES = {JOURNAL_FILE, 'SHA256SUMS'}
+
+
+def iter_output_files(output_dir: Path) -> Iterator[str]:
+    """
+    Walk a generated project, skipping dependency, build and tool-cache directories.
+
+    Args:
+        output_dir: Output directory
+
+    Yields:
+        File paths relative to output_dir (POSIX separators)
+    """
+    output_dir = Path(output_dir)
+    for root, dirs, files in os.walk(output_dir):
+        dirs[:] = [
+            d for d in dirs
+            if d not in DEFAULT_EXCLUDE_PATTERNS and (not d.startswith('.') or d in GENERATED_DOT_DIRS)
+        ]
+        for name in files:
+            yield (Path(root) / name).relative_to(output_dir).as_posix()
+
+
+class OutputWriter:
+    """Writes generated files under an output directory."""
+
+    def __init__(self, output_dir: Path, sync: bool = False, journal: Optional[GenerationJournal] = None,
+                 checksums: bool = False):
+        """
+        Initialize OutputWriter.
+
+        Args:
+            output_dir: Output directory
+            sync: Skip files whose content already matches (size first, then bytes)
+            journal: Records each completed file with its SHA-256 (optional)
+            checksums: Keep the SHA-256 of every file in ``digests`` (for a SHA256SUMS manifest)
+        """
+        self.output_dir = Path(output_dir)
+        self.sync = sync
+        self.journal = journal
+        # Digests are computed from the bytes being written, never by reading outputs back
+        self.digests: Optional[Dict[str, str]] = {} if checksums else None
+        self.counts: Counter = Counter()
+        # Only tracked in sync mode, to find orphaned files afterwards
+        self.written: Set[str] = set()
+        self._dirs: Set[Path] = set()
+
+    def resumed(self, rel_path: str) -> Optional[int]:
+        """
+        Check whether an interrupted generation already wrote this file intact.
+
+        Callers skip producing the file when a size is returned.
+
+        Args:
+            rel_path: Path relative to the output directory
+
+        Returns:
+            Size of the journaled file, or None if it still has to be written
+        """
+        if self.journal is None or not self.journal.completed(rel_path):
+            return None
+        if self.sync:
+            self.written.add(rel_path)
+        self.counts[RESUMED] += 1
+        size, digest = self.journal.entries[rel_path]
+        if self.digests is not None:
+            self.digests[rel_path] = digest
+        return size
+
+    def write(self, rel_path: str, data: bytes, executable: bool = False) -> str:
+        """
+        Write file content.
+
+        Args:
+            rel_path: Path relative to the output directory (POSIX separators)
+            data: File content
+            executable: Create the file executable, as its template source is
+
+        Returns:
+            CREATED, UPDATED or UNCHANGED
+        """
+        path = self.output_dir / rel_path
+        status = self._status(rel_path, path, len(data), lambda: path.read_bytes() == data)
+        if status != UNCHANGED:
+            def write(tmp_path: Path):
+                tmp_path.write_bytes(data)
+                if executable:
+                    # Execute permission wherever the umask granted read permission
+                    mode = tmp_path.stat().st_mode
+                    tmp_path.chmod(mode | (mode & 0o444) >> 2)
+
+            self._replace(path, write, keep_mode=status == UPDATED)
+        if self._hashing:
+            self._record(rel_path, hashlib.sha256(data).hexdigest(), len(data))
+        return status
+
+    def copy(self, rel_path: str, source: Path) -> str:
+        """
+        Copy a file with its metadata.
+
+        Args:
+            rel_path: Destination path relative to the output directory
+            source: Source file
+
+        Returns:
+            CREATED, UPDATED or UNCHANGED
+        """
+        path = self.output_dir / rel_path
+        status = self._status(rel_path, path, source.stat().st_size,
+                              lambda: filecmp.cmp(source, path, shallow=False))
+        if not self._hashing:
+            if status != UNCHANGED:
+                self._replace(path, lambda tmp_path: shutil.copy2(source, tmp_path))
+            return status
+
+        if status == UNCHANGED:
+            digest, size = sha256_file(path), path.stat().st_size
+        else:
+            digest, size = self._replace(path, lambda tmp_path: self._copy_hashing(source, tmp_path))
+        self._record(rel_path, digest, size)
+        return status
+
+    @property
+    def _hashing(self) -> bool:
+        """Whether written content has to be hashed."""
+        return self.journal is not None or self.digests is not None
+
+    def _record(self, rel_path: str, digest: str, size: int):
+        """Pass a completed file's digest to the journal and the checksum list."""
+        if self.journal is not None:
+            self.journal.record(rel_path, digest, size)
+        if self.digests is not None:
+            self.digests[rel_path] = digest
+
+    def _status(self, rel_path: str, path: Path, size: int, same_content: Callable[[], bool]) -> str:
+        """Classify a pending write, comparing content only when sizes match."""
+        if self.sync:
+            self.written.add(rel_path)
+        try:
+            existing_size = path.stat().st_size
+        except FileNotFoundError:
+            status = CREATED
+        else:
+            status = UNCHANGED if self.sync and existing_size == size and same_content() else UPDATED
+        self.counts[status] += 1
+        return status
+
+    @staticmethod
+    def _copy_hashing(source: Path, target: Path) -> Tuple[str, int]:
+        """Copy a file with metadata, hashing the content on the way through."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(source, "rb") as src, open(target, "wb") as dst:
+            for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        shutil.copystat(source, target)
+        return digest.hexdigest(), size
+
+    def _replace(self, path: Path, write: Callable[[Path], object], keep_mode: bool = False) -> object:
+        """
+        Write through a temporary file and rename it over the destination.
+
+        Renaming never modifies the previous inode, so hardlinked outputs
+        and readers of the old file are unaffected. Returns what write returned.
+        """
+        parent = path.parent
+        if parent not in self._dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._dirs.add(parent)
+
+        tmp_path = parent / f".{path.name}.{os.getpid()}.tmp"
+        try:
+            result = write(tmp_path)
+            if keep_mode:
+                # Keep permissions changed in the project (e.g. chmod +x)
+                shutil.copymode(path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return result
+
+    def orphans(self) -> List[str]:
+        """
+        List files in the output directory that this generation did not write.
+
+        Dependency, build and tool-cache directories are not reported.
+        Only meaningful in sync mode.
+
+        Returns:
+            Sorted relative paths
+        """
+        return sorted(
+            rel_path for rel_path in iter_output_files(self.output_dir)
+            if rel_path not in self.written and rel_path not in BOOKKEEPING_FILES
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of created, updated, unchanged and resumed files."""
+        return {status: self.counts[status] for status in (CREATED, UPDATED, UNCHANGED, RESUMED)}
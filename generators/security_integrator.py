@@ -6,16 +6,87 @@ Copies security files from .security-template/ to generated project
 and applies template-specific customizations from .security-config.yaml
 """
 
-import shutil
+import json
+import re
+import time
 import yaml
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from events import FILE_COPIED, FILE_RENDERED, EventEmitter
+from output_writer import RESUMED, OutputWriter
+from template_cache import TemplateCache
+
+# Languages with an IPA rule file (scripts/security/semgrep-rules/ipa-<language>.yaml)
+SEMGREP_LANGUAGES = ("python", "typescript")
+
+# Paths never worth scanning (dependencies, build outputs, scan results).
+# A .semgrepignore replaces Semgrep's built-in ignore list, so these are always written.
+DEFAULT_SCAN_EXCLUDES = [
+    "node_modules/",
+    ".venv/",
+    "venv/",
+    "__pycache__/",
+    ".next/",
+    "dist/",
+    "build/",
+    "coverage/",
+    ".git/",
+    "security-results/",
+    ".security-cache/",
+]
+
+
+# exclude_dirs list in .security-template/.bandit
+_BANDIT_EXCLUDE_DIRS = re.compile(r"^(exclude_dirs\s*=\s*\[)(.*?)(\n\])", re.MULTILINE | re.DOTALL)
+
+
+def _merge_bandit_excludes(bandit_config: str, exclude_dirs: List[str]) -> str:
+    """
+    Add project exclude dirs to the ``exclude_dirs`` list of a .bandit file.
+
+    Args:
+        bandit_config: Contents of the security template's .bandit
+        exclude_dirs: ``security.bandit.exclude_dirs`` from .security-config.yaml
+
+    Returns:
+        .bandit contents with the missing entries appended to the list
+    """
+    entries = [f"'/{path.strip('/')}'" for path in exclude_dirs]
+    match = _BANDIT_EXCLUDE_DIRS.search(bandit_config)
+    if match is None:
+        block = "exclude_dirs = [\n" + ",\n".join(f"    {entry}" for entry in entries) + "\n]\n"
+        return bandit_config.rstrip("\n") + "\n\n# security.bandit.exclude_dirs\n" + block
+
+    existing = match.group(2)
+    entries = [entry for entry in entries if entry not in existing]
+    if not entries:
+        return bandit_config
+    body = existing.rstrip()
+    if body.strip() and not body.endswith(","):
+        body += ","
+    body += "\n    # security.bandit.exclude_dirs\n" + ",\n".join(f"    {entry}" for entry in entries)
+    return bandit_config[:match.start(2)] + body + bandit_config[match.end(2):]
+
+
+class _RuleDumper(yaml.SafeDumper):
+    """YAML dumper that keeps multi-line rule messages readable."""
+
+
+def _represent_str(dumper: yaml.SafeDumper, data: str):
+    style = "|" if "\n" in data else None
+    return dumper.represent_scalar("tag:yaml.org,2002:str", data, style=style)
+
+
+_RuleDumper.add_representer(str, _represent_str)
 
 
 class SecurityIntegrator:
     """Integrates security template files into generated project."""
 
-    def __init__(self, repo_root: Path, template_name: str, output_dir: Path):
+    def __init__(self, repo_root: Path, template_name: str, output_dir: Path,
+                 cache: Optional[TemplateCache] = None, events: Optional[EventEmitter] = None,
+                 writer: Optional[OutputWriter] = None):
         """
         Initialize SecurityIntegrator.
 
@@ -23,10 +94,16 @@ class SecurityIntegrator:
             repo_root: Root directory of template repository
             template_name: Name of template being used
             output_dir: Output directory for generated project
+            cache: Cache for parsed security configs and rule files (optional)
+            events: Receives progress messages and per-file events (default: print to stdout)
+            writer: Writes output files (default: plain OutputWriter for output_dir)
         """
         self.repo_root = repo_root
         self.template_name = template_name
         self.output_dir = output_dir
+        self.cache = cache
+        self.events = events or EventEmitter.console()
+        self.writer = writer or OutputWriter(output_dir)
 
         self.security_template_dir = repo_root / ".security-template"
         self.template_dir = repo_root / "templates" / template_name
@@ -39,12 +116,12 @@ class SecurityIntegrator:
         Returns:
             True if successful, False otherwise
         """
-        print("\n🔒 Integrating security template...")
+        self.events.message("\n🔒 Integrating security template...")
 
         # Check if security template exists
         if not self.security_template_dir.exists():
-            print(f"⚠️  Security template not found: {self.security_template_dir}")
-            print("  Skipping security integration")
+            self.events.message(f"⚠️  Security template not found: {self.security_template_dir}", level="warning")
+            self.events.message("  Skipping security integration")
             return False
 
         # Copy security template files
@@ -54,10 +131,10 @@ class SecurityIntegrator:
         if self.security_config_path.exists():
             self._apply_security_config()
         else:
-            print(f"  ℹ️  No .security-config.yaml found for {self.template_name}")
-            print("  Using default security configuration")
+            self.events.message(f"  ℹ️  No .security-config.yaml found for {self.template_name}")
+            self.events.message("  Using default security configuration")
 
-        print(f"✓ Copied {files_copied} security files")
+        self.events.message(f"✓ Copied {files_copied} security files")
         return True
 
     def _copy_security_files(self) -> int:
@@ -69,84 +146,247 @@ class SecurityIntegrator:
         """
         files_copied = 0
 
-        # Copy .bandit
-        if (self.security_template_dir / ".bandit").exists():
-            shutil.copy2(
-                self.security_template_dir / ".bandit",
-                self.output_dir / ".bandit"
-            )
+        # Copy .bandit (with the template's Bandit exclude_dirs merged in)
+        bandit_source = self.security_template_dir / ".bandit"
+        if bandit_source.exists():
+            exclude_dirs = self._bandit_exclude_dirs()
+            if exclude_dirs:
+                self._write_file(self.output_dir / ".bandit",
+                                 _merge_bandit_excludes(bandit_source.read_text(encoding='utf-8'), exclude_dirs))
+                self.events.message(f"  ✓ .bandit ({len(exclude_dirs)} exclusions from .security-config.yaml)")
+            else:
+                self._copy_file(bandit_source, self.output_dir / ".bandit")
+                self.events.message("  ✓ .bandit")
             files_copied += 1
-            print("  ✓ .bandit")
 
         # Copy .github/workflows/security-check.yml
         github_workflows_src = self.security_template_dir / ".github" / "workflows"
         github_workflows_dst = self.output_dir / ".github" / "workflows"
 
         if github_workflows_src.exists():
-            github_workflows_dst.mkdir(parents=True, exist_ok=True)
             for yml_file in github_workflows_src.glob("*.yml"):
-                shutil.copy2(yml_file, github_workflows_dst / yml_file.name)
+                self._copy_file(yml_file, github_workflows_dst / yml_file.name)
                 files_copied += 1
-                print(f"  ✓ .github/workflows/{yml_file.name}")
+                self.events.message(f"  ✓ .github/workflows/{yml_file.name}")
 
         # Copy scripts/security/
         security_scripts_src = self.security_template_dir / "scripts" / "security"
         security_scripts_dst = self.output_dir / "scripts" / "security"
 
         if security_scripts_src.exists():
-            # Create destination directory
-            security_scripts_dst.mkdir(parents=True, exist_ok=True)
-
-            # Copy all files and directories
+            # Copy all files (the writer creates directories)
             for item in security_scripts_src.rglob("*"):
                 if item.is_file():
                     rel_path = item.relative_to(security_scripts_src)
                     dst_file = security_scripts_dst / rel_path
-                    dst_file.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.copy2(item, dst_file)
+                    self._copy_file(item, dst_file)
                     files_copied += 1
 
-            print(f"  ✓ scripts/security/ (recursive)")
+            self.events.message("  ✓ scripts/security/ (recursive)")
 
         return files_copied
 
+    def _copy_file(self, source: Path, destination: Path):
+        """Copy a file with metadata and emit a FILE_COPIED event."""
+        started = time.perf_counter()
+        rel_path = destination.relative_to(self.output_dir).as_posix()
+        size = self.writer.resumed(rel_path)
+        if size is None:
+            status = self.writer.copy(rel_path, source)
+            size = source.stat().st_size if self.events.enabled else 0
+        else:
+            status = RESUMED
+        self.events.emit(FILE_COPIED, path=rel_path, bytes=size, status=status,
+                         duration_ms=round((time.perf_counter() - started) * 1000, 3))
+
+    def _write_file(self, path: Path, content: str):
+        """Write a generated text file and emit a FILE_RENDERED event."""
+        started = time.perf_counter()
+        rel_path = path.relative_to(self.output_dir).as_posix()
+        data = content.encode('utf-8')
+        status = RESUMED if self.writer.resumed(rel_path) is not None else self.writer.write(rel_path, data)
+        self.events.emit(FILE_RENDERED, path=rel_path, bytes=len(data), status=status,
+                         duration_ms=round((time.perf_counter() - started) * 1000, 3))
+
+    def _load_yaml(self, path: Path) -> Any:
+        """Load a YAML file, through the cache when one was given."""
+        if self.cache is not None:
+            return self.cache.load_yaml(path)
+        with open(path, 'r', encoding='utf-8') as f:
+            return yaml.safe_load(f)
+
     def _apply_security_config(self):
         """Apply template-specific security configuration."""
         try:
-            with open(self.security_config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+            config = self._load_yaml(self.security_config_path)
 
-            print(f"  ✓ Loaded security config from {self.template_name}")
+            self.events.message(f"  ✓ Loaded security config from {self.template_name}")
 
-            # Update .bandit if configuration exists
-            if config.get('security', {}).get('bandit', {}).get('enabled'):
-                self._update_bandit_config(config['security']['bandit'])
+            # Compile Semgrep rule packs and restrict scans to the declared roots
+            security_config = config.get('security', {})
+            semgrep_config = security_config.get('semgrep', {})
+            self._write_scan_config({
+                "semgrep": self._compile_rule_packs(semgrep_config),
+                "targets": self._scan_targets(semgrep_config),
+                # .security-config.yaml itself is a dot-file and is not rendered
+                "watch_patterns": security_config.get('github_actions', {}).get('watch_patterns', []),
+            })
+            self._write_semgrepignore(security_config.get('bandit', {}).get('exclude_dirs', []))
 
             # Add security check info to README or docs
             self._add_security_docs(config)
 
         except Exception as e:
-            print(f"  ⚠️  Failed to apply security config: {e}")
+            self.events.message(f"  ⚠️  Failed to apply security config: {e}", level="warning")
+
+    def _bandit_exclude_dirs(self) -> List[str]:
+        """Return ``security.bandit.exclude_dirs`` if Bandit is enabled in .security-config.yaml."""
+        if not self.security_config_path.exists():
+            return []
+        try:
+            config = self._load_yaml(self.security_config_path) or {}
+        except yaml.YAMLError:
+            # Reported when the config is applied
+            return []
+        bandit_config = config.get('security', {}).get('bandit', {})
+        if not bandit_config.get('enabled'):
+            return []
+        return list(bandit_config.get('exclude_dirs') or [])
+
+    def _compile_rule_packs(self, semgrep_config: Dict) -> Dict[str, Dict]:
+        """
+        Compile per-project Semgrep rule packs from the enabled rule IDs.
+
+        Writes scripts/security/semgrep-rules/project-<language>.yaml so the
+        security scripts run only the enabled rules (or skip disabled languages).
+
+        Args:
+            semgrep_config: ``security.semgrep`` section of .security-config.yaml
+
+        Returns:
+            ``semgrep`` section of scan-config.json
+        """
+        rules_dir = self.output_dir / "scripts" / "security" / "semgrep-rules"
+        packs: Dict[str, Dict] = {}
+
+        for language in SEMGREP_LANGUAGES:
+            language_config = semgrep_config.get(language)
+            source = self._rules_source(language)
+            if language_config is None or not source.exists():
+                continue
+
+            if not language_config.get('enabled', True):
+                packs[language] = {"enabled": False}
+                self.events.message(f"  ✓ Semgrep ({language}) disabled")
+                continue
+
+            enabled_ids = language_config.get('rules')
+            if self.cache is not None:
+                key = ('rule-pack', self.template_name, language,
+                       None if enabled_ids is None else tuple(enabled_ids))
+                content, selected_count, total_count, unknown = self.cache.derive(
+                    key, [source], lambda: self._render_rule_pack(language, source, enabled_ids))
+            else:
+                content, selected_count, total_count, unknown = self._render_rule_pack(
+                    language, source, enabled_ids)
+
+            for rule_id in unknown:
+                self.events.message(f"  ⚠️  Unknown {language} rule in .security-config.yaml: {rule_id}", level="warning")
+
+            pack_name = f"project-{language}.yaml"
+            self._write_file(rules_dir / pack_name, content)
+
+            packs[language] = {
+                "enabled": True,
+                "rules": f"semgrep-rules/{pack_name}",
+            }
+            self.events.message(f"  ✓ semgrep-rules/{pack_name} ({selected_count}/{total_count} rules)")
+
+        return packs
+
+    def _render_rule_pack(self, language: str, source: Path,
+                          enabled_ids: Optional[List[str]]) -> Tuple[str, int, int, List[str]]:
+        """
+        Render a rule pack with only the enabled rules.
+
+        Args:
+            language: Rule language (python / typescript)
+            source: IPA rule file
+            enabled_ids: Enabled rule IDs, or None to keep every rule
+
+        Returns:
+            Tuple of (YAML content, selected rule count, total rule count, unknown rule IDs)
+        """
+        all_rules: List[Dict] = (self._load_yaml(source) or {}).get('rules', [])
+        if enabled_ids is None:
+            selected = all_rules
+            unknown: List[str] = []
+        else:
+            wanted = set(enabled_ids)
+            selected = [rule for rule in all_rules if rule.get('id') in wanted]
+            unknown = sorted(wanted - {rule.get('id') for rule in all_rules})
+
+        header = (f"# Generated from ipa-{language}.yaml and .security-config.yaml"
+                  f" ({self.template_name}). Do not edit.\n")
+        body = yaml.dump({'rules': selected}, Dumper=_RuleDumper,
+                         allow_unicode=True, sort_keys=False, width=1000)
+        return header + body, len(selected), len(all_rules), unknown
 
-    def _update_bandit_config(self, bandit_config: Dict):
-        """Update .bandit configuration with template-specific settings."""
-        bandit_file = self.output_dir / ".bandit"
-        if not bandit_file.exists():
-            return
+    def _rules_source(self, language: str) -> Path:
+        """Path of the IPA rule file in .security-template/."""
+        return self.security_template_dir / "scripts" / "security" / "semgrep-rules" / f"ipa-{language}.yaml"
 
-        # Add template-specific exclude dirs if specified
-        exclude_dirs = bandit_config.get('exclude_dirs', [])
+    def _scan_targets(self, semgrep_config: Dict) -> Dict[str, List[str]]:
+        """
+        Collect the declared scan roots for each language.
+
+        Bandit scans the Python roots; languages without ``target_paths``
+        keep scanning the whole project.
+
+        Args:
+            semgrep_config: ``security.semgrep`` section of .security-config.yaml
+
+        Returns:
+            ``targets`` section of scan-config.json
+        """
+        targets: Dict[str, List[str]] = {}
+        for language in SEMGREP_LANGUAGES:
+            paths = (semgrep_config.get(language) or {}).get('target_paths')
+            if paths:
+                targets[language] = [path.rstrip('/') or '.' for path in paths]
+                self.events.message(f"  ✓ {language} scan roots: {', '.join(targets[language])}")
+        return targets
+
+    def _write_scan_config(self, scan_config: Dict):
+        """Write scripts/security/scan-config.json for the security scripts."""
+        security_dir = self.output_dir / "scripts" / "security"
+        self._write_file(security_dir / "scan-config.json",
+                         json.dumps(scan_config, ensure_ascii=False, indent=2) + "\n")
+
+    def _write_semgrepignore(self, exclude_dirs: List[str]):
+        """
+        Generate .semgrepignore from the default excludes and Bandit exclude_dirs.
+
+        Args:
+            exclude_dirs: ``security.bandit.exclude_dirs`` from .security-config.yaml
+        """
+        lines = [
+            f"# Generated from .security-config.yaml ({self.template_name})",
+            *DEFAULT_SCAN_EXCLUDES,
+        ]
         if exclude_dirs:
-            print(f"  ✓ Added {len(exclude_dirs)} exclusions to .bandit")
+            lines += ["", "# security.bandit.exclude_dirs"]
+            lines += [f"{path.rstrip('/')}/" for path in exclude_dirs]
+
+        self._write_file(self.output_dir / ".semgrepignore", "\n".join(lines) + "\n")
+        self.events.message("  ✓ .semgrepignore")
 
     def _add_security_docs(self, config: Dict):
         """Add security documentation reference to project."""
-        # Create docs/security/ if it doesn't exist
         security_docs_dir = self.output_dir / "docs" / "security"
-        security_docs_dir.mkdir(parents=True, exist_ok=True)
 
         # Create a pointer to security documentation
-        readme_content = f"""# セキュリティ
+        readme_content = """# セキュリティ
 
 このプロジェクトには IPA「安全なウェブサイトの作り方」準拠のセキュリティチェックが統合されています。
 
@@ -173,7 +413,6 @@ class SecurityIntegrator:
 """
 
         security_readme = security_docs_dir / "README.md"
-        with open(security_readme, 'w', encoding='utf-8') as f:
-            f.write(readme_content)
+        self._write_file(security_readme, readme_content)
 
-        print(f"  ✓ Created docs/security/README.md")
+        self.events.message("  ✓ Created docs/security/README.md")
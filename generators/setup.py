@@ -6,32 +6,71 @@ Generates a new project from template by replacing variables with configured val
 
 Usage:
     python setup.py --config path/to/template-config.yaml --output ../my-new-project
+
+Library usage:
+    from setup import generate_project
+    generate_project({"PROJECT_NAME": "my-app", ...}, "../my-app")
 """
 
 import argparse
+import subprocess
 import sys
+import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+from conditions import excluded_paths, load_conditions
 from config_loader import ConfigLoader
+from events import ConsoleListener, EventEmitter, JsonlListener
+from generation_cache import DEFAULT_MAX_BYTES, GenerationCache, generation_key, signature_key
+from checksums import MANIFEST_FILE, write_manifest
+from git_output import GitFastImportWriter
+from journal import GenerationJournal
+from memory_profile import MemoryProfiler
+from metrics import PrometheusListener
+from output_validator import TOML_SUPPORTED, validate_structure
+from output_writer import OutputWriter
+from template_cache import CompiledTemplate, TemplateCache
 from template_processor import TemplateProcessor
 from validators import ConfigValidator
 from security_integrator import SecurityIntegrator
+from watcher import DEFAULT_INTERVAL, GenerationWatcher
+
+
+def _git_error(error: Exception) -> str:
+    """Message for a failed git command, preferring git's own stderr."""
+    if isinstance(error, subprocess.CalledProcessError) and error.stderr:
+        return error.stderr.strip()
+    return str(error)
 
 
 class ProjectGenerator:
     """Generates new project from template."""
 
-    def __init__(self, config_path: str, template_name: str = "nextjs-fastapi"):
+    def __init__(self, config_path: Optional[str] = None, template_name: str = "nextjs-fastapi",
+                 variables: Optional[Dict[str, str]] = None, cache: Optional[TemplateCache] = None,
+                 events: Optional[EventEmitter] = None, generation_cache: Optional[GenerationCache] = None):
         """
         Initialize ProjectGenerator.
 
         Args:
-            config_path: Path to template-config.yaml
+            config_path: Path to template-config.yaml (not needed when variables are given)
             template_name: Name of template to use (default: nextjs-fastapi)
+            variables: Template variables to use directly instead of loading config_path
+            cache: Cache of compiled templates and parsed security configs (optional)
+            events: Receives progress messages, per-file and per-phase events
+                (default: print messages to stdout)
+            generation_cache: On-disk cache of complete generated projects (optional)
         """
-        self.config_path = Path(config_path)
+        if config_path is None and variables is None:
+            raise ValueError("Either config_path or variables is required")
+
+        self.config_path = Path(config_path) if config_path is not None else None
         self.template_name = template_name
+        self.variables = variables
+        self.cache = cache
+        self.events = events or EventEmitter.console()
+        self.generation_cache = generation_cache
 
         # Determine paths
         self.script_dir = Path(__file__).parent
@@ -43,7 +82,9 @@ class ProjectGenerator:
         self.processor: Optional[TemplateProcessor] = None
         self.validator: Optional[ConfigValidator] = None
 
-    def generate(self, output_dir: str, validate: bool = True, force: bool = False) -> bool:
+    def generate(self, output_dir: str, validate: bool = True, force: bool = False,
+                 check_structure: bool = True, sync: bool = False, resume: bool = False,
+                 checksums: bool = False, git: bool = False, checkout: bool = False) -> bool:
         """
         Generate project from template.
 
@@ -51,137 +92,339 @@ class ProjectGenerator:
             output_dir: Path to output directory
             validate: Whether to validate configuration (default: True)
             force: Whether to overwrite existing output directory (default: False)
+            check_structure: Whether to parse generated YAML/JSON/TOML files (default: True)
+            sync: Regenerate into an existing directory, writing only files whose
+                content changed and reporting orphaned files (default: False)
+            resume: Continue an interrupted generation, skipping files its
+                journal records as written and still intact (default: False)
+            checksums: Write a SHA256SUMS manifest, hashed while files are written (default: False)
+            git: Treat output_dir as a git repository and commit the files through
+                git fast-import instead of writing them (default: False)
+            checkout: With git, also check out the commit into the working tree (default: False)
 
         Returns:
             True if generation successful, False otherwise
         """
         output_path = Path(output_dir)
+        say = self.events.message
 
         # Check if template exists
         if not self.template_dir.exists():
-            print(f"❌ Template not found: {self.template_dir}")
-            print(f"\nAvailable templates:")
+            lines = [f"❌ Template not found: {self.template_dir}", "\nAvailable templates:"]
             templates_dir = self.repo_root / "templates"
             if templates_dir.exists():
                 for tmpl in templates_dir.iterdir():
                     if tmpl.is_dir():
-                        print(f"  - {tmpl.name}")
+                        lines.append(f"  - {tmpl.name}")
+            say("\n".join(lines), level="error")
             return False
 
         # Check if output directory exists
-        if output_path.exists() and not force:
-            print(f"❌ Output directory already exists: {output_path}")
-            print("Use --force to overwrite")
+        if output_path.exists() and not (force or sync or resume):
+            say(f"❌ Output directory already exists: {output_path}\nUse --force to overwrite or --sync to update",
+                level="error")
             return False
 
-        print(f"📋 Loading configuration from: {self.config_path}")
-
         # Load configuration
-        try:
-            self.loader = ConfigLoader(str(self.config_path))
-            self.loader.load()
-            variables = self.loader.get_variables()
-        except Exception as e:
-            print(f"❌ Failed to load configuration: {e}")
-            return False
-
-        print(f"✓ Loaded {len(variables)} variables")
+        with self.events.phase("config") as phase:
+            if self.variables is not None:
+                variables = dict(self.variables)
+                say(f"📋 Using {len(variables)} variables")
+            else:
+                say(f"📋 Loading configuration from: {self.config_path}")
+                try:
+                    self.loader = ConfigLoader(str(self.config_path))
+                    self.loader.load()
+                    variables = self.loader.get_variables()
+                except Exception as e:
+                    say(f"❌ Failed to load configuration: {e}", level="error")
+                    phase["ok"] = False
+                    return False
+
+                say(f"✓ Loaded {len(variables)} variables")
+            phase["variables"] = len(variables)
+
+        # Identifies the inputs for the generation cache (content hash) and the resume journal
+        # (mtime/size signatures); only the cache pays for reading every source byte
+        key_sources = [self.template_dir, self.repo_root / ".security-template", self.script_dir]
+        key_options = {"template": self.template_name, "validate": validate,
+                       "check_structure": check_structure, "checksums": checksums}
+        use_generation_cache = self.generation_cache is not None and not (sync or resume or git)
+        key = generation_key(key_sources, variables, key_options) if use_generation_cache else None
+
+        # Restore an identical earlier generation
+        store_in_cache = False
+        if use_generation_cache:
+            with self.events.phase("cache") as phase:
+                store_in_cache = not output_path.exists()
+                restored = self.generation_cache.restore(key, output_path)
+                phase.update(hit=restored is not None, key=key[:12])
+            if restored is not None:
+                say(f"♻️  Restored {restored} files from generation cache ({key[:12]})")
+                self._print_next_steps(output_path)
+                return True
 
         # Validate configuration
         if validate:
-            print(f"\n🔍 Validating configuration...")
-            self.validator = ConfigValidator(variables)
-            is_valid, errors, warnings = self.validator.validate_all()
-
-            if warnings:
-                print(f"\n⚠️  Warnings:")
-                for warning in warnings:
-                    print(f"  - {warning}")
-
-            if errors:
-                print(f"\n❌ Validation errors:")
-                for error in errors:
-                    print(f"  - {error}")
-                print("\nFix these errors and try again, or use --no-validate to skip validation")
-                return False
+            with self.events.phase("validate") as phase:
+                say("\n🔍 Validating configuration...")
+                self.validator = ConfigValidator(variables)
+                is_valid, errors, warnings = self.validator.validate_all()
+                phase.update(errors=len(errors), warnings=len(warnings))
+
+                if warnings:
+                    say("\n⚠️  Warnings:\n" + "\n".join(f"  - {warning}" for warning in warnings), level="warning")
+
+                if errors:
+                    say("\n❌ Validation errors:\n" + "\n".join(f"  - {error}" for error in errors) +
+                        "\n\nFix these errors and try again, or use --no-validate to skip validation",
+                        level="error")
+                    phase["ok"] = False
+                    return False
 
-            print(f"✓ Configuration is valid")
+                say("✓ Configuration is valid")
 
         # Display configuration summary
         self._print_summary(variables)
 
         # Process template
-        print(f"\n🔨 Processing template: {self.template_name}")
-        print(f"   Source: {self.template_dir}")
-        print(f"   Output: {output_path}")
-
-        try:
-            self.processor = TemplateProcessor(
-                str(self.template_dir),
-                str(output_path),
-                variables
-            )
-            result = self.processor.process_all()
+        say(f"\n🔨 Processing template: {self.template_name}\n"
+            f"   Source: {self.template_dir}\n"
+            f"   Output: {output_path}")
+
+        if git:
+            # Files go into git objects only; an aborted stream leaves no commit, so no journal
+            journal = None
+            writer = GitFastImportWriter(output_path, check_structure=check_structure)
+            try:
+                writer.start()
+            except (OSError, subprocess.CalledProcessError) as e:
+                say(f"❌ Failed to start git fast-import: {_git_error(e)}", level="error")
+                return False
+        else:
+            # Write-ahead journal of completed files, removed once all files are written
+            journal = GenerationJournal(output_path, signature_key(key_sources, variables, key_options))
+            resumable = journal.open(resume=resume)
+            if resume:
+                say(f"\n⏯️  Resuming: {resumable} files recorded by the interrupted generation"
+                    if resumable else "\n⏯️  No journal of an interrupted generation found; generating all files")
+            writer = OutputWriter(output_path, sync=sync, journal=journal, checksums=checksums)
+        with self.events.phase("render") as phase:
+            try:
+                # Decided before the walk so excluded subtrees are never read
+                excluded = excluded_paths(load_conditions(self.template_dir, self.cache), variables)
+                if excluded:
+                    say(f"   Excluded by template conditions: {', '.join(sorted(excluded))}")
+                self.processor = TemplateProcessor(
+                    str(self.template_dir),
+                    str(output_path),
+                    variables,
+                    compiled=(self.cache.template(self.template_dir, excluded_paths=excluded) if self.cache
+                              else CompiledTemplate(self.template_dir, excluded_paths=excluded)),
+                    events=self.events,
+                    writer=writer
+                )
+                result = self.processor.process_all(compact=True)
+                phase.update(processed=result['processed'], skipped=result['skipped'], bytes=result['bytes'],
+                             excluded=len(excluded))
+
+                say(f"\n✓ Processed {result['processed']} files")
+                if result['skipped']:
+                    say(f"  Skipped {result['skipped']} files")
+
+            except Exception as e:
+                say(f"\n❌ Failed to process template: {e}\n{traceback.format_exc().rstrip()}", level="error")
+                if git:
+                    writer.abort()
+                else:
+                    journal.close(completed=False)
+                phase["ok"] = False
+                return False
 
-            print(f"\n✓ Processed {len(result['processed'])} files")
-            if result['skipped']:
-                print(f"  Skipped {len(result['skipped'])} files")
+        # Validate output
+        with self.events.phase("check_output") as phase:
+            say("\n🔍 Validating output...")
+            unreplaced = self.processor.validate_output()
+            phase["unreplaced_files"] = len(unreplaced)
+
+            if unreplaced:
+                lines = ["\n⚠️  Found unreplaced variables:"]
+                for file_path, vars_list in unreplaced.items():
+                    rel_path = Path(file_path).relative_to(output_path)
+                    lines.append(f"  {rel_path}: {', '.join(vars_list)}")
+                lines.append("\nThese variables may need manual replacement")
+                say("\n".join(lines), level="warning")
+            else:
+                say("✓ All variables replaced successfully")
 
-        except Exception as e:
-            print(f"\n❌ Failed to process template: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+        # Integrate security template
+        with self.events.phase("security") as phase:
+            security_integrator = SecurityIntegrator(
+                self.repo_root,
+                self.template_name,
+                output_path,
+                cache=self.cache,
+                events=self.events,
+                writer=writer
+            )
+            phase["ok"] = security_integrator.integrate()
 
-        # Validate output
-        print(f"\n🔍 Validating output...")
-        unreplaced = self.processor.validate_output()
-
-        if unreplaced:
-            print(f"\n⚠️  Found unreplaced variables:")
-            for file_path, vars_list in unreplaced.items():
-                rel_path = Path(file_path).relative_to(output_path)
-                print(f"  {rel_path}: {', '.join(vars_list)}")
-            print("\nThese variables may need manual replacement")
+        if git:
+            # Checked before committing, so a failed generation leaves the branch untouched
+            if check_structure and not self._check_structure(output_path, writer):
+                writer.abort()
+                return False
+
+            with self.events.phase("git_commit") as phase:
+                try:
+                    commit = writer.commit(f"Initial commit from template {self.template_name}")
+                    if checkout:
+                        writer.checkout()
+                except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+                    writer.abort()
+                    say(f"❌ Failed to create git commit: {_git_error(e)}", level="error")
+                    phase["ok"] = False
+                    return False
+                phase.update(files=writer.counts["created"], commit=commit)
+                say(f"✓ Committed {writer.counts['created']} files ({commit[:12]})"
+                    + ("" if checkout else " without a working tree; check out with: git checkout -f"))
         else:
-            print(f"✓ All variables replaced successfully")
+            journal.close(completed=True)
+            # Later writes (--watch) are not part of an interruptible generation
+            writer.journal = None
+
+        if checksums:
+            write_manifest(output_path, writer.digests)
+            say(f"✓ Wrote {MANIFEST_FILE} ({len(writer.digests)} files)")
+
+        # Report what the sync changed
+        if sync:
+            with self.events.phase("sync") as phase:
+                stats = writer.stats()
+                orphans = writer.orphans()
+                phase.update(stats, orphaned=len(orphans))
+
+                say(f"\n🔄 Sync: {stats['created']} created, {stats['updated']} updated, "
+                    f"{stats['unchanged']} unchanged, {stats['resumed']} resumed, {len(orphans)} orphaned")
+                if orphans:
+                    say("  Not generated by this template (kept):\n" +
+                        "\n".join(f"  - {path}" for path in orphans))
+
+        # Parse structured outputs (a variable value can break YAML/JSON/TOML syntax)
+        if check_structure and not git and not self._check_structure(output_path, writer):
+            return False
 
-        # Integrate security template
-        security_integrator = SecurityIntegrator(
-            self.repo_root,
-            self.template_name,
-            output_path
-        )
-        security_integrator.integrate()
-
-        # Success message
-        print(f"\n{'=' * 60}")
-        print(f"🎉 Project generated successfully!")
-        print(f"{'=' * 60}")
-        print(f"\nNext steps:")
-        print(f"1. cd {output_path}")
-        print(f"2. Review and customize CLAUDE.md and other files")
-        print(f"3. Initialize git repository: git init")
-        print(f"4. Set up development environment")
-        print(f"\nFor setup instructions, see:")
-        print(f"  {output_path / 'README.md'}")
+        if store_in_cache:
+            with self.events.phase("cache_store") as phase:
+                phase["bytes"] = self.generation_cache.store(key, output_path)
 
+        self._print_next_steps(output_path, committed=git)
         return True
 
+    def _check_structure(self, output_path: Path, writer: OutputWriter) -> bool:
+        """
+        Parse the generated YAML/JSON/TOML files and report syntax errors.
+
+        Args:
+            output_path: Output directory
+            writer: Writer of the generation; a GitFastImportWriter has parsed
+                the files while streaming them
+
+        Returns:
+            True if every structured file parses
+        """
+        say = self.events.message
+        with self.events.phase("check_structure") as phase:
+            say("\n🔍 Checking YAML/JSON/TOML files...")
+            if not TOML_SUPPORTED:
+                say("⚠️  TOML files are not checked (requires Python 3.11+ or the tomli package)", level="warning")
+            if isinstance(writer, GitFastImportWriter):
+                # Parsed while streaming; there are no files to read
+                checked, structure_errors = writer.structured_files, sorted(writer.structure_errors)
+            else:
+                checked, structure_errors = validate_structure(output_path)
+            phase.update(files=checked, errors=len(structure_errors))
+
+            if structure_errors:
+                say("\n❌ Generated files do not parse:\n" +
+                    "\n".join(f"  {error}" for error in structure_errors) +
+                    "\n\nCheck the variable values used in these files (quotes, colons, newlines)",
+                    level="error")
+                phase["ok"] = False
+                return False
+
+            say(f"✓ {checked} structured files parsed successfully")
+            return True
+
+    def _print_next_steps(self, output_path: Path, committed: bool = False):
+        """Print the success message."""
+        git_step = ("Add a remote and push: git remote add origin <url> && git push -u origin HEAD"
+                    if committed else "Initialize git repository: git init")
+        self.events.message(
+            f"\n{'=' * 60}\n"
+            f"🎉 Project generated successfully!\n"
+            f"{'=' * 60}\n"
+            f"\nNext steps:\n"
+            f"1. cd {output_path}\n"
+            f"2. Review and customize CLAUDE.md and other files\n"
+            f"3. {git_step}\n"
+            f"4. Set up development environment\n"
+            f"\nFor setup instructions, see:\n"
+            f"  {output_path / 'README.md'}"
+        )
+
     def _print_summary(self, variables: dict):
         """Print configuration summary."""
-        print(f"\n{'=' * 60}")
-        print(f"Project Configuration Summary")
-        print(f"{'=' * 60}")
-        print(f"Project Name:     {variables.get('PROJECT_NAME', 'N/A')}")
-        print(f"Description:      {variables.get('PROJECT_DESCRIPTION', 'N/A')}")
-        print(f"Database:         {variables.get('DATABASE_TYPE', 'N/A')} {variables.get('DATABASE_VERSION', '')}")
-        print(f"Infrastructure:   {variables.get('INFRASTRUCTURE_PLATFORM', 'N/A')}")
-        print(f"Organization:     {variables.get('ORGANIZATION_NAME', 'N/A')}")
-        print(f"Tech Lead:        {variables.get('TECH_LEAD_NAME', 'N/A')}")
-        print(f"PM:               {variables.get('PM_NAME', 'N/A')}")
-        print(f"Coverage Target:  {variables.get('TEST_COVERAGE_TARGET', 'N/A')}%")
-        print(f"{'=' * 60}")
+        self.events.message(
+            f"\n{'=' * 60}\n"
+            f"Project Configuration Summary\n"
+            f"{'=' * 60}\n"
+            f"Project Name:     {variables.get('PROJECT_NAME', 'N/A')}\n"
+            f"Description:      {variables.get('PROJECT_DESCRIPTION', 'N/A')}\n"
+            f"Database:         {variables.get('DATABASE_TYPE', 'N/A')} {variables.get('DATABASE_VERSION', '')}\n"
+            f"Infrastructure:   {variables.get('INFRASTRUCTURE_PLATFORM', 'N/A')}\n"
+            f"Organization:     {variables.get('ORGANIZATION_NAME', 'N/A')}\n"
+            f"Tech Lead:        {variables.get('TECH_LEAD_NAME', 'N/A')}\n"
+            f"PM:               {variables.get('PM_NAME', 'N/A')}\n"
+            f"Coverage Target:  {variables.get('TEST_COVERAGE_TARGET', 'N/A')}%\n"
+            f"{'=' * 60}"
+        )
+
+
+def generate_project(variables: Dict[str, str], output_dir: str, template_name: str = "nextjs-fastapi",
+                     validate: bool = True, force: bool = False,
+                     cache: Optional[TemplateCache] = None,
+                     events: Optional[EventEmitter] = None, check_structure: bool = True,
+                     sync: bool = False, generation_cache: Optional[GenerationCache] = None,
+                     resume: bool = False, checksums: bool = False, git: bool = False,
+                     checkout: bool = False) -> bool:
+    """
+    Generate a project from a variables dict without writing a config file.
+
+    Args:
+        variables: Template variables (same keys as ConfigLoader.get_variables())
+        output_dir: Path to output directory
+        template_name: Name of template to use (default: nextjs-fastapi)
+        validate: Whether to validate configuration (default: True)
+        force: Whether to overwrite existing output directory (default: False)
+        cache: Cache to reuse compiled templates across calls (optional)
+        events: Receives generation events (default: print messages to stdout)
+        check_structure: Whether to parse generated YAML/JSON/TOML files (default: True)
+        sync: Write only changed files into an existing output directory (default: False)
+        generation_cache: On-disk cache restoring identical generations (optional)
+        resume: Continue an interrupted generation into output_dir (default: False)
+        checksums: Write a SHA256SUMS manifest of the output (default: False)
+        git: Commit the files into a git repository at output_dir via git fast-import (default: False)
+        checkout: With git, also check out the commit (default: False)
+
+    Returns:
+        True if generation successful, False otherwise
+    """
+    generator = ProjectGenerator(template_name=template_name, variables=variables, cache=cache, events=events,
+                                 generation_cache=generation_cache)
+    return generator.generate(output_dir, validate=validate, force=force,
+                              check_structure=check_structure, sync=sync, resume=resume,
+                              checksums=checksums, git=git, checkout=checkout)
 
 
 def main():
@@ -202,6 +445,33 @@ Examples:
 
   # Overwrite existing output directory
   python setup.py --config config.yaml --output ../my-app --force
+
+  # Update an existing project, rewriting only files whose content changed
+  python setup.py --config config.yaml --output ../my-app --sync
+
+  # Reuse identical earlier generations (e.g. ephemeral CI environments)
+  python setup.py --config config.yaml --output ../my-app --cache-dir ~/.cache/template-generator
+
+  # Record SHA-256 digests of all files (verify later with: python checksums.py verify ../my-app)
+  python setup.py --config config.yaml --output ../my-app --checksums
+
+  # Create a git repository with the generated project as its initial commit
+  python setup.py --config config.yaml --git-output ../my-app --checkout
+
+  # Per-phase peak/retained memory and top allocation sites as JSON
+  python setup.py --config config.yaml --output ../my-app --profile-memory memory.json
+
+  # Prometheus textfile-collector metrics (phase timings, files, bytes)
+  python setup.py --config config.yaml --output ../my-app --metrics-file /var/lib/node_exporter/generator.prom
+
+  # Continue a generation that was interrupted (crash, Ctrl+C)
+  python setup.py --config config.yaml --output ../my-app --resume
+
+  # Template development: regenerate, then re-render outputs as templates or the config change
+  python setup.py --config config.yaml --output ../my-app --watch
+
+  # Machine-readable progress (one JSON event per line on stdout)
+  python setup.py --config config.yaml --output ../my-app --events jsonl
         """
     )
 
@@ -211,11 +481,22 @@ Examples:
         help="Path to template-config.yaml file"
     )
 
-    parser.add_argument(
+    output_group = parser.add_mutually_exclusive_group(required=True)
+    output_group.add_argument(
         "--output",
-        required=True,
         help="Path to output directory"
     )
+    output_group.add_argument(
+        "--git-output",
+        metavar="REPO",
+        help="Commit the generated files into a new git repository via git fast-import"
+    )
+
+    parser.add_argument(
+        "--checkout",
+        action="store_true",
+        help="With --git-output, also check out the commit into the working tree"
+    )
 
     parser.add_argument(
         "--template",
@@ -235,16 +516,143 @@ Examples:
         help="Overwrite existing output directory"
     )
 
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Update an existing output directory, writing only changed files"
+    )
+
+    parser.add_argument(
+        "--checksums",
+        action="store_true",
+        help="Write a SHA256SUMS manifest of the generated files"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted generation, skipping files it already wrote"
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After generating, re-render affected outputs when templates or the config change"
+    )
+
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_INTERVAL,
+        help=f"Seconds between change checks in --watch mode (default: {DEFAULT_INTERVAL})"
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache complete generations in this directory and restore identical ones via links"
+    )
+
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help=f"Generation cache size limit in MB (default: {DEFAULT_MAX_BYTES // (1024 * 1024)})"
+    )
+
+    parser.add_argument(
+        "--no-structure-check",
+        action="store_true",
+        help="Skip parsing generated YAML/JSON/TOML files"
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Write Prometheus textfile-collector metrics (durations, files, bytes) to PATH"
+    )
+
+    parser.add_argument(
+        "--profile-memory",
+        metavar="PATH",
+        help="Trace memory use per phase (tracemalloc and RSS) and write a JSON report to PATH "
+             "(- for stdout; progress messages then go to stderr)"
+    )
+
+    parser.add_argument(
+        "--quiet", "-q",
+        action="store_true",
+        help="Only print errors (to stderr)"
+    )
+
+    parser.add_argument(
+        "--events",
+        choices=["jsonl"],
+        help="Write generation events to stdout in this format instead of progress messages"
+    )
+
     args = parser.parse_args()
+    if args.git_output and (args.sync or args.resume or args.watch or args.checksums or args.cache_dir):
+        parser.error("--git-output cannot be combined with --sync, --resume, --watch, --checksums or --cache-dir")
+    if args.checkout and not args.git_output:
+        parser.error("--checkout requires --git-output")
+    if args.events and args.profile_memory == "-":
+        parser.error("--events and --profile-memory - both write to stdout")
+
+    if args.quiet or args.events:
+        # Keep stdout for events; errors still reach the terminal
+        listeners = [ConsoleListener(sys.stderr, min_level="error")]
+    elif args.profile_memory == "-":
+        # Keep stdout for the JSON report
+        listeners = [ConsoleListener(sys.stderr)]
+    else:
+        listeners = [ConsoleListener()]
+    if args.events == "jsonl":
+        listeners.append(JsonlListener(sys.stdout))
+    metrics = None
+    if args.metrics_file:
+        metrics = PrometheusListener(args.template)
+        listeners.append(metrics)
+    profiler = None
+    if args.profile_memory:
+        profiler = MemoryProfiler()
+        listeners.append(profiler)
+        profiler.start()
 
     # Generate project
-    generator = ProjectGenerator(args.config, args.template)
+    generation_cache = None
+    if args.cache_dir:
+        generation_cache = GenerationCache(Path(args.cache_dir).expanduser(), args.cache_max_size * 1024 * 1024)
+
+    generator = ProjectGenerator(args.config, args.template, events=EventEmitter(listeners),
+                                 generation_cache=generation_cache)
     success = generator.generate(
-        args.output,
+        args.git_output or args.output,
         validate=not args.no_validate,
-        force=args.force
+        force=args.force,
+        check_structure=not args.no_structure_check,
+        # Watch mode updates its own output in place
+        sync=args.sync or args.watch,
+        resume=args.resume,
+        checksums=args.checksums,
+        git=bool(args.git_output),
+        checkout=args.checkout
     )
 
+    if metrics is not None:
+        metrics.write(Path(args.metrics_file), success)
+
+    if profiler is not None:
+        profiler.stop()
+        if args.profile_memory == "-":
+            profiler.write(sys.stdout)
+        else:
+            with open(args.profile_memory, "w", encoding="utf-8") as f:
+                profiler.write(f)
+        generator.events.message(f"\n📊 Memory by phase (report: {args.profile_memory}):\n{profiler.summary()}")
+
+    if success and args.watch:
+        GenerationWatcher(generator, validate=not args.no_validate, interval=args.watch_interval).run()
+
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,377 @@
+"""
+Template Cache
+
+Compiles template trees into in-memory render plans and caches parsed YAML
+files, so repeated generations skip the directory walk, file reads and
+variable parsing. Cached entries are invalidated by file mtime and size.
+
+A one-shot CompiledTemplate keeps only file signatures and placeholder
+names, and reads each file when it is rendered; only templates held by
+TemplateCache keep the parsed file contents.
+"""
+
+import os
+import re
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+# {{VARIABLE_NAME}} placeholders; split() yields literal/name/literal/... parts
+PLACEHOLDER_PATTERN = re.compile(r'\{\{([A-Za-z0-9_]+)\}\}')
+UNREPLACED_PATTERN = re.compile(r'\{\{([A-Z_]+)\}\}')
+
+DEFAULT_EXCLUDE_PATTERNS = [
+    '*.pyc',
+    '__pycache__',
+    '.DS_Store',
+    '*.egg-info',
+    '.git',
+    'node_modules',
+    'venv',
+    '.venv',
+    'dist',
+    'build'
+]
+
+TEXT_EXTENSIONS = {
+    '.md', '.txt', '.json', '.yaml', '.yml', '.toml',
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.css', '.scss',
+    '.html', '.xml', '.svg', '.sh', '.bash',
+    '.gitignore', '.env', '.example', '.template',
+    '.mdc'  # Cursor rules files
+}
+
+Signature = Tuple[int, int]
+
+
+def file_signature(path: Path) -> Signature:
+    """Return (mtime_ns, size) used to detect file changes."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def should_exclude(path: Path, exclude_patterns: List[str]) -> bool:
+    """Check if path matches any exclude pattern."""
+    for pattern in exclude_patterns:
+        if path.match(pattern) or any(part.startswith('.') and part != '.github' and part != '.vscode' and part != '.cursor' for part in path.parts):
+            return True
+    return False
+
+
+def is_text_file(path: Path) -> bool:
+    """
+    Determine if file is text (should be processed) or binary (should be copied).
+
+    Args:
+        path: File path to check
+
+    Returns:
+        True if text file, False if binary
+    """
+    # Check by extension
+    if path.suffix in TEXT_EXTENSIONS:
+        return True
+
+    # Check files without extension (like .gitignore, Dockerfile)
+    if path.suffix == '' and path.name in ['.gitignore', 'Dockerfile', 'LICENSE', 'README', 'Makefile']:
+        return True
+
+    # Try to read as text
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            f.read(1024)  # Read first 1KB
+        return True
+    except (UnicodeDecodeError, PermissionError):
+        return False
+
+
+def find_unreplaced(content: str) -> Set[str]:
+    """Find {{VARIABLE}} placeholders left in rendered content."""
+    return set(UNREPLACED_PATTERN.findall(content))
+
+
+class TemplateFile:
+    """A single template file, optionally with its placeholders pre-parsed."""
+
+    def __init__(self, source_path: Path, rel_path: Path, keep_parts: bool = False):
+        """
+        Initialize TemplateFile.
+
+        Args:
+            source_path: Source file path
+            rel_path: Relative path from template root
+            keep_parts: Keep the parsed content in memory between renders
+                (long-lived caches); otherwise the file is read on each render
+        """
+        self.source_path = source_path
+        self.rel_path = rel_path
+        self.keep_parts = keep_parts
+        # Remove .template extension if present
+        self.output_rel_path = rel_path.with_suffix('') if source_path.suffix == '.template' else rel_path
+        # Interned so per-generation result records share one string per file
+        self.output_name = sys.intern(self.output_rel_path.as_posix())
+        self.signature: Signature = (0, 0)
+        self.executable = False
+        self.is_text = False
+        self.parts: List[str] = []
+        self._placeholders: Optional[FrozenSet[str]] = None
+        self.load()
+
+    def load(self):
+        """(Re)read the source file's metadata, and its parts when they are kept."""
+        stat = self.source_path.stat()
+        self.signature = stat.st_mtime_ns, stat.st_size
+        self.executable = bool(stat.st_mode & 0o111)
+        self.parts = []
+        self._placeholders = None
+        self.is_text = is_text_file(self.source_path)
+        if self.is_text and self.keep_parts:
+            self.parts = self._read_parts() or []
+
+    def _read_parts(self) -> Optional[List[str]]:
+        """
+        Read the source file and split it into literal and placeholder parts.
+
+        Returns:
+            Parts, or None if the file is not UTF-8 text (is_text is cleared)
+        """
+        try:
+            with open(self.source_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except (UnicodeDecodeError, OSError):
+            # Fall back to a binary copy, as the processor did for unreadable text
+            self.is_text = False
+            return None
+        parts = PLACEHOLDER_PATTERN.split(content)
+        # Variable names used by this file (odd parts), to find files affected by a config change
+        self._placeholders = frozenset(parts[1::2])
+        return parts
+
+    @property
+    def placeholders(self) -> FrozenSet[str]:
+        """Variable names used by the file (read from disk if it was not rendered yet)."""
+        if self._placeholders is None:
+            if self.is_text:
+                self._read_parts()
+            if self._placeholders is None:
+                self._placeholders = frozenset()
+        return self._placeholders
+
+    def render(self, variables: Dict[str, str]) -> Optional[str]:
+        """
+        Render the file in a single pass.
+
+        Args:
+            variables: Dictionary mapping variable names to values
+
+        Returns:
+            Content with known variables replaced and unknown placeholders
+            kept, or None if the file turned out not to be text (copy it instead)
+        """
+        rendered = self.parts[:] if self.keep_parts else self._read_parts()
+        if rendered is None:
+            return None
+        for index in range(1, len(rendered), 2):
+            name = rendered[index]
+            rendered[index] = str(variables[name]) if name in variables else '{{' + name + '}}'
+        return ''.join(rendered)
+
+
+class CompiledTemplate:
+    """Template tree compiled into a list of renderable files."""
+
+    def __init__(self, template_dir: Path, exclude_patterns: Optional[List[str]] = None,
+                 excluded_paths: Optional[FrozenSet[str]] = None, keep_parts: bool = False):
+        """
+        Initialize CompiledTemplate.
+
+        Args:
+            template_dir: Path to template directory
+            exclude_patterns: List of glob patterns to exclude
+            excluded_paths: Template-relative files and directories left out
+                entirely (see conditions.excluded_paths); not reported as skipped
+            keep_parts: Keep file contents and skipped paths in memory
+                (long-lived caches); otherwise memory does not grow with
+                template size and files are read as they are rendered
+        """
+        self.template_dir = Path(template_dir)
+        self.exclude_patterns = list(exclude_patterns or DEFAULT_EXCLUDE_PATTERNS)
+        self.excluded_paths = frozenset(excluded_paths or ())
+        self.keep_parts = keep_parts
+        self.files: List[TemplateFile] = []
+        self.skipped: List[Path] = []
+        self._dir_signatures: Dict[Path, int] = {}
+        self._scan()
+
+    def _scan(self) -> List[TemplateFile]:
+        """
+        Walk the template tree, reusing entries whose files did not change.
+
+        Returns:
+            Entries that were added or recompiled
+        """
+        previous = {entry.source_path: entry for entry in self.files}
+        compiled: List[TemplateFile] = []
+        files: List[TemplateFile] = []
+        skipped: List[Path] = []
+        dir_signatures: Dict[Path, int] = {}
+
+        for directory, rel_dir, names in self._walk():
+            dir_signatures[directory] = directory.stat().st_mtime_ns
+            for name in names:
+                source_path = directory / name
+                if should_exclude(source_path, self.exclude_patterns):
+                    if self.keep_parts:
+                        skipped.append(source_path)
+                    continue
+
+                entry = previous.get(source_path)
+                if entry is None or entry.signature != file_signature(source_path):
+                    entry = TemplateFile(source_path, rel_dir / name, keep_parts=self.keep_parts)
+                    compiled.append(entry)
+                files.append(entry)
+
+        files.sort(key=lambda entry: entry.source_path)
+        skipped.sort()
+        # Swapped in whole, so a generation iterating the old list is not affected
+        self.files, self.skipped, self._dir_signatures = files, skipped, dir_signatures
+        return compiled
+
+    def _walk(self) -> Iterator[Tuple[Path, Path, List[str]]]:
+        """Yield (directory, relative directory, file names) not excluded by conditions."""
+        for root, dirs, names in os.walk(self.template_dir):
+            directory = Path(root)
+            rel_dir = directory.relative_to(self.template_dir)
+            # Excluded subtrees are pruned here, before they are listed or stat'ed
+            dirs[:] = [name for name in dirs if (rel_dir / name).as_posix() not in self.excluded_paths]
+            yield directory, rel_dir, [name for name in names if (rel_dir / name).as_posix() not in self.excluded_paths]
+
+    def iter_skipped(self) -> Iterator[Path]:
+        """
+        Files left out by the exclude patterns, in path order.
+
+        Without keep_parts they are not held in memory but listed again from
+        the template directory (names only; nothing is read or stat'ed).
+        """
+        if self.keep_parts:
+            yield from self.skipped
+            return
+        skipped = []
+        for directory, _, names in self._walk():
+            skipped.extend(directory / name for name in names
+                           if should_exclude(directory / name, self.exclude_patterns))
+        yield from sorted(skipped)
+
+    def refresh(self) -> List[TemplateFile]:
+        """
+        Revalidate the compiled tree against the file system.
+
+        Added or removed files are detected from directory mtimes; edited
+        files are re-read individually. Entries are replaced rather than
+        reloaded in place, so generations still rendering the previous
+        entries are not affected.
+
+        Returns:
+            Entries that were added or recompiled (empty if nothing changed)
+        """
+        for directory, mtime_ns in self._dir_signatures.items():
+            try:
+                current = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                current = None
+            if current != mtime_ns:
+                return self._scan()
+
+        changed = []
+        files = []
+        for entry in self.files:
+            if file_signature(entry.source_path) != entry.signature:
+                entry = TemplateFile(entry.source_path, entry.rel_path, keep_parts=self.keep_parts)
+                changed.append(entry)
+            files.append(entry)
+        if changed:
+            self.files = files
+        return changed
+
+
+class TemplateCache:
+    """In-memory cache of compiled templates and parsed YAML files."""
+
+    def __init__(self):
+        """Initialize TemplateCache."""
+        self._templates: Dict[Tuple[Path, Tuple[str, ...], FrozenSet[str]], CompiledTemplate] = {}
+        self._derived: Dict[Hashable, Tuple[Tuple[Signature, ...], Any]] = {}
+        self._lock = threading.Lock()
+
+    def template(self, template_dir: Path, exclude_patterns: Optional[List[str]] = None,
+                 excluded_paths: Optional[FrozenSet[str]] = None) -> CompiledTemplate:
+        """
+        Get a compiled template, recompiling changed files.
+
+        Args:
+            template_dir: Path to template directory
+            exclude_patterns: List of glob patterns to exclude
+            excluded_paths: Template-relative paths left out by conditions
+
+        Returns:
+            Up-to-date CompiledTemplate
+        """
+        key = (Path(template_dir).resolve(), tuple(exclude_patterns or DEFAULT_EXCLUDE_PATTERNS),
+               frozenset(excluded_paths or ()))
+        with self._lock:
+            compiled = self._templates.get(key)
+            if compiled is None:
+                compiled = CompiledTemplate(template_dir, exclude_patterns, excluded_paths, keep_parts=True)
+                self._templates[key] = compiled
+            else:
+                compiled.refresh()
+            return compiled
+
+    def load_yaml(self, path: Path) -> Any:
+        """
+        Load a YAML file, reusing the parsed value while the file is unchanged.
+
+        The returned value is shared between callers and must not be mutated.
+
+        Args:
+            path: YAML file path
+
+        Returns:
+            Parsed YAML value
+        """
+        path = Path(path).resolve()
+
+        def parse() -> Any:
+            with open(path, 'r', encoding='utf-8') as f:
+                return yaml.safe_load(f)
+
+        return self.derive(('yaml', path), [path], parse)
+
+    def derive(self, key: Hashable, sources: List[Path], build: Callable[[], Any]) -> Any:
+        """
+        Get a value computed from files, rebuilding it when any source changes.
+
+        Args:
+            key: Cache key identifying the computation
+            sources: Files the value depends on
+            build: Function computing the value
+
+        Returns:
+            Cached or freshly built value
+        """
+        signatures = tuple(file_signature(Path(source)) for source in sources)
+        with self._lock:
+            cached = self._derived.get(key)
+            if cached is not None and cached[0] == signatures:
+                return cached[1]
+        value = build()
+        with self._lock:
+            self._derived[key] = (signatures, value)
+        return value
+
+    def stats(self) -> Dict[str, int]:
+        """Number of cached templates and derived values (parsed YAML, rule packs)."""
+        return {'templates': len(self._templates), 'derived': len(self._derived)}
@@ -4,16 +4,38 @@ Template Processor
 Processes template files by replacing variables with configured values.
 """
 
-import re
-import shutil
+import sys
+import time
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from events import FILE_COPIED, FILE_FAILED, FILE_RENDERED, FILE_SKIPPED, FILE_STARTED, EventEmitter
+from output_writer import RESUMED, OutputWriter
+from template_cache import (
+    CompiledTemplate,
+    TemplateFile,
+    find_unreplaced,
+    is_text_file,
+    should_exclude,
+)
+
+
+class FileResult(NamedTuple):
+    """Compact record of one handled template file."""
+
+    path: str  # Output path relative to the output directory (skipped: relative to the template)
+    action: str  # 'rendered', 'copied' or 'skipped'
+    size: int  # Bytes written (0 for skipped files)
+    unreplaced: Tuple[str, ...] = ()  # Placeholders left in rendered content
+    status: str = ''  # 'created', 'updated', 'unchanged' or 'resumed' (see OutputWriter); empty for skipped
 
 
 class TemplateProcessor:
     """Processes template files and replaces variables."""
 
-    def __init__(self, template_dir: str, output_dir: str, variables: Dict[str, str]):
+    def __init__(self, template_dir: str, output_dir: str, variables: Dict[str, str],
+                 compiled: Optional[CompiledTemplate] = None, events: Optional[EventEmitter] = None,
+                 writer: Optional[OutputWriter] = None):
         """
         Initialize TemplateProcessor.
 
@@ -21,183 +43,172 @@ class TemplateProcessor:
             template_dir: Path to template directory
             output_dir: Path to output directory
             variables: Dictionary mapping variable names to values
+            compiled: Pre-compiled template (e.g. from TemplateCache); compiled on demand if omitted
+            events: Receives per-file events (optional)
+            writer: Writes output files (default: plain OutputWriter for output_dir)
         """
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
         self.variables = variables
+        self.compiled = compiled
+        self.events = events or EventEmitter()
+        self.writer = writer or OutputWriter(self.output_dir)
         self.processed_files: List[Path] = []
         self.skipped_files: List[Path] = []
+        self.unreplaced: Dict[str, List[str]] = {}
 
-    def process_all(self, exclude_patterns: List[str] = None) -> Dict[str, List[Path]]:
+    def process_all(self, exclude_patterns: List[str] = None, compact: bool = False) -> Dict[str, Any]:
         """
         Process all template files in template directory.
 
         Args:
-            exclude_patterns: List of glob patterns to exclude (e.g., ['*.pyc', '__pycache__'])
+            exclude_patterns: List of glob patterns to exclude (e.g., ['*.pyc', '__pycache__']);
+                ignored when a pre-compiled template was given
+            compact: Return counts instead of file lists (see summarize())
 
         Returns:
-            Dictionary with 'processed' and 'skipped' file lists
+            Dictionary with 'processed' and 'skipped' file lists, or the
+            summarize() counts when compact is True
         """
-        if exclude_patterns is None:
-            exclude_patterns = [
-                '*.pyc',
-                '__pycache__',
-                '.DS_Store',
-                '*.egg-info',
-                '.git',
-                'node_modules',
-                'venv',
-                '.venv',
-                'dist',
-                'build'
-            ]
-
-        # Create output directory
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-
-        # Process all files
-        for source_path in self.template_dir.rglob('*'):
-            # Skip directories
-            if source_path.is_dir():
-                continue
+        if compact:
+            return self.summarize(self.iter_process(exclude_patterns))
 
-            # Check exclude patterns
-            if self._should_exclude(source_path, exclude_patterns):
-                self.skipped_files.append(source_path)
-                continue
-
-            # Calculate relative path
-            rel_path = source_path.relative_to(self.template_dir)
-
-            # Process file
-            self._process_file(source_path, rel_path)
+        for result in self.iter_process(exclude_patterns):
+            if result.action == 'skipped':
+                self.skipped_files.append(self.compiled.template_dir / result.path)
+            else:
+                self.processed_files.append(self.output_dir / result.path)
 
         return {
             'processed': self.processed_files,
             'skipped': self.skipped_files
         }
 
-    def _should_exclude(self, path: Path, exclude_patterns: List[str]) -> bool:
-        """Check if path matches any exclude pattern."""
-        for pattern in exclude_patterns:
-            if path.match(pattern) or any(part.startswith('.') and part != '.github' and part != '.vscode' and part != '.cursor' for part in path.parts):
-                return True
-        return False
-
-    def _process_file(self, source_path: Path, rel_path: Path):
+    def iter_process(self, exclude_patterns: List[str] = None) -> Iterator[FileResult]:
         """
-        Process a single template file.
+        Process template files, yielding a record as each file is handled.
+
+        Nothing is accumulated per file (except unreplaced variables), so
+        memory use does not grow with the size of the template.
 
         Args:
-            source_path: Source file path
-            rel_path: Relative path from template root
-        """
-        # Determine output path (remove .template extension if present)
-        if source_path.suffix == '.template':
-            output_rel_path = rel_path.with_suffix('')
-        else:
-            output_rel_path = rel_path
+            exclude_patterns: List of glob patterns to exclude;
+                ignored when a pre-compiled template was given
 
-        output_path = self.output_dir / output_rel_path
+        Yields:
+            FileResult for each skipped file, then for each written file
+        """
+        if self.compiled is None:
+            self.compiled = CompiledTemplate(self.template_dir, exclude_patterns)
 
-        # Create parent directories
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        # Create output directory
+        self.output_dir.mkdir(parents=True, exist_ok=True)
 
-        # Check if file is text or binary
-        if self._is_text_file(source_path):
-            self._process_text_file(source_path, output_path)
-        else:
-            self._copy_binary_file(source_path, output_path)
+        for source_path in self.compiled.iter_skipped():
+            rel_path = sys.intern(source_path.relative_to(self.compiled.template_dir).as_posix())
+            self.events.emit(FILE_SKIPPED, path=rel_path, reason="excluded")
+            yield FileResult(rel_path, 'skipped', 0)
 
-        self.processed_files.append(output_path)
+        for entry in self.compiled.files:
+            yield self.render_file(entry)
 
-    def _is_text_file(self, path: Path) -> bool:
+    @staticmethod
+    def summarize(results: Iterator[FileResult]) -> Dict[str, Any]:
         """
-        Determine if file is text (should be processed) or binary (should be copied).
+        Reduce result records to a compact summary.
 
         Args:
-            path: File path to check
+            results: Records from iter_process()
 
         Returns:
-            True if text file, False if binary
+            Dictionary with 'processed', 'skipped' and 'bytes' counts and
+            'unreplaced' (relative path -> variable names)
         """
-        text_extensions = {
-            '.md', '.txt', '.json', '.yaml', '.yml', '.toml',
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.css', '.scss',
-            '.html', '.xml', '.svg', '.sh', '.bash',
-            '.gitignore', '.env', '.example', '.template',
-            '.mdc'  # Cursor rules files
-        }
-
-        # Check by extension
-        if path.suffix in text_extensions:
-            return True
-
-        # Check files without extension (like .gitignore, Dockerfile)
-        if path.suffix == '' and path.name in ['.gitignore', 'Dockerfile', 'LICENSE', 'README', 'Makefile']:
-            return True
+        summary: Dict[str, Any] = {'processed': 0, 'skipped': 0, 'bytes': 0, 'unreplaced': {}}
+        for result in results:
+            if result.action == 'skipped':
+                summary['skipped'] += 1
+                continue
+            summary['processed'] += 1
+            summary['bytes'] += result.size
+            if result.unreplaced:
+                summary['unreplaced'][result.path] = list(result.unreplaced)
+        return summary
 
-        # Try to read as text
-        try:
-            with open(path, 'r', encoding='utf-8') as f:
-                f.read(1024)  # Read first 1KB
-            return True
-        except (UnicodeDecodeError, PermissionError):
-            return False
+    def _should_exclude(self, path: Path, exclude_patterns: List[str]) -> bool:
+        """Check if path matches any exclude pattern."""
+        return should_exclude(path, exclude_patterns)
 
-    def _process_text_file(self, source_path: Path, output_path: Path):
+    def render_file(self, entry: TemplateFile) -> FileResult:
         """
-        Process text file by replacing variables.
+        Write a single compiled template file (also used to re-render one output).
 
         Args:
-            source_path: Source file path
-            output_path: Output file path
+            entry: Compiled template file
+
+        Returns:
+            Result record for the file
         """
-        try:
-            # Read source file
-            with open(source_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+        rel_path = entry.output_name
+        action, event = ('rendered', FILE_RENDERED) if entry.is_text else ('copied', FILE_COPIED)
 
-            # Replace variables
-            processed_content = self._replace_variables(content)
+        # Written intact before an interruption (--resume)
+        resumed_size = self.writer.resumed(rel_path)
+        if resumed_size is not None:
+            self.events.emit(event, path=rel_path, bytes=resumed_size, status=RESUMED, duration_ms=0.0)
+            return FileResult(rel_path, action, resumed_size, (), RESUMED)
 
-            # Write output file
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(processed_content)
+        output_path = self.output_dir / entry.output_rel_path
+        unreplaced: Tuple[str, ...] = ()
+        self.events.emit(FILE_STARTED, path=rel_path)
+        started = time.perf_counter()
 
-        except Exception as e:
-            print(f"Warning: Failed to process {source_path}: {e}")
-            # Fallback to binary copy
-            self._copy_binary_file(source_path, output_path)
+        try:
+            content = entry.render(self.variables) if entry.is_text else None
+            if content is not None:
+                data = content.encode('utf-8')
+                status = self.writer.write(rel_path, data, executable=entry.executable)
 
-    def _copy_binary_file(self, source_path: Path, output_path: Path):
+                # Record unreplaced variables while the content is in memory
+                unreplaced_vars = find_unreplaced(content)
+                if unreplaced_vars:
+                    unreplaced = tuple(sorted(unreplaced_vars))
+                    self.unreplaced[str(output_path)] = list(unreplaced)
+                size = len(data)
+            else:
+                # Binary, or text that turned out not to be UTF-8 when read
+                action, event = 'copied', FILE_COPIED
+                status = self.writer.copy(rel_path, entry.source_path)
+                size = entry.signature[1]
+        except OSError as e:
+            self.events.emit(FILE_FAILED, path=rel_path, error=str(e))
+            raise
+
+        self.events.emit(event, path=rel_path, bytes=size, status=status,
+                         duration_ms=round((time.perf_counter() - started) * 1000, 3))
+        return FileResult(rel_path, action, size, unreplaced, status)
+
+    def _is_text_file(self, path: Path) -> bool:
         """
-        Copy binary file without modification.
+        Determine if file is text (should be processed) or binary (should be copied).
 
         Args:
-            source_path: Source file path
-            output_path: Output file path
-        """
-        shutil.copy2(source_path, output_path)
+            path: File path to check
 
-    def _replace_variables(self, content: str) -> str:
+        Returns:
+            True if text file, False if binary
         """
-        Replace template variables in content.
+        return is_text_file(path)
 
-        Variables are in format: {{VARIABLE_NAME}}
+    def _copy_binary_file(self, source_path: Path, output_path: Path):
+        """
+        Copy binary file without modification.
 
         Args:
-            content: File content with template variables
-
-        Returns:
-            Content with variables replaced
+            source_path: Source file path
+            output_path: Output file path
         """
-        # Replace each variable
-        for var_name, var_value in self.variables.items():
-            pattern = r'\{\{' + re.escape(var_name) + r'\}\}'
-            content = re.sub(pattern, var_value, content)
-
-        return content
+        self.writer.copy(output_path.relative_to(self.output_dir).as_posix(), source_path)
 
     def get_unreplaced_variables(self, content: str) -> Set[str]:
         """
@@ -209,38 +220,19 @@ class TemplateProcessor:
         Returns:
             Set of unreplaced variable names
         """
-        pattern = r'\{\{([A-Z_]+)\}\}'
-        matches = re.findall(pattern, content)
-        return set(matches)
+        return find_unreplaced(content)
 
     def validate_output(self) -> Dict[str, List[str]]:
         """
         Validate output files for unreplaced variables.
 
+        Rendered content is checked in memory by process_all(), so output
+        files are not read back.
+
         Returns:
             Dictionary mapping file paths to lists of unreplaced variables
         """
-        unreplaced = {}
-
-        for file_path in self.processed_files:
-            if not file_path.exists() or not file_path.is_file():
-                continue
-
-            if not self._is_text_file(file_path):
-                continue
-
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-
-                unreplaced_vars = self.get_unreplaced_variables(content)
-                if unreplaced_vars:
-                    unreplaced[str(file_path)] = sorted(unreplaced_vars)
-
-            except Exception:
-                continue
-
-        return unreplaced
+        return dict(self.unreplaced)
 
 
 def process_template(template_dir: str, output_dir: str, variables: Dict[str, str],
@@ -263,7 +255,6 @@ def process_template(template_dir: str, output_dir: str, variables: Dict[str, st
 
 if __name__ == '__main__':
     # Test the template processor
-    import sys
     import json
 
     if len(sys.argv) < 4:
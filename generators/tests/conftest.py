@@ -0,0 +1,6 @@
+"""Make the generator modules importable as they are from setup.py (flat, by module name)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,62 @@
+"""Checksum manifest (--checksums): SHA256SUMS written from in-stream digests."""
+
+import hashlib
+import shutil
+import subprocess
+
+import pytest
+
+from checksums import MANIFEST_FILE, read_manifest, verify, write_manifest
+from output_writer import OutputWriter
+
+
+def _generate(output_dir):
+    source = output_dir.parent / "logo.png"
+    source.write_bytes(b"\x89PNG\r\n\x1a\n" * 10)
+    writer = OutputWriter(output_dir, checksums=True)
+    writer.write("README.md", b"# app\n")
+    writer.write("src/main.py", b"print(1)\n")
+    writer.copy("public/logo.png", source)
+    write_manifest(output_dir, writer.digests)
+    return writer
+
+
+def test_digests_match_the_written_files(tmp_path):
+    output_dir = tmp_path / "project"
+    writer = _generate(output_dir)
+
+    for rel_path, digest in writer.digests.items():
+        assert hashlib.sha256((output_dir / rel_path).read_bytes()).hexdigest() == digest
+    assert read_manifest(output_dir / MANIFEST_FILE) == writer.digests
+
+
+def test_untouched_project_verifies(tmp_path):
+    output_dir = tmp_path / "project"
+    _generate(output_dir)
+
+    report = verify(output_dir, workers=2)
+    assert report.ok
+    assert report.checked == 3
+
+
+def test_verify_reports_drift(tmp_path):
+    output_dir = tmp_path / "project"
+    _generate(output_dir)
+    (output_dir / "README.md").write_bytes(b"# changed\n")
+    (output_dir / "src/main.py").unlink()
+    (output_dir / "notes.txt").write_text("added\n")
+
+    report = verify(output_dir)
+    assert not report.ok
+    assert report.modified == ["README.md"]
+    assert report.missing == ["src/main.py"]
+    assert report.added == ["notes.txt"]
+
+
+@pytest.mark.skipif(shutil.which("sha256sum") is None, reason="sha256sum not installed")
+def test_manifest_is_sha256sum_compatible(tmp_path):
+    output_dir = tmp_path / "project"
+    _generate(output_dir)
+
+    result = subprocess.run(["sha256sum", "-c", MANIFEST_FILE], cwd=output_dir, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
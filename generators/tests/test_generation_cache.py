@@ -0,0 +1,111 @@
+"""Whole-generation cache (--cache-dir): GenerationCache and generation_key."""
+
+import os
+
+from generation_cache import MANIFEST_FILE, GenerationCache, generation_key
+
+
+def _project(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return root
+
+
+def _link_only(cache):
+    """Restore through hardlinks, as on file systems without reflinks."""
+    cache._can_clone = False
+    return cache
+
+
+def test_restore_reproduces_the_stored_project(tmp_path):
+    project = _project(tmp_path / "generated", {"README.md": "# app\n", "src/main.py": "print(1)\n"})
+    cache = GenerationCache(tmp_path / "cache")
+    cache.store("key-1", project)
+
+    restored = tmp_path / "restored"
+    assert cache.restore("key-1", restored) == 2
+    assert (restored / "README.md").read_text() == "# app\n"
+    assert (restored / "src/main.py").read_text() == "print(1)\n"
+
+
+def test_unknown_key_is_a_miss(tmp_path):
+    cache = GenerationCache(tmp_path / "cache")
+    assert cache.restore("missing", tmp_path / "restored") is None
+    assert not (tmp_path / "restored").exists()
+
+
+def test_store_never_links_to_the_callers_output(tmp_path):
+    project = _project(tmp_path / "generated", {"README.md": "# app\n"})
+    cache = _link_only(GenerationCache(tmp_path / "cache"))
+    cache.store("key-1", project)
+
+    (project / "README.md").write_text("# edited\n")
+    restored = tmp_path / "restored"
+    assert cache.restore("key-1", restored) == 1
+    assert (restored / "README.md").read_text() == "# app\n"
+
+
+def test_hardlinked_file_edited_in_place_discards_the_entry(tmp_path):
+    project = _project(tmp_path / "generated", {"README.md": "# app\n"})
+    cache = _link_only(GenerationCache(tmp_path / "cache"))
+    cache.store("key-1", project)
+
+    first = tmp_path / "first"
+    cache.restore("key-1", first)
+    entry_file = tmp_path / "cache" / "entries" / "key-1" / "files" / "README.md"
+    assert os.path.samefile(first / "README.md", entry_file)
+
+    # Writing through the link changes the cached copy as well
+    with open(first / "README.md", "r+") as f:
+        f.write("# APP")
+    # Same size; make sure the mtime differs even on coarse-grained file systems
+    os.utime(first / "README.md", ns=(0, 0))
+
+    assert cache.restore("key-1", tmp_path / "second") is None
+    assert not (tmp_path / "cache" / "entries" / "key-1").exists()
+
+
+def _stored_at(cache_dir, key, timestamp):
+    os.utime(cache_dir / "entries" / key / MANIFEST_FILE, (timestamp, timestamp))
+
+
+def _entries(cache_dir):
+    return {path.name for path in (cache_dir / "entries").iterdir()}
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = GenerationCache(cache_dir, max_bytes=250)
+    for key in ("a", "b"):
+        cache.store(key, _project(tmp_path / key, {"data.txt": "x" * 100}))
+    _stored_at(cache_dir, "a", 1)
+    _stored_at(cache_dir, "b", 2)
+
+    cache.store("c", _project(tmp_path / "c", {"data.txt": "y" * 100}))
+    assert _entries(cache_dir) == {"b", "c"}
+
+
+def test_restore_marks_an_entry_as_recently_used(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = GenerationCache(cache_dir, max_bytes=250)
+    for key in ("a", "b"):
+        cache.store(key, _project(tmp_path / key, {"data.txt": "x" * 100}))
+    _stored_at(cache_dir, "a", 1)
+    _stored_at(cache_dir, "b", 2)
+
+    assert cache.restore("a", tmp_path / "restored") == 1
+    cache.store("c", _project(tmp_path / "c", {"data.txt": "y" * 100}))
+    assert _entries(cache_dir) == {"a", "c"}
+
+
+def test_generation_key_tracks_inputs(tmp_path):
+    template = _project(tmp_path / "template", {"README.md.template": "# {{PROJECT_NAME}}\n"})
+    key = generation_key([template], {"DATABASE_PORT": 5432}, {"template": "t"})
+
+    assert generation_key([template], {"DATABASE_PORT": "5432"}, {"template": "t"}) == key
+    assert generation_key([template], {"DATABASE_PORT": "3306"}, {"template": "t"}) != key
+    assert generation_key([template], {"DATABASE_PORT": 5432}, {"template": "u"}) != key
+    (template / "README.md.template").write_text("# {{PROJECT_NAME}}!\n")
+    assert generation_key([template], {"DATABASE_PORT": 5432}, {"template": "t"}) != key
@@ -0,0 +1,123 @@
+"""Git output (--git-output): the git fast-import stream of GitFastImportWriter."""
+
+import shutil
+import subprocess
+
+import pytest
+
+from git_output import GitFastImportWriter
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch, tmp_path):
+    """Commit with a fixed identity and without the user's git configuration."""
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(tmp_path / "gitconfig"))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for variable in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{variable}_NAME", "Generator Test")
+        monkeypatch.setenv(f"GIT_{variable}_EMAIL", "generator@example.com")
+
+
+def _git(repo_dir, *args):
+    return subprocess.run(["git", "-C", str(repo_dir), *args], capture_output=True, text=True, check=True).stdout
+
+
+def _tree(repo_dir):
+    """Path -> mode of the committed tree."""
+    entries = {}
+    for line in _git(repo_dir, "ls-tree", "-r", "-z", "HEAD").split("\0"):
+        if line:
+            info, path = line.split("\t", 1)
+            entries[path] = info.split()[0]
+    return entries
+
+
+def test_files_are_committed_with_their_modes(tmp_path):
+    script = tmp_path / "deploy.sh"
+    script.write_bytes(b"#!/bin/sh\necho deploy\n")
+    script.chmod(0o755)
+    repo = tmp_path / "repo"
+
+    writer = GitFastImportWriter(repo)
+    writer.start()
+    writer.write("README.md", b"# app\n")
+    writer.write("scripts/run.sh", b"#!/bin/sh\n", executable=True)
+    writer.copy("scripts/deploy.sh", script)
+    commit = writer.commit("Initial project")
+
+    assert _git(repo, "rev-parse", "HEAD").strip() == commit
+    assert _tree(repo) == {
+        "README.md": "100644",
+        "scripts/deploy.sh": "100755",
+        "scripts/run.sh": "100755",
+    }
+    assert _git(repo, "show", "HEAD:scripts/deploy.sh") == "#!/bin/sh\necho deploy\n"
+    assert _git(repo, "log", "-1", "--format=%s").strip() == "Initial project"
+    # Nothing is checked out unless asked
+    assert not (repo / "README.md").exists()
+
+
+def test_unusual_paths_are_quoted(tmp_path):
+    repo = tmp_path / "repo"
+    writer = GitFastImportWriter(repo)
+    writer.start()
+    writer.write('"quoted".txt', b"quote\n")
+    writer.write("back\\slash.txt", b"backslash\n")
+    writer.write("with space.txt", b"space\n")
+    writer.commit("Paths")
+
+    assert set(_tree(repo)) == {'"quoted".txt', "back\\slash.txt", "with space.txt"}
+
+
+def test_path_written_twice_keeps_the_latest_content(tmp_path):
+    repo = tmp_path / "repo"
+    writer = GitFastImportWriter(repo)
+    writer.start()
+    writer.write(".bandit", b"first\n")
+    writer.write("other.txt", b"other\n")
+    writer.write(".bandit", b"second\n")
+    writer.commit("Twice")
+
+    assert _git(repo, "show", "HEAD:.bandit") == "second\n"
+    assert _git(repo, "show", "HEAD:other.txt") == "other\n"
+
+
+def test_regeneration_replaces_the_tree(tmp_path):
+    repo = tmp_path / "repo"
+    first = GitFastImportWriter(repo)
+    first.start()
+    first.write("old.txt", b"old\n")
+    parent = first.commit("First")
+
+    second = GitFastImportWriter(repo)
+    second.start()
+    second.write("new.txt", b"new\n")
+    second.commit("Second")
+
+    assert set(_tree(repo)) == {"new.txt"}
+    assert _git(repo, "rev-parse", "HEAD~1").strip() == parent
+
+
+def test_abort_leaves_no_commit(tmp_path):
+    repo = tmp_path / "repo"
+    writer = GitFastImportWriter(repo)
+    writer.start()
+    writer.write("README.md", b"# app\n")
+    writer.abort()
+
+    result = subprocess.run(["git", "-C", str(repo), "rev-parse", "-q", "--verify", "HEAD"],
+                            capture_output=True, text=True)
+    assert result.returncode != 0
+
+
+def test_structured_files_are_checked_while_streaming(tmp_path):
+    writer = GitFastImportWriter(tmp_path / "repo", check_structure=True)
+    writer.start()
+    writer.write("package.json", b'{"name": "app",}')
+    writer.write("config.yaml", b"key: value\n")
+    writer.abort()
+
+    assert writer.structured_files == 2
+    assert [error.path for error in writer.structure_errors] == ["package.json"]
@@ -0,0 +1,71 @@
+"""Resumable generation (--resume): GenerationJournal and OutputWriter."""
+
+import hashlib
+
+from journal import JOURNAL_FILE, GenerationJournal
+from output_writer import CREATED, RESUMED, OutputWriter
+
+
+def _interrupted_generation(output_dir, key="key-1"):
+    """Write two files through a journal and stop without completing."""
+    journal = GenerationJournal(output_dir, key)
+    journal.open()
+    writer = OutputWriter(output_dir, journal=journal)
+    writer.write("a.txt", b"alpha\n")
+    writer.write("b.txt", b"beta\n")
+    journal.close(completed=False)
+
+
+def test_resume_skips_intact_files(tmp_path):
+    _interrupted_generation(tmp_path)
+
+    journal = GenerationJournal(tmp_path, "key-1")
+    assert journal.open(resume=True) == 2
+    writer = OutputWriter(tmp_path, journal=journal)
+    assert writer.resumed("a.txt") == len(b"alpha\n")
+    assert writer.resumed("c.txt") is None
+    assert writer.write("c.txt", b"gamma\n") == CREATED
+    assert writer.stats()[RESUMED] == 1
+    journal.close(completed=True)
+
+    assert not (tmp_path / JOURNAL_FILE).exists()
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    _interrupted_generation(tmp_path)
+    journal_path = tmp_path / JOURNAL_FILE
+    # Killed halfway through appending the next record
+    with open(journal_path, "a", encoding="utf-8") as f:
+        f.write('{"path": "c.txt", "si')
+
+    journal = GenerationJournal(tmp_path, "key-1")
+    assert journal.open(resume=True) == 2
+    assert set(journal.entries) == {"a.txt", "b.txt"}
+
+
+def test_journal_for_other_inputs_is_not_resumed(tmp_path):
+    _interrupted_generation(tmp_path, key="key-1")
+
+    journal = GenerationJournal(tmp_path, "key-2")
+    assert journal.open(resume=True) == 0
+    assert not journal.completed("a.txt")
+
+
+def test_modified_output_is_written_again(tmp_path):
+    _interrupted_generation(tmp_path)
+    (tmp_path / "a.txt").write_bytes(b"ALPHA\n")
+    (tmp_path / "b.txt").unlink()
+
+    journal = GenerationJournal(tmp_path, "key-1")
+    journal.open(resume=True)
+    assert not journal.completed("a.txt")
+    assert not journal.completed("b.txt")
+
+
+def test_journal_records_digest_of_written_bytes(tmp_path):
+    journal = GenerationJournal(tmp_path, "key-1")
+    journal.open()
+    OutputWriter(tmp_path, journal=journal).write("a.txt", b"alpha\n")
+
+    assert journal.entries["a.txt"] == (6, hashlib.sha256(b"alpha\n").hexdigest())
+    journal.close(completed=False)
@@ -0,0 +1,74 @@
+"""OutputWriter sync mode (--sync): only changed bytes are written."""
+
+import os
+
+from output_writer import CREATED, UNCHANGED, UPDATED, OutputWriter
+
+# 2001-09-09, well before any file written by the test
+OLD_MTIME_NS = 1_000_000_000 * 10**9
+
+
+def _age(path):
+    os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def test_first_write_creates_files(tmp_path):
+    writer = OutputWriter(tmp_path, sync=True)
+
+    assert writer.write("src/app.py", b"print('hi')\n") == CREATED
+    assert (tmp_path / "src/app.py").read_bytes() == b"print('hi')\n"
+    assert writer.stats()[CREATED] == 1
+
+
+def test_sync_leaves_identical_files_untouched(tmp_path):
+    OutputWriter(tmp_path).write("README.md", b"# Project\n")
+    _age(tmp_path / "README.md")
+
+    writer = OutputWriter(tmp_path, sync=True)
+    assert writer.write("README.md", b"# Project\n") == UNCHANGED
+    assert (tmp_path / "README.md").stat().st_mtime_ns == OLD_MTIME_NS
+
+
+def test_sync_rewrites_changed_files(tmp_path):
+    OutputWriter(tmp_path).write("README.md", b"# Project\n")
+    _age(tmp_path / "README.md")
+
+    writer = OutputWriter(tmp_path, sync=True)
+    # Same size, different bytes
+    assert writer.write("README.md", b"# Projekt\n") == UPDATED
+    assert (tmp_path / "README.md").read_bytes() == b"# Projekt\n"
+    assert (tmp_path / "README.md").stat().st_mtime_ns != OLD_MTIME_NS
+
+
+def test_sync_copy_compares_content(tmp_path):
+    source = tmp_path / "logo.png"
+    source.write_bytes(b"\x89PNG\r\n\x1a\n")
+    output_dir = tmp_path / "out"
+    OutputWriter(output_dir).copy("logo.png", source)
+    _age(output_dir / "logo.png")
+
+    writer = OutputWriter(output_dir, sync=True)
+    assert writer.copy("logo.png", source) == UNCHANGED
+    assert (output_dir / "logo.png").stat().st_mtime_ns == OLD_MTIME_NS
+
+    source.write_bytes(b"\x89PNG\r\n\x1a\x00")
+    assert writer.copy("logo.png", source) == UPDATED
+    assert (output_dir / "logo.png").read_bytes() == source.read_bytes()
+
+
+def test_update_keeps_permissions_changed_in_the_project(tmp_path):
+    OutputWriter(tmp_path).write("run.sh", b"echo 1\n")
+    (tmp_path / "run.sh").chmod(0o750)
+
+    OutputWriter(tmp_path, sync=True).write("run.sh", b"echo 2\n")
+    assert (tmp_path / "run.sh").stat().st_mode & 0o777 == 0o750
+
+
+def test_orphans_are_files_the_generation_did_not_write(tmp_path):
+    OutputWriter(tmp_path).write("old.txt", b"old\n")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("ignored")
+
+    writer = OutputWriter(tmp_path, sync=True)
+    writer.write("new.txt", b"new\n")
+    assert writer.orphans() == ["old.txt"]
@@ -0,0 +1,42 @@
+"""Template conditions of the nextjs-fastapi template (.template-conditions.yaml)."""
+
+import pytest
+
+from events import EventEmitter
+from setup import generate_project
+
+POSTGRESQL_FILES = ["docs/database/postgresql.md"]
+MYSQL_FILES = ["docs/database/mysql.md"]
+
+
+def _variables(database_type: str) -> dict:
+    return {
+        "PROJECT_NAME": "conditions-test",
+        "DATABASE_TYPE": database_type,
+        "DATABASE_VERSION": "8.0+" if database_type == "MySQL" else "14+",
+        "DATABASE_PORT": "3306" if database_type == "MySQL" else "5432",
+    }
+
+
+@pytest.mark.parametrize("database_type, included, excluded", [
+    ("MySQL", MYSQL_FILES, POSTGRESQL_FILES),
+    ("PostgreSQL", POSTGRESQL_FILES, MYSQL_FILES),
+])
+def test_database_specific_files(tmp_path, database_type, included, excluded):
+    output_dir = tmp_path / "project"
+    assert generate_project(_variables(database_type), str(output_dir), validate=False, events=EventEmitter())
+
+    for rel_path in included:
+        assert (output_dir / rel_path).is_file(), rel_path
+    for rel_path in excluded:
+        assert not (output_dir / rel_path).exists(), rel_path
+    # Database-independent files are generated either way
+    assert (output_dir / "README.md").is_file()
+
+
+def test_database_type_is_case_insensitive(tmp_path):
+    output_dir = tmp_path / "project"
+    assert generate_project(_variables("mysql"), str(output_dir), validate=False, events=EventEmitter())
+
+    assert (output_dir / "docs/database/mysql.md").is_file()
+    assert not (output_dir / "docs/database/postgresql.md").exists()
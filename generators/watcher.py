@@ -0,0 +1,234 @@
+"""
+Generation Watcher
+
+Keeps a generated project in sync while a template is being developed.
+After the initial generation, template files and the configuration are
+polled through their mtime/size index; only outputs of changed template
+files, or of files that use a changed variable, are re-rendered.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from checksums import MANIFEST_FILE, write_manifest
+from conditions import CONDITIONS_FILE, excluded_paths, load_conditions
+from config_loader import ConfigLoader
+from security_integrator import SecurityIntegrator
+from template_cache import CompiledTemplate, Signature, TemplateFile, file_signature
+from validators import ConfigValidator
+
+DEFAULT_INTERVAL = 0.3
+
+
+def _signature_or_none(path: Optional[Path]) -> Optional[Signature]:
+    """file_signature() that tolerates missing files (e.g. mid-save)."""
+    if path is None:
+        return None
+    try:
+        return file_signature(path)
+    except FileNotFoundError:
+        return None
+
+
+class GenerationWatcher:
+    """Re-renders the outputs affected by template and config edits."""
+
+    def __init__(self, generator, validate: bool = True, interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize GenerationWatcher.
+
+        Args:
+            generator: ProjectGenerator whose generate() has completed (not restored from cache)
+            validate: Whether to validate configuration edits before applying them
+            interval: Seconds between polls
+        """
+        if generator.processor is None or generator.processor.compiled is None:
+            raise ValueError("generate() must complete before watching")
+
+        self.generator = generator
+        self.processor = generator.processor
+        self.compiled: CompiledTemplate = self.processor.compiled
+        self.output_dir = self.processor.output_dir
+        self.validate = validate
+        self.interval = interval
+        self.events = generator.events
+
+        self.security_config_path = generator.template_dir / ".security-config.yaml"
+        self.conditions_path = generator.template_dir / CONDITIONS_FILE
+        self._config_signature = _signature_or_none(generator.config_path)
+        self._security_signature = _signature_or_none(self.security_config_path)
+        self._conditions_signature = _signature_or_none(self.conditions_path)
+        self._outputs: Set[str] = {entry.output_name for entry in self.compiled.files}
+
+    def run(self):
+        """Poll until interrupted (Ctrl+C)."""
+        self.events.message(f"\n👀 Watching {self.compiled.template_dir}"
+                            + (f" and {self.generator.config_path}" if self.generator.config_path else "")
+                            + " (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            self.events.message("\n👋 Stopped watching")
+
+    def poll(self) -> Dict[str, int]:
+        """
+        Check for changes once and re-render affected outputs.
+
+        Files that fail (e.g. deleted or renamed mid-save) are reported and
+        retried once they change again; they do not stop the watch.
+
+        Returns:
+            Counts of 'rendered', 'failed' and 'removed' outputs
+        """
+        started = time.perf_counter()
+        reasons: List[str] = []
+        affected: Dict[str, TemplateFile] = {}
+
+        changed_variables = self._reload_config()
+        if changed_variables:
+            reasons.append(f"config: {', '.join(sorted(changed_variables))}")
+            for entry in self.compiled.files:
+                if entry.placeholders & changed_variables:
+                    affected[entry.output_name] = entry
+
+        conditions_signature = _signature_or_none(self.conditions_path)
+        if changed_variables or conditions_signature != self._conditions_signature:
+            self._conditions_signature = conditions_signature
+            included = self._apply_conditions()
+            if included:
+                reasons.append(f"{len(included)} included by conditions")
+            for entry in included:
+                affected[entry.output_name] = entry
+
+        try:
+            recompiled = self.compiled.refresh()
+        except OSError as e:
+            # A file or directory vanished during the walk; the next poll sees the settled tree
+            self.events.message(f"❌ Failed to scan {self.compiled.template_dir}: {e}", level="error")
+            recompiled = []
+        if recompiled:
+            reasons.append(f"{len(recompiled)} template file(s)")
+            for entry in recompiled:
+                affected[entry.output_name] = entry
+
+        removed = self._remove_deleted_outputs()
+        if removed:
+            reasons.append(f"{len(removed)} removed")
+
+        failed = 0
+        for entry in affected.values():
+            self.processor.unreplaced.pop(str(self.output_dir / entry.output_rel_path), None)
+            try:
+                self.processor.render_file(entry)
+            except Exception as e:
+                failed += 1
+                self.events.message(f"❌ Failed to render {entry.rel_path.as_posix()}: {e}", level="error")
+
+        security_changed = self._security_config_changed()
+        if security_changed:
+            reasons.append(".security-config.yaml")
+            try:
+                SecurityIntegrator(
+                    self.generator.repo_root,
+                    self.generator.template_name,
+                    self.output_dir,
+                    cache=self.generator.cache,
+                    events=self.events,
+                    writer=self.processor.writer,
+                ).integrate()
+            except Exception as e:
+                self.events.message(f"❌ Failed to integrate security template: {e}", level="error")
+
+        # Keep SHA256SUMS (--checksums) in step with the re-rendered files
+        digests = self.processor.writer.digests
+        if digests is not None and (affected or removed or security_changed):
+            for rel_path in removed:
+                digests.pop(rel_path, None)
+            write_manifest(self.output_dir, digests)
+
+        if reasons:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self.events.message(f"🔁 Re-rendered {len(affected) - failed} file(s) in {duration_ms:.0f} ms "
+                                f"({'; '.join(reasons)})"
+                                + (f", {failed} failed" if failed else "")
+                                + (f", {MANIFEST_FILE} updated" if digests is not None else ""))
+            for file_path, vars_list in self.processor.unreplaced.items():
+                if Path(file_path).relative_to(self.output_dir).as_posix() in affected:
+                    self.events.message(f"  ⚠️  {Path(file_path).relative_to(self.output_dir)}: "
+                                        f"{', '.join(vars_list)}", level="warning")
+
+        return {'rendered': len(affected) - failed, 'failed': failed, 'removed': len(removed)}
+
+    def _reload_config(self) -> Set[str]:
+        """Reload the config file if it changed and return the names of changed variables."""
+        signature = _signature_or_none(self.generator.config_path)
+        if signature is None or signature == self._config_signature:
+            return set()
+        self._config_signature = signature
+
+        try:
+            loader = ConfigLoader(str(self.generator.config_path))
+            loader.load()
+            variables = loader.get_variables()
+        except Exception as e:
+            self.events.message(f"❌ Failed to load configuration: {e}", level="error")
+            return set()
+
+        if self.validate:
+            is_valid, errors, warnings = ConfigValidator(variables).validate_all()
+            if errors:
+                self.events.message("❌ Validation errors (not applied):\n" +
+                                    "\n".join(f"  - {error}" for error in errors), level="error")
+                return set()
+
+        previous = self.processor.variables
+        changed = {name for name in previous.keys() | variables.keys()
+                   if previous.get(name) != variables.get(name)}
+        self.processor.variables = variables
+        return changed
+
+    def _apply_conditions(self) -> List[TemplateFile]:
+        """
+        Re-evaluate template conditions and switch to the new file plan if it changed.
+
+        Returns:
+            Entries of files that are now included (outputs that are now
+            excluded are removed by _remove_deleted_outputs())
+        """
+        try:
+            excluded = excluded_paths(load_conditions(self.generator.template_dir, self.generator.cache),
+                                      self.processor.variables)
+        except (ValueError, OSError) as e:
+            self.events.message(f"❌ Failed to load template conditions: {e}", level="error")
+            return []
+        if excluded == self.compiled.excluded_paths:
+            return []
+
+        template_dir, exclude_patterns = self.compiled.template_dir, self.compiled.exclude_patterns
+        if self.generator.cache is not None:
+            self.compiled = self.generator.cache.template(template_dir, exclude_patterns, excluded)
+        else:
+            self.compiled = CompiledTemplate(template_dir, exclude_patterns, excluded, self.compiled.keep_parts)
+        self.processor.compiled = self.compiled
+        return [entry for entry in self.compiled.files if entry.output_name not in self._outputs]
+
+    def _remove_deleted_outputs(self) -> List[str]:
+        """Delete outputs whose template file was removed or is now excluded by conditions."""
+        current = {entry.output_name for entry in self.compiled.files}
+        removed = sorted(self._outputs - current)
+        self._outputs = current
+        for rel_path in removed:
+            (self.output_dir / rel_path).unlink(missing_ok=True)
+            self.processor.unreplaced.pop(str(self.output_dir / rel_path), None)
+        return removed
+
+    def _security_config_changed(self) -> bool:
+        """Whether .security-config.yaml changed since the last poll."""
+        signature = _signature_or_none(self.security_config_path)
+        if signature == self._security_signature:
+            return False
+        self._security_signature = signature
+        return signature is not None